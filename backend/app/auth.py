@@ -348,6 +348,16 @@ def auth_context() -> AuthContext | None:
     return _ctx.get()
 
 
+def has_section(section: str, needed: str = "read") -> bool:
+    """Whether this request may reach ``section`` at level ``needed`` — for a handler
+    serving another section's data than the one its router is guarded by. Direct calls
+    (no guard ran) and the dev bridge answer True, as the guard itself would."""
+    ctx = _ctx.get()
+    if ctx is None or ctx.is_superuser or _auth_disabled():
+        return True
+    return _LEVEL_RANK[ctx.perms.get(section, "none")] >= _LEVEL_RANK[needed]
+
+
 def active_org_id() -> int:
     """The org this request operates in. Guarded routes always have one."""
     ctx = _ctx.get()
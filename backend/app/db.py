@@ -5,6 +5,10 @@ import re
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "sapche.db")
 
+# How syllable ids (canonical uuid strings) are stored: 'text', the 36-char string, or
+# 'blob', its 16 bytes — see `get_db` and `_rebuild_syllable_id_storage`.
+SYL_ID_STORAGE = os.environ.get("SAPCHE_SYL_ID_STORAGE", "text")
+
 # The layout kinds, in one place: `SCHEMA` writes this CHECK and
 # `_rebuild_document_layout_kinds` brings an older table in line with it. Retiring a kind is
 # as ordinary as adding one — 'wrap_extend' (superseded by the per-block widths) and
@@ -161,6 +165,24 @@ CREATE TABLE IF NOT EXISTS suggestions (
 );
 CREATE INDEX IF NOT EXISTS idx_suggestions_text ON suggestions(text_id);
 
+-- A queued bake of a primary's applied suggestions (POST /texts/{id}/apply-corrections/jobs),
+-- run on the in-process bake worker (routers/texts.py). `timings` is a JSON object of
+-- per-phase wall time in ms (splice, tokenize, align, write, snap[, retry]). Jobs a
+-- restart interrupts are marked failed in init_db.
+CREATE TABLE IF NOT EXISTS bake_jobs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    text_id     INTEGER NOT NULL REFERENCES texts(id) ON DELETE CASCADE,
+    status      TEXT NOT NULL DEFAULT 'queued'
+                CHECK (status IN ('queued', 'running', 'done', 'failed')),
+    baked       INTEGER NOT NULL DEFAULT 0,   -- 0 = nothing was staged (a no-op)
+    error       TEXT,
+    timings     TEXT NOT NULL DEFAULT '{}',
+    created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at  TIMESTAMP,
+    finished_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_bake_jobs_text ON bake_jobs(text_id);
+
 CREATE TABLE IF NOT EXISTS note_categories (
     id          INTEGER PRIMARY KEY AUTOINCREMENT,
     text_id INTEGER NOT NULL REFERENCES texts(id) ON DELETE CASCADE,
@@ -192,20 +214,19 @@ CREATE INDEX IF NOT EXISTS idx_note_sessions_tag ON note_sessions(tag_id);
 -- ---------------------------------------------------------------------------
 
 -- The syllable base layer = the published manifest. One row per syllable, with
--- a stable uuid5 id (see app/manifest.py) and exact char offsets into
--- texts.raw_text so existing offset-based annotations map by lookup.
+-- a stable uuid5 id (see app/manifest.py). Char offsets into texts.raw_text are
+-- derived on read (cumulative `text` lengths), never stored.
 CREATE TABLE IF NOT EXISTS syllables (
     id           TEXT NOT NULL,            -- uuid5(instance_id, idx, text)
     text_id  INTEGER NOT NULL REFERENCES texts(id) ON DELETE CASCADE,
-    idx          INTEGER NOT NULL,         -- 1-based manifest index
-    start_offset INTEGER NOT NULL,         -- inclusive offset into raw_text
-    end_offset   INTEGER NOT NULL,         -- exclusive offset into raw_text
+    idx          INTEGER NOT NULL,         -- gapped ordering key (manifest.IDX_GAP); reads
+                                           -- report the 1-based position instead
     text         TEXT NOT NULL,
     nature       TEXT NOT NULL,            -- TEXT / PUNCT / SPACE / LATIN / ...
     PRIMARY KEY (text_id, idx)
 );
-CREATE INDEX IF NOT EXISTS idx_syllables_text ON syllables(text_id);
-CREATE INDEX IF NOT EXISTS idx_syllables_offsets  ON syllables(text_id, start_offset);
+-- No index on text_id alone: the primary key (text_id, idx) already serves every
+-- per-text read and delete (see _drop_redundant_syllable_indexes).
 CREATE INDEX IF NOT EXISTS idx_syllables_sylid    ON syllables(id);
 
 -- Imported SRT transcript segments, grouped by the session tag they belong to.
@@ -395,6 +416,136 @@ CREATE TABLE IF NOT EXISTS derivation_op_syllables (
     PRIMARY KEY (op_id, position)
 );
 
+-- Per-text stream generation: bumped by the triggers below on every write to a text's
+-- syllables, derivation ops or op syllables, so a composed stream cached in-process
+-- (app/stream_cache.py) can tell it is stale by comparing the generations of its
+-- source_texts closure. Its own table, not a `texts` column, so a bump never rewrites
+-- the raw_text row; no FK and never deleted, so a generation only ever grows.
+CREATE TABLE IF NOT EXISTS stream_generations (
+    text_id    INTEGER PRIMARY KEY,
+    generation INTEGER NOT NULL DEFAULT 0
+);
+CREATE TRIGGER IF NOT EXISTS trg_syllables_gen_ins AFTER INSERT ON syllables BEGIN
+    INSERT INTO stream_generations (text_id) VALUES (NEW.text_id)
+    ON CONFLICT(text_id) DO UPDATE SET generation = generation + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_syllables_gen_upd AFTER UPDATE ON syllables BEGIN
+    INSERT INTO stream_generations (text_id) VALUES (NEW.text_id)
+    ON CONFLICT(text_id) DO UPDATE SET generation = generation + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_syllables_gen_del AFTER DELETE ON syllables BEGIN
+    INSERT INTO stream_generations (text_id) VALUES (OLD.text_id)
+    ON CONFLICT(text_id) DO UPDATE SET generation = generation + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_derivation_ops_gen_ins AFTER INSERT ON derivation_ops BEGIN
+    INSERT INTO stream_generations (text_id) VALUES (NEW.text_id)
+    ON CONFLICT(text_id) DO UPDATE SET generation = generation + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_derivation_ops_gen_upd AFTER UPDATE ON derivation_ops BEGIN
+    INSERT INTO stream_generations (text_id) VALUES (NEW.text_id)
+    ON CONFLICT(text_id) DO UPDATE SET generation = generation + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_derivation_ops_gen_del AFTER DELETE ON derivation_ops BEGIN
+    INSERT INTO stream_generations (text_id) VALUES (OLD.text_id)
+    ON CONFLICT(text_id) DO UPDATE SET generation = generation + 1;
+END;
+-- An op syllable names its text through its op. The WHERE both disambiguates the upsert
+-- and skips the bump when the op itself is being deleted (its own trigger bumped already).
+CREATE TRIGGER IF NOT EXISTS trg_op_syllables_gen_ins AFTER INSERT ON derivation_op_syllables BEGIN
+    INSERT INTO stream_generations (text_id)
+    SELECT text_id FROM derivation_ops WHERE id = NEW.op_id
+    ON CONFLICT(text_id) DO UPDATE SET generation = generation + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_op_syllables_gen_upd AFTER UPDATE ON derivation_op_syllables BEGIN
+    INSERT INTO stream_generations (text_id)
+    SELECT text_id FROM derivation_ops WHERE id = NEW.op_id
+    ON CONFLICT(text_id) DO UPDATE SET generation = generation + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_op_syllables_gen_del AFTER DELETE ON derivation_op_syllables BEGIN
+    INSERT INTO stream_generations (text_id)
+    SELECT text_id FROM derivation_ops WHERE id = OLD.op_id
+    ON CONFLICT(text_id) DO UPDATE SET generation = generation + 1;
+END;
+
+-- Generation of the derivation GRAPH (parent links + transclusion sources), bumped by the
+-- triggers below on anything that can change a text's `source_texts` closure. Lets
+-- app/inherit.py cache closures per process and revalidate them with one row read.
+CREATE TABLE IF NOT EXISTS derivation_graph_generation (
+    id         INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO derivation_graph_generation (id, generation) VALUES (1, 0);
+CREATE TRIGGER IF NOT EXISTS trg_texts_graph_ins AFTER INSERT ON texts
+WHEN NEW.parent_text_id IS NOT NULL BEGIN
+    UPDATE derivation_graph_generation SET generation = generation + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_texts_graph_upd AFTER UPDATE OF parent_text_id ON texts BEGIN
+    UPDATE derivation_graph_generation SET generation = generation + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_texts_graph_del AFTER DELETE ON texts BEGIN
+    UPDATE derivation_graph_generation SET generation = generation + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_transclude_graph_ins AFTER INSERT ON derivation_ops
+WHEN NEW.op_kind = 'transclude' BEGIN
+    UPDATE derivation_graph_generation SET generation = generation + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_transclude_graph_upd
+AFTER UPDATE OF op_kind, text_id, src_text_id ON derivation_ops
+WHEN NEW.op_kind = 'transclude' OR OLD.op_kind = 'transclude' BEGIN
+    UPDATE derivation_graph_generation SET generation = generation + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_transclude_graph_del AFTER DELETE ON derivation_ops
+WHEN OLD.op_kind = 'transclude' BEGIN
+    UPDATE derivation_graph_generation SET generation = generation + 1 WHERE id = 1;
+END;
+
+-- Per-text generation of each annotation LAYER a read is computed from, bumped by
+-- triggers on every write to the layer's rows, so a computed read cached
+-- in-process (app/layer_cache.py) — and the ETag a client revalidates it with — can tell it
+-- is stale by comparing these (plus the stream generations) over the text's source
+-- closure. Same rules as stream_generations: no FK, never deleted, only ever grows.
+--   'outline'  : tree_nodes and their display slots
+--   'passages' : passages and their member runs
+--   'spans', 'markers', 'phonetics' : those tables
+--   'notes'    : notes, their sessions and the text's note categories
+--   'translations' : translation chunks and their translations
+--   'layouts'  : chunk_layouts and their titles
+-- text_id 0 holds the layers no one text owns: 'tags' (every tag) and the GLOBAL
+-- 'layouts' rows. The triggers are LAYER_TRIGGERS, created at the end of init_db.
+CREATE TABLE IF NOT EXISTS layer_generations (
+    text_id    INTEGER NOT NULL,
+    layer      TEXT NOT NULL,
+    generation INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (text_id, layer)
+) WITHOUT ROWID;
+
+-- The same per DOCUMENT: 'layout' (the document row, its items, its layout rows; id 0 is
+-- the org template) and 'furniture'.
+CREATE TABLE IF NOT EXISTS document_generations (
+    document_id INTEGER NOT NULL,
+    layer       TEXT NOT NULL,
+    generation  INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (document_id, layer)
+) WITHOUT ROWID;
+
+-- Materialized membership of a SECONDARY text's composed stream: one row per token, with
+-- the op that emitted it (NULL for a parent link). Lets the inherited-annotation reads test
+-- "does this anchor appear here" as an indexed EXISTS instead of loading every ancestor's
+-- rows into Python. Derived data, patched by app/stream_members.py on the write paths that
+-- bump stream_generations, in the writer's transaction; `stamp` (the stream_generations
+-- of the text's source closure) records what the rows match. Unordered on
+-- purpose: with no position to keep, an edit rewrites only the tokens it changed.
+CREATE TABLE IF NOT EXISTS stream_members (
+    text_id INTEGER NOT NULL REFERENCES texts(id) ON DELETE CASCADE,
+    syl_id  TEXT NOT NULL,
+    op_id   INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_stream_members_syl ON stream_members(text_id, syl_id);
+CREATE TABLE IF NOT EXISTS stream_members_state (
+    text_id INTEGER PRIMARY KEY REFERENCES texts(id) ON DELETE CASCADE,
+    stamp   TEXT NOT NULL
+);
+
 -- Per-user last-viewed position in a text: the syllable that begins the segment the
 -- user was last looking at, so reopening a text scrolls back there. `user_id` is the
 -- multi-user piping — until real accounts exist it is a single local user (see
@@ -1005,6 +1156,64 @@ CREATE TABLE IF NOT EXISTS invites (
 CREATE INDEX IF NOT EXISTS idx_invites_org ON invites(org_id);
 """.replace("__LAYOUT_KINDS__", ",".join(f"'{k}'" for k in LAYOUT_KINDS))
 
+# layer_generations / document_generations bumps (see the tables in SCHEMA): for each
+# (generation table, written table, layer, key expression over the row) every insert,
+# update and delete bumps the key's layer — an update that moves the row to another key
+# bumps both. Kept apart from SCHEMA and run after every migration in init_db: rebuilding a
+# table (CREATE __new / DROP / RENAME) drops the triggers on it, and several tables are
+# rebuilt by more than one of them. Key 0 holds layers no single text/document owns.
+_LAYER_SOURCES = (
+    ("layer_generations", "tree_nodes", "outline", "{r}.text_id"),
+    ("layer_generations", "tree_node_display_slots", "outline",
+     "(SELECT text_id FROM tree_nodes WHERE id = {r}.node_id)"),
+    ("layer_generations", "passages", "passages", "{r}.text_id"),
+    ("layer_generations", "passage_members", "passages",
+     "(SELECT text_id FROM passages WHERE id = {r}.passage_id)"),
+    ("layer_generations", "spans", "spans", "{r}.text_id"),
+    # A span serializes its tag's name and colour, and may use a shared tag or a source
+    # text's private one: any tag write reaches every text.
+    ("layer_generations", "tags", "tags", "0"),
+    ("layer_generations", "markers", "markers", "{r}.text_id"),
+    ("layer_generations", "notes", "notes", "{r}.text_id"),
+    ("layer_generations", "note_categories", "notes", "{r}.text_id"),
+    ("layer_generations", "note_sessions", "notes",
+     "(SELECT text_id FROM notes WHERE id = {r}.note_id)"),
+    ("layer_generations", "translation_chunks", "translations", "{r}.origin_text_id"),
+    ("layer_generations", "translations", "translations",
+     "(SELECT origin_text_id FROM translation_chunks WHERE id = {r}.chunk_id)"),
+    ("layer_generations", "phonetics", "phonetics", "{r}.origin_text_id"),
+    # A NULL text_id is a GLOBAL layout row, applicable to every booklet.
+    ("layer_generations", "chunk_layouts", "layouts", "COALESCE({r}.text_id, 0)"),
+    ("layer_generations", "layout_titles", "layouts",
+     "(SELECT COALESCE(text_id, 0) FROM chunk_layouts WHERE id = {r}.layout_id)"),
+    ("document_generations", "documents", "layout", "{r}.id"),
+    ("document_generations", "document_items", "layout", "{r}.document_id"),
+    ("document_generations", "document_layout", "layout", "{r}.document_id"),
+    ("document_generations", "document_furniture", "furniture", "{r}.document_id"),
+    # The org template sits under every document's own layout config.
+    ("document_generations", "org_layout", "layout", "0"),
+)
+
+
+def _layer_triggers() -> str:
+    out = []
+    for gens, table, layer, key in _LAYER_SOURCES:
+        col = "text_id" if gens == "layer_generations" else "document_id"
+
+        def bump(r, when=""):
+            return (f"    INSERT INTO {gens} ({col}, layer) SELECT k, '{layer}' "
+                    f"FROM (SELECT {key.format(r=r)} AS k) WHERE k IS NOT NULL{when}\n"
+                    f"    ON CONFLICT({col}, layer) DO UPDATE SET generation = generation + 1;")
+        moved = f" AND k IS NOT {key.format(r='NEW')}"
+        for event, body in (("INSERT", bump("NEW")), ("DELETE", bump("OLD")),
+                            ("UPDATE", bump("NEW") + "\n" + bump("OLD", moved))):
+            out.append(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_layer_{event[:3].lower()} "
+                       f"AFTER {event} ON {table} BEGIN\n{body}\nEND;")
+    return "\n".join(out)
+
+
+LAYER_TRIGGERS = _layer_triggers()
+
 
 # Additive column migrations for pre-existing tables. Each is applied only if
 # the column is missing, so existing rows and data are untouched.
@@ -1639,7 +1848,8 @@ def _rename_documents_to_texts(conn) -> None:
 # Part 6, Phase 3 — drop the char-offset columns. The `syllables` table is now the
 # sole tokenization/identity source and every annotation is anchored by syllable UUID;
 # char offsets are derived on read for the frontend only, never stored as an anchor.
-# `syllables.start_offset/end_offset` are KEPT as a derived render cache. Two shapes:
+# (`syllables.start_offset/end_offset` went later, see _drop_syllable_offset_columns.)
+# Two shapes:
 #   * a plain column bound by no CHECK/UNIQUE/index → `ALTER TABLE ... DROP COLUMN`;
 #   * a column inside a CHECK/UNIQUE/index → SQLite rebuild-table (create `<t>__new`,
 #     copy the surviving columns, drop the old table, rename) because DROP COLUMN
@@ -1982,9 +2192,108 @@ def _repair_tag_fks(conn) -> None:
         conn.execute("PRAGMA foreign_keys = ON")
 
 
+# ─── Binary syllable ids ──────────────────────────────────────────────────────
+#
+# With SYL_ID_STORAGE = 'blob' every canonical (lowercase, hyphenated) uuid string is
+# stored as its 16 bytes: syllables.id and every anchor column that copies it, their
+# indexes, and the IN (...) lists probing them all shrink to under half. The conversion is
+# transparent: the connection encodes uuid-shaped str parameters on the way in and the row
+# factory decodes 16-byte values on the way out, so callers see the same strings either way.
+# Anything not uuid-shaped (a test's "s1", a '#block' furniture anchor) is stored as is;
+# a 16-byte value would read back as a uuid, which no BLOB column (images, PDFs, gzip
+# payloads) ever holds. The price is on reads: the row factory runs in Python, and a
+# syllable load takes about twice as long as under the C `sqlite3.Row` — the mode trades
+# read time for file size (benchmarks/bench_syl_id_storage.py: 200k syllables, file -29%,
+# idx_syllables_sylid -44%). 'text' stays the default.
+
+_UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def _uuid_blob(v):
+    """``v`` as its 16 bytes when it is a canonical uuid string, else unchanged."""
+    if type(v) is str and len(v) == 36 and _UUID_RE.fullmatch(v):
+        return bytes.fromhex(v.replace("-", ""))
+    return v
+
+
+def _uuid_text(v):
+    """The inverse of ``_uuid_blob``: 16 bytes back to the canonical string."""
+    if type(v) is bytes and len(v) == 16:
+        h = v.hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+    return v
+
+
+def _blob_params(params):
+    if isinstance(params, dict):
+        return {k: _uuid_blob(v) for k, v in params.items()}
+    return tuple(map(_uuid_blob, params))
+
+
+class _BlobIdCursor(sqlite3.Cursor):
+    def execute(self, sql, params=()):
+        return super().execute(sql, _blob_params(params))
+
+    def executemany(self, sql, seq_of_params):
+        return super().executemany(sql, map(_blob_params, seq_of_params))
+
+
+class _BlobIdConnection(sqlite3.Connection):
+    def cursor(self, factory=_BlobIdCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+
+def _blob_id_row(cursor, row):
+    return sqlite3.Row(cursor, tuple(map(_uuid_text, row)))
+
+
+def _rebuild_syllable_id_storage(conn) -> None:
+    """Re-encode every stored syllable id to ``SYL_ID_STORAGE``, either way: in 'blob'
+    mode each canonical uuid string in a TEXT column becomes its 16 bytes, in 'text' mode
+    each 16-byte value in a TEXT column goes back to the string (BLOB columns — images,
+    PDFs, gzip payloads — are never touched). One transaction, so a database is never
+    half-encoded; whether there is anything to do is read off ``idx_syllables_sylid``
+    (a value's storage class orders it in the index), so a database already in the mode
+    costs two index probes. The file only shrinks at the next VACUUM."""
+    blob = SYL_ID_STORAGE == "blob"
+    conn.create_function("uuid_blob", 1, _uuid_blob, deterministic=True)
+    conn.create_function("uuid_text", 1, _uuid_text, deterministic=True)
+    if blob:
+        pending = conn.execute(
+            "SELECT 1 FROM syllables INDEXED BY idx_syllables_sylid "
+            "WHERE id >= '' AND id < x'' AND typeof(uuid_blob(id)) = 'blob' LIMIT 1").fetchone()
+        recode = ("UPDATE {t} SET {c} = uuid_blob({c}) WHERE typeof({c}) = 'text' "
+                  "AND length({c}) = 36 AND typeof(uuid_blob({c})) = 'blob'")
+    else:
+        pending = conn.execute(
+            "SELECT 1 FROM syllables INDEXED BY idx_syllables_sylid "
+            "WHERE id >= x'' LIMIT 1").fetchone()
+        recode = ("UPDATE {t} SET {c} = uuid_text({c}) WHERE typeof({c}) = 'blob' "
+                  "AND length({c}) = 16")
+    if pending is None:
+        return
+    with conn:
+        for t in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name NOT LIKE 'sqlite_%' AND sql NOT LIKE 'CREATE VIRTUAL%'").fetchall():
+            for c in conn.execute(f'PRAGMA table_info("{t["name"]}")').fetchall():
+                if "TEXT" in (c["type"] or "").upper():
+                    conn.execute(recode.format(t=f'"{t["name"]}"', c=f'"{c["name"]}"'))
+
+
 def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    if SYL_ID_STORAGE == "blob":
+        conn = sqlite3.connect(DB_PATH, factory=_BlobIdConnection)
+        conn.row_factory = _blob_id_row
+    else:
+        conn = sqlite3.connect(DB_PATH)
+        conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
     # Multi-user hygiene: don't fail instantly when another request holds the
     # write lock (journal_mode=WAL is set once, in init_db — it persists).
@@ -2109,6 +2418,38 @@ def _drop_booklet_shadow_rows(conn) -> None:
         "  WHERE i.document_id != document_layout.document_id)")
 
 
+def _drop_redundant_syllable_indexes(conn) -> None:
+    """Drop the two `syllables` indexes no query needs. `idx_syllables_text(text_id)` is a
+    prefix of the primary key's own index; `idx_syllables_offsets(text_id, start_offset)`
+    indexed an offset that is never searched — offsets are derived on read (E5). Over
+    200k syllables they were 14% of the vacuumed file and a quarter of the time to insert
+    them (benchmarks/bench_syllable_indexes.py). Idempotent."""
+    conn.execute("DROP INDEX IF EXISTS idx_syllables_text")
+    conn.execute("DROP INDEX IF EXISTS idx_syllables_offsets")
+
+
+def _drop_syllable_offset_columns(conn) -> None:
+    """Drop `syllables.start_offset/end_offset` and spread `idx` out to gapped keys.
+
+    Nothing reads the offsets (they are derived on read, E5), and keeping them current
+    would make ``persist_syllables`` rewrite every row after a length-changing edit
+    instead of only the syllables that changed; neither is in an index or constraint, so
+    a plain DROP COLUMN does it. The dense 1..n keys are scaled by ``manifest.IDX_GAP``
+    in the same pass (through negative keys, so the primary key never collides), so the
+    first re-bake of an existing text has room to insert. Runs once: only while the
+    offset columns are still there."""
+    from .manifest import IDX_GAP
+
+    cols = {r["name"] for r in conn.execute("PRAGMA table_info(syllables)")}
+    if "start_offset" not in cols:
+        return
+    conn.execute("UPDATE syllables SET idx = -idx * ?", (IDX_GAP,))
+    conn.execute("UPDATE syllables SET idx = -idx")
+    for col in ("start_offset", "end_offset"):
+        if col in cols:
+            conn.execute(f"ALTER TABLE syllables DROP COLUMN {col}")
+
+
 def init_db():
     conn = get_db()
     # WAL survives in the DB file; set once so concurrent multi-user reads never
@@ -2119,6 +2460,8 @@ def init_db():
         _drop_status_columns(conn)
         conn.executescript(SCHEMA)
         _add_missing_columns(conn)
+        _drop_redundant_syllable_indexes(conn)
+        _drop_syllable_offset_columns(conn)
         _rebuild_document_layout_kinds(conn)
         _rebuild_phonetics_lang(conn)
         _rebuild_text_groups_org(conn)
@@ -2139,6 +2482,10 @@ def init_db():
         # retries to re-render). The table only exists after the schema above.
         conn.execute("UPDATE document_versions SET status = 'failed', "
                      "error = 'interrupted by restart' WHERE status = 'rendering'")
+        # Same for a bake job queued or running in the in-process worker: its rollback
+        # left the text as it was; mark it failed so a poller stops waiting.
+        conn.execute("UPDATE bake_jobs SET status = 'failed', error = 'interrupted by restart', "
+                     "finished_at = CURRENT_TIMESTAMP WHERE status IN ('queued', 'running')")
         # The org's seal became a LIBRARY of images, each choosable per page…
         _migrate_org_seal_to_images(conn)
         # …and that library became TWO, cover seals and back-cover images kept apart.
@@ -2171,4 +2518,13 @@ def init_db():
     # Text pages: `document_items.kind` gains 'textpage'. Own foreign_keys-OFF
     # transaction, and after the additive column pass so `ref_document_id` exists.
     _rebuild_document_items_kinds(conn)
+    conn.executescript(LAYER_TRIGGERS)
+    # Syllable ids to the configured storage (SAPCHE_SYL_ID_STORAGE); after every rebuild
+    # above, so the rewrite sees the final tables. Own transaction.
+    _rebuild_syllable_id_storage(conn)
+    # Fill `stream_members` for secondaries it does not yet match (a database that predates
+    # the table, or one written by a path that does not refresh). Reads never fill it.
+    from .stream_members import refresh_stale  # late import (no module cycle)
+    with conn:
+        refresh_stale(conn)
     conn.close()
@@ -27,7 +27,11 @@ from collections import defaultdict
 
 from fastapi import HTTPException
 
-from .manifest import load_syllables, syllable_ids_between, generate_syllables, syllable_id
+from . import stream_cache, stream_members
+from .manifest import (
+    load_stream, syllable_ids_between, generate_syllables, syllable_id,
+)
+from .token_stream import TokenStream
 from .token_align import align_tokens
 
 
@@ -36,13 +40,19 @@ def _secondary_instance_id(text_id: int) -> str:
     return f"secondary_{text_id}"
 
 
-def _hosted_syllables(conn, op_id: int, by_id: dict) -> list[dict]:
-    """The ordered hosted syllables (real ``syllables`` rows) produced by an op."""
-    rows = conn.execute(
-        "SELECT syl_id FROM derivation_op_syllables WHERE op_id = ? ORDER BY position",
-        (op_id,),
-    ).fetchall()
-    return [by_id[r["syl_id"]] for r in rows if r["syl_id"] in by_id]
+def _hosted_by_op(conn, text_id: int) -> dict[int, list]:
+    """op id → its ordered hosted syllable rows ``(id, text, nature)``, for every op of
+    the text in one query. A link whose syllable row is gone is skipped."""
+    out: dict[int, list] = defaultdict(list)
+    for r in conn.execute(
+        "SELECT l.op_id, s.id, s.text, s.nature FROM derivation_ops o "
+        "JOIN derivation_op_syllables l ON l.op_id = o.id "
+        "JOIN syllables s ON s.id = l.syl_id AND s.text_id = o.text_id "
+        "WHERE o.text_id = ? ORDER BY l.op_id, l.position",
+        (text_id,),
+    ):
+        out[r["op_id"]].append(r)
+    return out
 
 
 def base_tokens(conn, text_id: int, _visited=None, cache: dict | None = None) -> list[dict]:
@@ -54,23 +64,41 @@ def base_tokens(conn, text_id: int, _visited=None, cache: dict | None = None) ->
     the annotation anchor maps all share, so a correction baked into a root primary
     ripples through every descendant automatically.
 
-    ``cache`` (text_id → tokens) memoizes compositions across the many calls a
-    single READ request makes — shared ancestors compose once, not per origin.
-    Callers that mutate syllables/ops must not reuse a cache across the mutation."""
+    ``cache`` memoizes compositions across the many calls a single READ request
+    makes — shared ancestors compose once, not per origin. Callers that mutate
+    syllables/ops must not reuse a cache across the mutation. The dicts are the
+    ``base_stream`` view (see ``TokenStream.dicts``) — shared, so read-only."""
+    return base_stream(conn, text_id, _visited, cache).dicts()
+
+
+def base_stream(conn, text_id: int, _visited=None, cache: dict | None = None) -> TokenStream:
+    """``base_tokens`` as a columnar ``TokenStream`` — what composition works on.
+    ``cache`` is text_id → TokenStream."""
     if cache is not None and text_id in cache:
         return cache[text_id]
     row = conn.execute(
         "SELECT text_type, parent_text_id FROM texts WHERE id = ?", (text_id,)
     ).fetchone()
     if row is None:
-        return []
+        return TokenStream()
     if row["text_type"] == "secondary" and row["parent_text_id"]:
-        toks = compose_secondary(conn, text_id, _visited, cache)
+        stream = composed_stream(conn, text_id, _visited, cache)
     else:
-        toks = load_syllables(conn, text_id)
+        stream = primary_stream(conn, text_id)
     if cache is not None:
-        cache[text_id] = toks
-    return toks
+        cache[text_id] = stream
+    return stream
+
+
+def primary_stream(conn, text_id: int) -> TokenStream:
+    """A primary's own syllables as a ``TokenStream`` (``load_stream``), served from the
+    ``stream_cache`` until one of its syllables is written — a shared stream, read-only."""
+    current = stream_cache.stamp(conn, text_id)
+    stream = stream_cache.lookup(text_id, current, kind="primary")
+    if stream is None:
+        stream = load_stream(conn, text_id)
+        stream_cache.store(conn, text_id, current, stream, kind="primary")
+    return stream
 
 
 def compose_secondary(conn, text_id: int, _visited=None, cache: dict | None = None) -> list[dict]:
@@ -84,19 +112,36 @@ def compose_secondary(conn, text_id: int, _visited=None, cache: dict | None = No
 
     Returns ordered token dicts ``{idx, id, text, nature, inserted, start_offset,
     end_offset, source, parent_syl_id?, src_text_id?, original?}``. Offsets are
-    cumulative over the composed text (frontend aid only)."""
+    cumulative over the composed text (frontend aid only).
+
+    The result is served from the process-wide ``stream_cache`` while no text it is
+    composed from has been written since — a shared list, so callers must not mutate it."""
+    return composed_stream(conn, text_id, _visited, cache).dicts()
+
+
+def composed_stream(conn, text_id: int, _visited=None, cache: dict | None = None) -> TokenStream:
+    """``compose_secondary`` as a columnar ``TokenStream`` (cached the same way)."""
     _visited = set() if _visited is None else _visited
     if text_id in _visited:  # defensive cycle guard (parent chains are acyclic by construction)
-        return []
-    _visited = _visited | {text_id}
-
+        return TokenStream()
+    current = stream_cache.stamp(conn, text_id)
+    stream = stream_cache.lookup(text_id, current)
+    if stream is None:
+        stream = _compose(conn, text_id, _visited | {text_id}, cache)
+        stream_cache.store(conn, text_id, current, stream)
+    return stream
+
+
+def _compose(conn, text_id: int, _visited: set, cache: dict | None) -> TokenStream:
+    """The uncached body of ``compose_secondary``."""
+    out = TokenStream()
     row = conn.execute("SELECT parent_text_id FROM texts WHERE id = ?", (text_id,)).fetchone()
     parent_id = row["parent_text_id"] if row else None
     if not parent_id:
-        return []
+        return out
 
-    parent_syls = base_tokens(conn, parent_id, _visited, cache)
-    hosted_by_id = {s["id"]: s for s in load_syllables(conn, text_id)}
+    parent = base_stream(conn, parent_id, _visited, cache)
+    hosted = _hosted_by_op(conn, text_id)
 
     ops = conn.execute(
         "SELECT * FROM derivation_ops WHERE text_id = ? ORDER BY position, id", (text_id,)
@@ -110,15 +155,10 @@ def compose_secondary(conn, text_id: int, _visited=None, cache: dict | None = No
         else:  # override / delete — one per anchored parent syllable
             at[op["anchor_syl_id"]] = op
 
-    out: list[dict] = []
-
     def emit_hosted(op, source: str, parent_syl_id=None, original=None) -> None:
-        for s in _hosted_syllables(conn, op["id"], hosted_by_id):
-            out.append({
-                "id": s["id"], "text": s["text"], "nature": s["nature"],
-                "source": source, "parent_syl_id": parent_syl_id, "original": original,
-                "op_id": op["id"],
-            })
+        for s in hosted.get(op["id"], ()):
+            out.add_hosted(s["id"], s["text"], s["nature"], source, op["id"],
+                           parent_syl_id, original)
 
     def emit_transclude(op) -> None:
         # Source ranges resolve through the source's COMPOSED sequence (base_tokens),
@@ -131,15 +171,13 @@ def compose_secondary(conn, text_id: int, _visited=None, cache: dict | None = No
         # the layers above address content by — the booklet stores its page breaks as
         # `startSylId#opId` — so cutting a run must not renumber the half after the cut.
         occurrence = op["split_of"] or op["id"]
-        src_syls = base_tokens(conn, op["src_text_id"], _visited, cache)
-        by = {s["id"]: s for s in src_syls}
-        for sid in syllable_ids_between(src_syls, op["src_start_syl_id"], op["src_end_syl_id"]):
-            s = by[sid]
-            out.append({
-                "id": s["id"], "text": s["text"], "nature": s["nature"],
-                "source": "transclusion", "src_text_id": op["src_text_id"],
-                "op_id": occurrence,
-            })
+        src = base_stream(conn, op["src_text_id"], _visited, cache)
+        run = src.span_between(op["src_start_syl_id"], op["src_end_syl_id"])
+        if run is None:
+            return
+        ids, texts, natures = src.ids, src.texts, src.natures
+        for k in range(run[0], run[1] + 1):
+            out.add_transcluded(ids[k], texts[k], natures[k], occurrence, op["src_text_id"])
 
     def emit_spliced(op) -> None:
         if op["op_kind"] == "insert":
@@ -147,30 +185,20 @@ def compose_secondary(conn, text_id: int, _visited=None, cache: dict | None = No
         else:
             emit_transclude(op)
 
-    for p in parent_syls:
-        for op in before.get(p["id"], []):
+    for pid, ptext, pnature in zip(parent.ids, parent.texts, parent.natures):
+        for op in before.get(pid, ()):
             emit_spliced(op)
-        a = at.get(p["id"])
+        a = at.get(pid)
         if a is not None and a["op_kind"] == "delete":
             continue
         if a is not None and a["op_kind"] == "override":
-            emit_hosted(a, "override", parent_syl_id=p["id"], original=p["text"])
+            emit_hosted(a, "override", parent_syl_id=pid, original=ptext)
         else:
-            out.append({
-                "id": p["id"], "text": p["text"], "nature": p["nature"],
-                "source": "parent-link",
-            })
+            out.add_link(pid, ptext, pnature)
     for op in at_end:
         emit_spliced(op)
-
-    # Attach idx + cumulative offsets over the composed text (frontend rendering aid).
-    cursor = 0
-    for i, t in enumerate(out):
-        t["idx"] = i + 1
-        t["inserted"] = False
-        t["start_offset"] = cursor
-        cursor += len(t["text"])
-        t["end_offset"] = cursor
+    # idx + cumulative offsets over the composed text (frontend rendering aid) are
+    # derived on demand by the stream (`ends`, `dicts`).
     return out
 
 
@@ -178,6 +206,40 @@ def composed_raw_text(tokens: list[dict]) -> str:
     return "".join(t["text"] for t in tokens)
 
 
+def _token_key(t: dict) -> tuple:
+    # Everything a token IS, minus where it sits (idx/offsets shift with any splice upstream).
+    return (t["id"], t.get("op_id"), t["text"], t["source"])
+
+
+def compose_delta(old: list[dict], new: list[dict]) -> dict:
+    """The splice turning composed stream ``old`` into ``new``: replace ``old[start :
+    start + delete_count]`` by ``tokens``, then shift every token after the splice by
+    ``len(tokens) - delete_count`` in ``idx`` and by ``offset_shift`` in its offsets.
+
+    An op edit touches one run of the stream, so this is what a client needs after an
+    edit instead of the whole (possibly 50k-token) sequence. Found by trimming the
+    common prefix and suffix — O(n) comparisons, no alignment."""
+    n_old, n_new = len(old), len(new)
+    start = 0
+    limit = min(n_old, n_new)
+    while start < limit and _token_key(old[start]) == _token_key(new[start]):
+        start += 1
+    tail = 0
+    while (tail < limit - start
+           and _token_key(old[n_old - 1 - tail]) == _token_key(new[n_new - 1 - tail])):
+        tail += 1
+    removed = old[start:n_old - tail]
+    added = new[start:n_new - tail]
+    return {
+        "start": start,
+        "delete_count": len(removed),
+        "tokens": added,
+        "offset_shift": (sum(len(t["text"]) for t in added)
+                         - sum(len(t["text"]) for t in removed)),
+        "length": n_new,
+    }
+
+
 def _require_secondary(conn, text_id: int):
     row = conn.execute(
         "SELECT id, text_type, parent_text_id FROM texts WHERE id = ?", (text_id,)
@@ -201,15 +263,14 @@ def _host_syllable(conn, text_id: int, instance_id: str, next_idx: list, text: s
     """Create a real hosted ``syllables`` row for a secondary text and return its uuid.
 
     ``next_idx`` is a one-element list used as a monotonic counter so minted uuids and
-    the (text_id, idx) primary key stay unique across repeated edits. The stored
-    offsets are placeholders (0) — offsets for a secondary are derived on compose and
-    are frontend-only, never an anchor (per the syllable-native directive)."""
+    the (text_id, idx) primary key stay unique across repeated edits. No offsets are
+    stored — offsets for a secondary are derived on compose and are frontend-only,
+    never an anchor (per the syllable-native directive)."""
     next_idx[0] += 1
     idx = next_idx[0]
     sid = syllable_id(instance_id, idx, text)
     conn.execute(
-        "INSERT INTO syllables (id, text_id, idx, start_offset, end_offset, text, nature) "
-        "VALUES (?, ?, ?, 0, 0, ?, ?)",
+        "INSERT INTO syllables (id, text_id, idx, text, nature) VALUES (?, ?, ?, ?, ?)",
         (sid, text_id, idx, text, nature),
     )
     return sid
@@ -458,6 +519,7 @@ def edit_range(conn, text_id: int, start_syl_id: str, end_syl_id: str, new_text:
         elif op.kind == "insert":
             pending_inserts.append(new_syls[op.new])
     flush_inserts(after_anchor)
+    stream_members.refresh(conn, text_id)
 
 
 def insert_break(conn, text_id: int, before_syl_id, anchor_op_id=None) -> None:
@@ -490,6 +552,7 @@ def insert_break(conn, text_id: int, before_syl_id, anchor_op_id=None) -> None:
         "INSERT INTO derivation_op_syllables (op_id, position, syl_id) VALUES (?, 0, ?)",
         (cur.lastrowid, sid),
     )
+    stream_members.refresh(conn, text_id)
 
 
 def _split_transclude(conn, op, at_syl_id: str, ids: list) -> int:
@@ -584,6 +647,7 @@ def transclude(conn, text_id: int, anchor_syl_id, src_text_id: int,
         "VALUES (?, 'transclude', ?, ?, ?, ?, ?)",
         (text_id, anchor_syl_id, pos, src_text_id, src_start_syl_id, src_end_syl_id),
     )
+    stream_members.refresh(conn, text_id)
     # The op id IS the occurrence: a caller placing a segment boundary at the run's head
     # scopes it with this, so the same source inserted inline elsewhere keeps none.
     return {"op_id": cur.lastrowid,
@@ -608,7 +672,9 @@ def _delete_op(conn, op_id: int) -> None:
 
 
 def delete_op(conn, op_id: int) -> bool:
-    if not conn.execute("SELECT 1 FROM derivation_ops WHERE id = ?", (op_id,)).fetchone():
+    row = conn.execute("SELECT text_id FROM derivation_ops WHERE id = ?", (op_id,)).fetchone()
+    if row is None:
         return False
     _delete_op(conn, op_id)
+    stream_members.refresh(conn, row["text_id"])
     return True
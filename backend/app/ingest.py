@@ -0,0 +1,105 @@
+"""Bulk ingest of whole corpora of ``.txt`` texts.
+
+``upload_text`` handles one file per request. For a corpus of hundreds of texts the botok
+tiling dominates, and it is pure CPU work that does not need the database: ``ingest_texts``
+runs it (``tokenize_pool.prepare_text``) in a process pool, then numbers the tiles
+into syllables in this process — the instance id, and so every uuid, depends on the text
+id the INSERT hands back — and writes them with ``executemany``, committing once per
+``batch_size`` texts instead of once per text.
+
+A first ingest has no existing syllables to reconcile against, so the freshly minted ids
+are the persistent identity (what ``persist_syllables`` would keep anyway) and
+``assign_stable_ids`` is skipped.
+"""
+import time
+from typing import Iterable, Optional
+
+from . import tokenize_pool
+from .manifest import IDX_GAP, fallback_instance_id, syllables_from_tiles
+
+_INSERT_SYLLABLES = (
+    "INSERT INTO syllables (id, text_id, idx, text, nature) VALUES (?, ?, ?, ?, ?)")
+
+
+def _prepared(sources: list[str], workers: Optional[int]):
+    """``prepare_text`` over ``sources``, in order, and the pool to shut down after
+    (None for the shared warm pool). ``workers`` None uses the shared pool; 0 or 1
+    runs inline."""
+    prepare = tokenize_pool.prepare_text
+    if workers is None:
+        pool = tokenize_pool.executor()
+        n = tokenize_pool.workers()
+        if pool is None or len(sources) <= 1:
+            return map(prepare, sources), None
+        return pool.map(prepare, sources, chunksize=max(1, len(sources) // (n * 4))), None
+    if workers <= 1 or len(sources) <= 1:
+        return map(prepare, sources), None
+    pool = tokenize_pool.process_pool(workers)
+    chunksize = max(1, len(sources) // (workers * 4))
+    return pool.map(prepare, sources, chunksize=chunksize), pool
+
+
+def ingest_texts(conn, files: Iterable[tuple[str, str]], org_id: int,
+                 text_group: Optional[str] = None, workers: Optional[int] = None,
+                 batch_size: int = 50) -> dict:
+    """Create one primary text per ``(filename, source_text)`` and build its syllable
+    layer. Titles are the filename stems. ``workers`` None tiles on the app's shared
+    pool (app/tokenize_pool.py); a number uses a pool of that size made for this call.
+    Commits every ``batch_size`` texts; a failed batch rolls back alone and is reported,
+    the batches before it stay. Returns the created ids, per-file errors and the
+    throughput."""
+    files = list(files)
+    started = time.perf_counter()
+    text_ids: list[int] = []
+    errors: list[dict] = []
+    syllable_count = 0
+    results, pool = _prepared([source for _name, source in files], workers)
+    try:
+        batch: list[tuple[int, str]] = []
+        batch_syllables = 0
+        for (filename, source_text), (raw_text, tiles) in zip(files, results):
+            if raw_text is None:
+                errors.append({"filename": filename, "error": tiles})
+                continue
+            title = filename.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+            try:
+                cur = conn.execute(
+                    "INSERT INTO texts (org_id, filename, title, text_group, source_text, "
+                    "raw_text) VALUES (?, ?, ?, ?, ?, ?)",
+                    (org_id, filename, title, text_group, source_text, raw_text))
+                text_id = cur.lastrowid
+                instance_id = fallback_instance_id(title, text_id)
+                conn.execute("UPDATE texts SET instance_id = ? WHERE id = ?",
+                             (instance_id, text_id))
+                syllables = syllables_from_tiles(tiles, instance_id, len(raw_text))
+                conn.executemany(_INSERT_SYLLABLES, [
+                    (s["id"], text_id, s["idx"] * IDX_GAP, s["text"], s["nature"])
+                    for s in syllables])
+            except Exception as exc:  # noqa: BLE001 — reported per file, the rest go on
+                conn.rollback()
+                errors.append({"filename": filename, "error": str(exc)})
+                errors.extend({"filename": f, "error": "rolled back with its batch"}
+                              for _id, f in batch)
+                batch, batch_syllables = [], 0
+                continue
+            batch.append((text_id, filename))
+            batch_syllables += len(syllables)
+            if len(batch) >= batch_size:
+                conn.commit()
+                text_ids.extend(tid for tid, _f in batch)
+                syllable_count += batch_syllables
+                batch, batch_syllables = [], 0
+        conn.commit()
+        text_ids.extend(tid for tid, _f in batch)
+        syllable_count += batch_syllables
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    seconds = time.perf_counter() - started
+    return {
+        "text_ids": text_ids,
+        "errors": errors,
+        "syllables": syllable_count,
+        "seconds": round(seconds, 3),
+        "syllables_per_sec": round(syllable_count / seconds, 1) if seconds else 0.0,
+    }
@@ -9,26 +9,125 @@ OWNING text and ripples; the child only adds its own rows.
 """
 
 
-def source_texts(cursor, text_id: int, _seen=None) -> list[int]:
+import json
+import threading
+
+from . import db
+
+# The whole reachable graph in one statement: `reach` walks parent links and transclusion
+# sources from the start node(s); the outer SELECT returns every edge out of a reached
+# node (kind 0 = parent, 1 = transclusion source) so the walk order can be replayed in
+# Python without another round-trip.
+_GRAPH_SQL = """
+WITH RECURSIVE reach(id) AS (
+    SELECT value FROM json_each(?)
+    UNION
+    SELECT t.parent_text_id FROM texts t JOIN reach r ON t.id = r.id
+    WHERE t.parent_text_id IS NOT NULL
+    UNION
+    SELECT d.src_text_id FROM derivation_ops d JOIN reach r ON d.text_id = r.id
+    WHERE d.op_kind = 'transclude' AND d.src_text_id IS NOT NULL
+)
+SELECT t.id AS node, 0 AS kind, t.parent_text_id AS nxt
+FROM texts t JOIN reach r ON t.id = r.id WHERE t.parent_text_id IS NOT NULL
+UNION
+SELECT d.text_id, 1, d.src_text_id
+FROM derivation_ops d JOIN reach r ON d.text_id = r.id
+WHERE d.op_kind = 'transclude' AND d.src_text_id IS NOT NULL
+ORDER BY node, kind, nxt
+"""
+
+_CACHE_MAX = 1024
+_lock = threading.Lock()
+_closures: dict = {}      # (db path, text_id) -> (graph generation, closure tuple)
+
+
+def _graph(cursor, start_ids) -> tuple[dict, dict]:
+    """Parent and (sorted) transclusion-source edges of everything reachable from
+    ``start_ids``."""
+    parent: dict[int, int] = {}
+    sources: dict[int, list[int]] = {}
+    for r in cursor.execute(_GRAPH_SQL, (json.dumps(list(start_ids)),)).fetchall():
+        if r["kind"] == 0:
+            parent[r["node"]] = r["nxt"]
+        else:
+            sources.setdefault(r["node"], []).append(r["nxt"])
+    return parent, sources
+
+
+def _graph_generation(cursor) -> int:
+    row = cursor.execute(
+        "SELECT generation FROM derivation_graph_generation WHERE id = 1").fetchone()
+    return row["generation"] if row else 0
+
+
+def source_texts(cursor, text_id: int) -> list[int]:
     """Every text whose annotations can resolve on this text's composed stream: the
     parent chain plus transclusion sources, recursively (a grandparent's transcluded
-    source flows through too). Cycle-guarded; self excluded; stable order."""
-    _seen = set() if _seen is None else _seen
-    if text_id in _seen:
-        return []
-    _seen.add(text_id)
+    source flows through too). Cycle-guarded; self excluded; stable order — depth first,
+    the parent before the sources, sources by id.
+
+    One recursive-CTE query for the whole graph, and none at all while the process-wide
+    cache is current (``derivation_graph_generation`` is bumped by triggers on every write
+    that can change a closure). Closures seen inside a transaction are not cached."""
+    key = (db.DB_PATH, text_id)
+    gen = _graph_generation(cursor)
+    with _lock:
+        hit = _closures.get(key)
+    if hit is not None and hit[0] == gen:
+        return list(hit[1])
+
+    parent, sources = _graph(cursor, [text_id])
+    seen = {text_id}
     out: list[int] = []
-    row = cursor.execute(
-        "SELECT parent_text_id FROM texts WHERE id = ?", (text_id,)).fetchone()
-    if row and row["parent_text_id"] and row["parent_text_id"] not in _seen:
-        out.append(row["parent_text_id"])
-        out.extend(source_texts(cursor, row["parent_text_id"], _seen))
-    for r in cursor.execute(
-            "SELECT DISTINCT src_text_id FROM derivation_ops "
-            "WHERE text_id = ? AND op_kind = 'transclude' AND src_text_id IS NOT NULL "
-            "ORDER BY src_text_id", (text_id,)).fetchall():
-        src = r["src_text_id"]
-        if src not in _seen:
-            out.append(src)
-            out.extend(source_texts(cursor, src, _seen))
+
+    def walk(node: int) -> None:
+        nxt = [parent[node]] if node in parent else []
+        for n in nxt + sources.get(node, []):
+            if n not in seen:
+                seen.add(n)
+                out.append(n)
+                walk(n)
+    walk(text_id)
+
+    conn = getattr(cursor, "connection", cursor)    # callers pass a cursor or a connection
+    if not conn.in_transaction:
+        with _lock:
+            if len(_closures) >= _CACHE_MAX:
+                _closures.clear()
+            _closures[key] = (gen, tuple(out))
     return out
+
+
+def text_closure(cursor, root_ids) -> list[int]:
+    """``root_ids`` plus everything they compose from (parents and transclusion sources,
+    transitively), sorted. One query."""
+    roots = [t for t in root_ids if t is not None]
+    if not roots:
+        return []
+    parent, sources = _graph(cursor, roots)
+    found = set(roots) | set(parent.values())
+    for srcs in sources.values():
+        found.update(srcs)
+    return sorted(found)
+
+
+# The reverse walk: every text composed from the start node, through parent links and
+# transclusions, transitively (the start node included).
+_DEPENDENTS_SQL = """
+WITH RECURSIVE down(id) AS (
+    SELECT ?
+    UNION
+    SELECT t.id FROM texts t JOIN down d ON t.parent_text_id = d.id
+    UNION
+    SELECT o.text_id FROM derivation_ops o JOIN down d ON o.src_text_id = d.id
+    WHERE o.op_kind = 'transclude'
+)
+SELECT id FROM down ORDER BY id
+"""
+
+
+def dependent_texts(cursor, text_id: int) -> list[int]:
+    """``text_id`` plus every text whose ``source_texts`` closure contains it — whose
+    composed stream a write to ``text_id`` can change. One query, sorted."""
+    return [r["id"] for r in cursor.execute(_DEPENDENTS_SQL, (text_id,)).fetchall()]
@@ -0,0 +1,151 @@
+"""Process-wide cache of computed per-text reads, and their ETag revalidation.
+
+Some reads are pure functions of a few annotation layers of a text's source closure and of
+the closure's streams — the outline (``tree_nodes``) is the tree rows, the display slots,
+the passages and the composition of every text it inherits from — yet are recomputed in
+full on every request, and clients refetch them after every edit. Each such layer bumps a
+per-text row of ``layer_generations`` on write (SQLite triggers, ``db.LAYER_TRIGGERS``), and
+every stream write bumps ``stream_generations``. So a computed read is keyed by its text
+id and *stamped* with those generations over ``[text_id] + source_texts(text_id)``: a
+lookup whose stamp differs is a miss, and no write path has to invalidate anything.
+Document reads are stamped the same way from ``document_generations`` (``document_stamp``).
+
+The stamp also makes a strong ETag (``etag``): the same stamp always yields the same body,
+so a client holding it gets a 304 (``revalidate``) until something the read depends on is
+written — without the read being computed at all. Every annotation list endpoint answers
+so; only the outline also keeps its payload here.
+
+Cached payloads are SHARED between requests — callers must treat them as read-only.
+Entries are only stored outside a transaction, as in ``stream_cache``.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import Request, Response
+
+from . import db
+from .inherit import source_texts
+
+_MAX_ENTRIES = 128
+
+# Mixed into every ETag, so a restart — possibly new code rendering a new payload shape —
+# never revalidates a body the previous process served.
+_BOOT = os.urandom(8).hex()
+
+_lock = threading.Lock()
+_entries: OrderedDict = OrderedDict()   # (db path, kind, text_id) -> (stamp, payload)
+
+
+def stamp(conn, text_id: int, layers: tuple) -> tuple:
+    """The generations ``text_id``'s read over ``layers`` is computed from: for every text of
+    its source closure, its stream generation and its generation of each layer (-1 while
+    never written), the layers' global generations (text 0), plus the text's type, which
+    picks its anchor space (and is None once the text is gone)."""
+    closure = [text_id] + source_texts(conn, text_id)
+    marks = ",".join("?" * len(closure))
+    streams = {r["text_id"]: r["generation"] for r in conn.execute(
+        f"SELECT text_id, generation FROM stream_generations WHERE text_id IN ({marks})",
+        closure)}
+    gens = _generations(conn, "layer_generations", "text_id", closure, layers)
+    row = conn.execute("SELECT text_type FROM texts WHERE id = ?", (text_id,)).fetchone()
+    return (row["text_type"] if row else None,) + tuple(
+        (t, streams.get(t, -1)) + tuple(gens.get((t, layer), -1) for layer in layers)
+        for t in closure + [0])
+
+
+def document_stamp(conn, document_id: int, layers: tuple) -> tuple:
+    """As ``stamp``, for a document: its generation of each layer and that of every text
+    page it reuses (whose rows it shows), and the org-wide ones (document 0)."""
+    closure = [document_id] + [r["ref_document_id"] for r in conn.execute(
+        "SELECT ref_document_id FROM document_items WHERE document_id = ? "
+        "AND kind = 'textpage' AND ref_document_id IS NOT NULL ORDER BY position, id",
+        (document_id,))]
+    gens = _generations(conn, "document_generations", "document_id", closure, layers)
+    return tuple((d,) + tuple(gens.get((d, layer), -1) for layer in layers)
+                 for d in closure + [0])
+
+
+def _generations(conn, table: str, col: str, keys: list, layers: tuple) -> dict:
+    keys = keys + [0]
+    return {(r[col], r["layer"]): r["generation"] for r in conn.execute(
+        f"SELECT {col}, layer, generation FROM {table} "
+        f"WHERE {col} IN ({','.join('?' * len(keys))}) "
+        f"AND layer IN ({','.join('?' * len(layers))})",
+        keys + list(layers))}
+
+
+def etag(kind: str, text_id: int, current: tuple) -> str:
+    """A strong ETag for the ``kind`` read of ``text_id`` at ``current``."""
+    digest = hashlib.sha1(repr((_BOOT, db.DB_PATH, kind, text_id, current)).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def matches(if_none_match: str | None, tag: str) -> bool:
+    """Whether an ``If-None-Match`` header names ``tag`` (or is ``*``)."""
+    if not if_none_match:
+        return False
+    return any(t.strip() in (tag, "*") for t in if_none_match.split(","))
+
+
+def revalidate(request: Optional[Request], response: Optional[Response],
+               tag: str) -> Optional[Response]:
+    """The bodiless 304 to return when the request's ``If-None-Match`` names ``tag``; else
+    None, having tagged ``response`` (revalidated on every use: ``no-cache``). Both are
+    None when an endpoint is called directly rather than over HTTP."""
+    if request is not None and matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers={"ETag": tag})
+    if response is not None:
+        response.headers["ETag"] = tag
+        response.headers["Cache-Control"] = "no-cache"
+    return None
+
+
+def text_not_modified(conn, request: Optional[Request], response: Optional[Response],
+                      kind: str, text_id: int, layers: tuple) -> Optional[Response]:
+    """``revalidate`` the ``kind`` read of ``text_id`` over ``layers``: the 304 to return
+    instead of computing it, or None (and ``response`` tagged). Free when called directly."""
+    if request is None and response is None:
+        return None
+    return revalidate(request, response, etag(kind, text_id, stamp(conn, text_id, layers)))
+
+
+def document_not_modified(conn, request: Optional[Request], response: Optional[Response],
+                          kind: str, document_id: int, layers: tuple) -> Optional[Response]:
+    """As ``text_not_modified``, for a read of a document."""
+    if request is None and response is None:
+        return None
+    return revalidate(request, response, etag(
+        kind, document_id, document_stamp(conn, document_id, layers)))
+
+
+def lookup(kind: str, text_id: int, current: tuple):
+    """The cached ``kind`` read of ``text_id`` if it was computed at ``current``, else None."""
+    key = (db.DB_PATH, kind, text_id)
+    with _lock:
+        hit = _entries.get(key)
+        if hit is None or hit[0] != current:
+            return None
+        _entries.move_to_end(key)
+        return hit[1]
+
+
+def store(conn, kind: str, text_id: int, current: tuple, payload) -> None:
+    """Remember ``payload`` as the ``kind`` read of ``text_id`` at ``current``. Skipped inside
+    a transaction: the writes it saw may yet roll back."""
+    if conn.in_transaction:
+        return
+    key = (db.DB_PATH, kind, text_id)
+    with _lock:
+        _entries[key] = (current, payload)
+        _entries.move_to_end(key)
+        while len(_entries) > _MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
@@ -8,10 +8,11 @@ from fastapi.responses import JSONResponse
 
 from .auth import guard
 from .db import init_db
+from . import tokenize_pool
 from .routers import (
     texts, tags, spans, markers, tree_nodes, suggestions, notes, passages,
     derivation, text_groups, reading_positions, display_breaks, translations,
-    phonetics, documents, styles, auth as auth_router, orgs,
+    phonetics, documents, styles, auth as auth_router, orgs, bundle,
 )
 
 app = FastAPI(title="Sapche Backend API")
@@ -45,6 +46,7 @@ _guarded(notes.router, "workspace",
 _guarded(passages.router, "workspace", {"text_id": "text", "passage_id": "passage"})
 _guarded(derivation.router, "workspace", {"text_id": "text", "op_id": "op"})
 _guarded(display_breaks.router, "workspace", {"text_id": "text"})
+_guarded(bundle.router, "workspace", {"text_id": "text"})
 _guarded(reading_positions.router, "texts", {"text_id": "text"}, write_level="read")
 _guarded(translations.router, "translate",
          {"text_id": "text", "chunk_id": "chunk", "sug_id": "tr_suggestion",
@@ -85,6 +87,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Outline reads revalidate by ETag; a cross-origin client must be able to read it.
+    expose_headers=["ETag"],
 )
 
 
@@ -93,6 +97,11 @@ def on_startup():
     init_db()
 
 
+@app.on_event("shutdown")
+def on_shutdown():
+    tokenize_pool.shutdown()
+
+
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
@@ -17,8 +17,10 @@ ChunkTokenizer is lossless per line (verified against the real text), so
 the produced syllables reconstruct raw_text exactly and carry true offsets.
 """
 
+import os
 import re
 import uuid
+from functools import lru_cache
 
 from .tokenizer import split_text_at_yigmgo
 
@@ -35,6 +37,14 @@ def default_instance_id(text: str) -> str:
     return slug or "instance"
 
 
+def fallback_instance_id(title: str, text_id: int) -> str:
+    """The instance id of a text ingested without one: the title slug suffixed with the
+    text id. Syllable uuids are minted from (instance_id, idx, text), so instance ids
+    MUST be unique per text or two texts sharing (idx, syllable) mint the SAME uuid —
+    Tibetan titles all slug to "instance" (the title-bleed bug)."""
+    return f"{default_instance_id(title)}_t{text_id}"
+
+
 def syllable_id(instance_id: str, index: int, text: str) -> str:
     """The stable manifest id for a syllable, matching base_layer_ingest.py."""
     return str(uuid.uuid5(NAMESPACE_KHYENTSE, f"{instance_id}_{index}_{text}"))
@@ -53,7 +63,56 @@ def _gap_nature(gap: str) -> str:
     return "OTHER"
 
 
+# Tiling is a pure function of the line, and liturgical texts repeat lines heavily
+# (refrains, mantras, the same verse in every section); every (re)build of a syllable
+# layer, corrected view or merged root re-tiles whole texts. A bounded per-process LRU
+# of line → chunks serves them all. ``tile_cache_info()`` gives hits/misses for tuning.
+TILE_CACHE_SIZE = int(os.environ.get("SAPCHE_TILE_CACHE_SIZE", "20000"))
+
+
 def tile_line(line: str) -> list[tuple[str, str]]:
+    """Return ``(nature, text)`` chunks that EXACTLY tile ``line`` (memoized; see
+    ``_tile_line``)."""
+    return list(_tile_line_cached(line))
+
+
+def tile_cache_info():
+    """``functools`` cache statistics of the line tiler: hits, misses, maxsize, currsize."""
+    return _tile_line_cached.cache_info()
+
+
+@lru_cache(maxsize=TILE_CACHE_SIZE)
+def _tile_line_cached(line: str) -> tuple[tuple[str, str], ...]:
+    if _FAST_LINE.fullmatch(line):
+        return tuple(_tile_line_fast(line))
+    return tuple(_tile_line(line))
+
+
+# The fast path: a line made only of native Tibetan syllables (a consonant, then
+# consonants / subjoined consonants / the four vowel signs), each closed by at most one
+# tsek, a single space after a tsek, and runs of shad and spaces, is tiled exactly as
+# botok's ChunkTokenizer would — a TEXT chunk per syllable (its tsek and following
+# space included), a PUNCT chunk per shad run (its spaces included) — by one regex.
+# Anything else (Sanskrit letters, numerals, symbols, yig-mgo, tsek runs, a space not
+# after a tsek, Latin, leading spaces) goes to botok. Checked chunk-for-chunk against
+# botok by tests/test_tokenizer.py and benchmarks/bench_tile_line.py.
+_FAST_CONS = "ཀཁགངཅཆཇཉཏཐདནཔཕབམཙཚཛཝཞཟའཡརལཤསཧཨཪ"
+_FAST_SUB = "ྐྒྔྕྗྙྟྡྣྤྦྨྩྫྭྱྲླྷ"
+_FAST_VOW = "ིེོུ"
+# Possessive quantifiers: a syllable never gives letters back, so a rejected line fails
+# in linear time instead of backtracking through every split of its letter runs.
+_FAST_CHUNK_RE = (f"[{_FAST_CONS}][{_FAST_CONS}{_FAST_SUB}{_FAST_VOW}]*+"
+                  f"(?:་(?: (?=[{_FAST_CONS}]))?)?|།[། ]*+")
+_FAST_LINE = re.compile(f"(?:{_FAST_CHUNK_RE})*+")
+_FAST_CHUNK = re.compile(_FAST_CHUNK_RE)
+
+
+def _tile_line_fast(line: str) -> list[tuple[str, str]]:
+    """``_tile_line`` for a line ``_FAST_LINE`` accepts, without botok."""
+    return [("PUNCT" if m[0][0] == "།" else "TEXT", m[0]) for m in _FAST_CHUNK.finditer(line)]
+
+
+def _tile_line(line: str) -> list[tuple[str, str]]:
     """Return ``(nature, text)`` chunks that EXACTLY tile ``line``.
 
     A maximal run of >=2 consecutive tseks (``་``) — a transcriber's mark for a
@@ -99,38 +158,117 @@ def generate_syllables(raw_text: str, instance_id: str) -> list[dict]:
     Guarantees: the syllables tile raw_text with no gaps or overlaps, i.e.
     ``"".join(s["text"] for s in result) == raw_text``.
     """
-    syllables: list[dict] = []
-    cursor = 0
-    index = 1
-    n = len(raw_text)
+    return syllables_from_tiles(tile_text(raw_text), instance_id, len(raw_text))
+
+
+def tile_text(raw_text: str) -> list[tuple[str, str]]:
+    """``(nature, text)`` chunks tiling the whole of ``raw_text``: each line's
+    ``tile_line`` chunks, with a ``("SPACE", "\n")`` between lines. The botok-bound
+    half of ``generate_syllables`` — independent of the instance id, so it can run
+    before the text (and thus its id) exists, e.g. in a worker process."""
+    tiles: list[tuple[str, str]] = []
     lines = raw_text.split("\n")
+    for i, line in enumerate(lines):
+        tiles.extend(_tile_line_cached(line))
+        # A '\n' separates every pair of lines; there is none after the last.
+        if i < len(lines) - 1:
+            tiles.append(("SPACE", "\n"))
+    return tiles
+
 
-    def emit(start: int, end: int, text: str, nature: str) -> None:
-        nonlocal index
+def syllables_from_tiles(tiles, instance_id: str, n: int | None = None) -> list[dict]:
+    """Number ``tile_text`` chunks into syllable dicts with offsets and uuid5 ids.
+    ``n`` (the raw text's length) is checked against the coverage when given."""
+    syllables: list[dict] = []
+    cursor = 0
+    for index, (nature, text) in enumerate(tiles, start=1):
+        end = cursor + len(text)
         syllables.append({
             "idx": index,
             "id": syllable_id(instance_id, index, text),
-            "start_offset": start,
+            "start_offset": cursor,
             "end_offset": end,
             "text": text,
             "nature": nature,
         })
-        index += 1
+        cursor = end
+    assert n is None or cursor == n, f"syllable coverage {cursor} != raw_text {n}"
+    return syllables
 
-    for i, line in enumerate(lines):
-        for nature, tok in tile_line(line):
-            emit(cursor, cursor + len(tok), tok, nature)
-            cursor += len(tok)
-        # A '\n' separates every pair of lines; there is none after the last.
-        if i < len(lines) - 1:
-            emit(cursor, cursor + 1, "\n", "SPACE")
-            cursor += 1
 
-    assert cursor == n, f"syllable coverage {cursor} != raw_text {n}"
-    return syllables
+# ``syllables.idx`` is an ordering key, not a position: keys are written ``IDX_GAP`` apart,
+# so a syllable inserted by a re-bake takes a key between its neighbours' and no other
+# row is renumbered. Reads (``load_syllables``, ``load_stream``) report the 1-based
+# position instead, as before.
+IDX_GAP = 1024
 
 
-def persist_syllables(conn, text_id: int, instance_id: str, raw_text: str) -> int:
+def _kept_keys(keys: list) -> list:
+    """The longest strictly increasing subsequence of the non-None ``keys`` kept in
+    place; every other entry set to None (it needs a new key)."""
+    from bisect import bisect_left
+
+    tails: list[int] = []       # smallest tail key of an increasing run of each length
+    tail_at: list[int] = []     # position of that tail
+    prev = [-1] * len(keys)
+    for i, k in enumerate(keys):
+        if k is None:
+            continue
+        j = bisect_left(tails, k)
+        prev[i] = tail_at[j - 1] if j else -1
+        if j == len(tails):
+            tails.append(k)
+            tail_at.append(i)
+        else:
+            tails[j] = k
+            tail_at[j] = i
+    out = [None] * len(keys)
+    i = tail_at[-1] if tail_at else -1
+    while i >= 0:
+        out[i] = keys[i]
+        i = prev[i]
+    return out
+
+
+def _gap_keys(keys: list) -> list[int]:
+    """Fill the None entries of ``keys`` (increasing where set) so the whole list is
+    strictly increasing, changing as few set keys as it can.
+
+    A run of new entries is spread evenly between its neighbours' keys when it fits.
+    When it does not, the window around it grows (doubling) over neighbouring rows
+    until its keys are at least ``IDX_GAP // 2`` apart on average, or it reaches the
+    end of the text (unbounded above), and the whole window is respaced. A window edge
+    landing in a later run of new entries takes that run in whole: its upper bound is
+    always a set key, or the end of the text."""
+    out = list(keys)
+    n = len(out)
+    i = 0
+    while i < n:
+        if out[i] is not None:
+            i += 1
+            continue
+        lo = hi = i
+        while hi < n and out[hi] is None:
+            hi += 1
+        a = out[lo - 1] if lo else 0
+        b = out[hi] if hi < n else None
+        if b is not None and b - a <= hi - lo:
+            grow = 1
+            while b is not None and (b - a) // (hi - lo + 1) < IDX_GAP // 2:
+                lo, hi, grow = max(lo - grow, 0), min(hi + grow, n), grow * 2
+                while hi < n and out[hi] is None:
+                    hi += 1
+                a = out[lo - 1] if lo else 0
+                b = out[hi] if hi < n else None
+        m = hi - lo
+        for k in range(m):
+            out[lo + k] = a + (k + 1) * IDX_GAP if b is None else a + (b - a) * (k + 1) // (m + 1)
+        i = hi
+    return out
+
+
+def persist_syllables(conn, text_id: int, instance_id: str, raw_text: str,
+                      tiles: list[tuple[str, str]] | None = None) -> int:
     """(Re)build the syllable layer for a text. Additive: only the
     ``syllables`` table for this text is touched — annotation tables are
     never read or modified here. Idempotent (re-runnable).
@@ -138,29 +276,89 @@ def persist_syllables(conn, text_id: int, instance_id: str, raw_text: str) -> in
     Token ids are reconciled against any existing rows so they stay stable across
     re-ingest: an edited syllable keeps its id, an inserted one gets a fresh id,
     a deleted one drops (see id_reconcile). First ingest keeps the freshly-minted
-    ids as the initial persistent identity."""
+    ids as the initial persistent identity. ``tiles`` is ``tile_text(raw_text)`` when
+    the caller already has it (tiled off the event loop, app/tokenize_pool.py).
+
+    Only the difference is written: deleted ids are deleted, inserted ones inserted,
+    and a kept row is updated only if its text/nature changed or it has to move. Kept
+    rows hold their ``idx`` key unless they are off the longest in-order run (moved
+    blocks) or a respaced window needs them (see ``_gap_keys``), so a bake touching a
+    few syllables of a long text writes a few rows, not the whole text."""
+    from .stream_members import refresh  # late import (no module cycle)
+    n = write_syllable_diff(conn, text_id,
+                            diff_syllables(conn, text_id, instance_id, raw_text, tiles))
+    refresh(conn, text_id)
+    return n
+
+
+def diff_syllables(conn, text_id: int, instance_id: str, raw_text: str,
+                   tiles: list[tuple[str, str]] | None = None) -> dict:
+    """The read-only half of ``persist_syllables``: tile, reconcile ids and key the new
+    layer against the stored one, without writing. Returns the row changes, the count
+    (``n``) and the stored id order it was computed from (``old_ids`` — a writer that
+    ran in between shows up as a different order; see ``routers.texts._rebake``)."""
     from .id_reconcile import assign_stable_ids
 
-    syllables = generate_syllables(raw_text, instance_id)
+    if tiles is None:
+        tiles = tile_text(raw_text)
+    syllables = syllables_from_tiles(tiles, instance_id, len(raw_text))
     existing = [
-        {"id": r["id"], "text": r["text"]}
+        {"id": r["id"], "idx": r["idx"], "text": r["text"], "nature": r["nature"]}
         for r in conn.execute(
-            "SELECT id, text FROM syllables WHERE text_id = ? ORDER BY idx",
+            "SELECT id, idx, text, nature FROM syllables WHERE text_id = ? ORDER BY idx",
             (text_id,),
         )
     ]
     assign_stable_ids(existing, syllables)
-    conn.execute("DELETE FROM syllables WHERE text_id = ?", (text_id,))
+    old = {e["id"]: e for e in existing}
+    keys = [old[s["id"]]["idx"] if s["id"] in old else None for s in syllables]
+    held = [k for k in keys if k is not None]
+    if any(a >= b for a, b in zip(held, held[1:])):
+        keys = _kept_keys(keys)
+    keys = _gap_keys(keys)
+
+    kept = {s["id"] for s in syllables}
+    moved, edited, inserted = [], [], []
+    for s, key in zip(syllables, keys):
+        e = old.get(s["id"])
+        if e is None:
+            inserted.append((s["id"], text_id, key, s["text"], s["nature"]))
+        elif e["idx"] != key:
+            moved.append((s["text"], s["nature"], key, text_id, -e["idx"]))
+        elif e["text"] != s["text"] or e["nature"] != s["nature"]:
+            edited.append((s["text"], s["nature"], text_id, key))
+    return {
+        "n": len(syllables),
+        "old_ids": [e["id"] for e in existing],
+        "deleted": [(text_id, e["idx"]) for e in existing if e["id"] not in kept],
+        "moved": moved,
+        "edited": edited,
+        "inserted": inserted,
+    }
+
+
+def write_syllable_diff(conn, text_id: int, diff: dict) -> int:
+    """Write a ``diff_syllables`` result. Returns the text's syllable count."""
+    conn.executemany("DELETE FROM syllables WHERE text_id = ? AND idx = ?", diff["deleted"])
+    # A moved row may be taking a key another moved row still holds: park them all on
+    # their (unique) negated keys first, then set the final keys.
+    conn.executemany(
+        "UPDATE syllables SET idx = -idx WHERE text_id = ? AND idx = ?",
+        [(text_id, -m[4]) for m in diff["moved"]],
+    )
     conn.executemany(
-        "INSERT INTO syllables (id, text_id, idx, start_offset, end_offset, text, nature) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
-        [
-            (s["id"], text_id, s["idx"], s["start_offset"], s["end_offset"],
-             s["text"], s["nature"])
-            for s in syllables
-        ],
+        "UPDATE syllables SET text = ?, nature = ?, idx = ? WHERE text_id = ? AND idx = ?",
+        diff["moved"],
     )
-    return len(syllables)
+    conn.executemany(
+        "UPDATE syllables SET text = ?, nature = ? WHERE text_id = ? AND idx = ?",
+        diff["edited"],
+    )
+    conn.executemany(
+        "INSERT INTO syllables (id, text_id, idx, text, nature) VALUES (?, ?, ?, ?, ?)",
+        diff["inserted"],
+    )
+    return diff["n"]
 
 
 def attach_cumulative_offsets(rows: list) -> list[dict]:
@@ -194,14 +392,27 @@ def units_from_syllables(syllables: list[dict]) -> list[list]:
 
 
 def load_syllables(conn, text_id: int) -> list[dict]:
-    """All syllables for a text, ordered by index. Offsets are derived from
-    the syllable sequence (see ``attach_cumulative_offsets``), not stored."""
+    """All syllables for a text, ordered by index, ``idx`` 1..n. Offsets are derived
+    from the syllable sequence (see ``attach_cumulative_offsets``), not stored."""
     rows = conn.execute(
         "SELECT id, idx, text, nature "
         "FROM syllables WHERE text_id = ? ORDER BY idx",
         (text_id,),
     ).fetchall()
-    return attach_cumulative_offsets(rows)
+    out = attach_cumulative_offsets(rows)
+    for i, d in enumerate(out, start=1):
+        d["idx"] = i          # the position, not the gapped key (see IDX_GAP)
+    return out
+
+
+def load_stream(conn, text_id: int):
+    """``load_syllables`` as a columnar ``TokenStream`` — no per-row dict, offsets as a
+    prefix sum on first use. What composition and anchoring read a primary through."""
+    from .token_stream import TokenStream
+    return TokenStream.from_rows(conn.execute(
+        "SELECT id, idx, text, nature FROM syllables WHERE text_id = ? ORDER BY idx",
+        (text_id,),
+    ))
 
 
 def _text_corrected(conn, text_id: int):
@@ -279,50 +490,14 @@ def corrected_root_syllables(conn, text_id: int) -> list[dict]:
     return out
 
 
-def offset_to_syllable_index(syllables: list[dict], offset: int) -> int | None:
-    """Index into ``syllables`` of the syllable containing ``offset``.
-
-    Used for export-time mapping of stored annotation offsets to syllable ids
-    without mutating any stored offset. An offset that falls between syllable
-    boundaries resolves to the syllable whose range contains it; an offset at or
-    past the end clamps to the last syllable.
-    """
-    if not syllables:
-        return None
-    # Binary search on start_offset.
-    lo, hi = 0, len(syllables) - 1
-    if offset <= syllables[0]["start_offset"]:
-        return 0
-    if offset >= syllables[-1]["start_offset"]:
-        return len(syllables) - 1
-    while lo < hi:
-        mid = (lo + hi + 1) // 2
-        if syllables[mid]["start_offset"] <= offset:
-            lo = mid
-        else:
-            hi = mid - 1
-    return lo
-
-
-def syllable_ids_in_range(syllables: list[dict], start: int, end: int) -> list[str]:
-    """uuid ids of all syllables overlapping the half-open range [start, end)."""
-    out = []
-    for s in syllables:
-        if s["start_offset"] < end and s["end_offset"] > start:
-            out.append(s["id"])
-    return out
-
-
 def syllable_ids_between(
     syllables: list[dict], start_syl_id: str, end_syl_id: str,
     pos: dict | None = None,
 ) -> list[str]:
     """uuid ids from ``start_syl_id`` to ``end_syl_id`` inclusive, in reading order.
 
-    Phase-3 offset-free analogue of ``syllable_ids_in_range`` for an on-grid range
-    whose endpoints are stored syllable-UUID anchors. For an on-grid portion
-    (start anchor's start == range start, end anchor's end == range end) the two
-    return the same ids. Returns ``[]`` if either anchor is absent or reversed.
+    Phase-3 offset-free selection of a range whose endpoints are stored syllable-UUID
+    anchors. Returns ``[]`` if either anchor is absent or reversed.
 
     ``pos`` (syl_id → index over ``syllables``) lets callers resolving MANY ranges
     over the same sequence build the index once instead of per call."""
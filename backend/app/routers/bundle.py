@@ -0,0 +1,65 @@
+"""The workspace bundle: every layer of a text in one response.
+
+Opening a text fires one request per layer (the text + units, spans, markers, notes,
+passages, tree, display breaks, suggestions), each opening its own connection, composing
+the stream and deriving the offset maps again. ``GET /api/texts/{id}/bundle`` serves any
+subset of them from ONE connection, with the compose cache and the offset maps shared
+across layers (``syllable_anchors.shared_offset_maps``). Each layer is produced by the
+same core its own endpoint uses, so the shapes cannot drift apart.
+
+The router is guarded by the "workspace" section, but the ``text`` layer is what
+``GET /api/texts/{id}`` serves behind "texts": it is only included for a caller with
+read access there (requested explicitly without it: 403; by default: left out).
+"""
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+
+from ..auth import has_section
+from ..db import get_db
+from ..schemas import TextBundleOut
+from ..syllable_anchors import shared_offset_maps
+from .display_breaks import _display_break_rows
+from .markers import _marker_rows
+from .notes import _note_rows
+from .passages import _passage_rows
+from .spans import _span_rows
+from .suggestions import _suggestion_rows
+from .texts import _text_detail
+from .tree_nodes import _tree_node_rows
+
+router = APIRouter(prefix="/api", tags=["bundle"])
+
+# layer -> core(conn, text_id, compose_cache). Dict order = serialization order.
+_LAYERS = {
+    "text": lambda conn, tid, cache: _text_detail(conn, tid),
+    "spans": lambda conn, tid, cache: _span_rows(conn, tid),
+    "markers": lambda conn, tid, cache: _marker_rows(conn, tid),
+    "notes": lambda conn, tid, cache: _note_rows(conn, tid),
+    "passages": lambda conn, tid, cache: _passage_rows(conn, tid, compose_cache=cache),
+    "tree_nodes": lambda conn, tid, cache: _tree_node_rows(conn, tid),
+    "display_breaks": lambda conn, tid, cache: _display_break_rows(conn, tid, cache=cache),
+    "suggestions": lambda conn, tid, cache: _suggestion_rows(conn, tid),
+}
+
+
+@router.get("/texts/{text_id}/bundle", response_model=TextBundleOut)
+def get_text_bundle(text_id: int, layers: Optional[str] = None):
+    """``layers`` is a comma-separated subset of the layer names (default: all)."""
+    wanted = list(_LAYERS) if not layers else [x.strip() for x in layers.split(",") if x.strip()]
+    unknown = [x for x in wanted if x not in _LAYERS]
+    if unknown:
+        raise HTTPException(400, f"Unknown layer(s): {', '.join(unknown)}")
+    if "text" in wanted and not has_section("texts"):
+        if layers:
+            raise HTTPException(403, "Requires read access to texts")
+        wanted.remove("text")
+    conn = get_db()
+    try:
+        if not conn.execute("SELECT 1 FROM texts WHERE id = ?", (text_id,)).fetchone():
+            raise HTTPException(404, "Text not found")
+        compose_cache: dict = {}
+        with shared_offset_maps():
+            return {name: _LAYERS[name](conn, text_id, compose_cache) for name in wanted}
+    finally:
+        conn.close()
@@ -2,23 +2,43 @@ from fastapi import APIRouter, HTTPException
 
 from ..db import get_db
 from ..derivation import (
-    compose_secondary, composed_raw_text, edit_range, transclude, delete_op,
+    compose_secondary, composed_raw_text, compose_delta, edit_range, transclude, delete_op,
     base_tokens, insert_break,
 )
-from ..schemas import ComposedOut, EditRangeIn, TranscludeIn, InsertBreakIn
+from ..schemas import ComposedOut, ComposedToken, EditRangeIn, TranscludeIn, InsertBreakIn
+from ..streaming import json_stream, model_row
 
 router = APIRouter(prefix="/api", tags=["derivation"])
 
+_composed_token = model_row(ComposedToken)   # streamed rows, shaped without validation
 
-def _composed_payload(conn, text_id: int) -> dict:
+
+def _composed_payload(conn, text_id: int, before: list | None = None) -> dict:
+    """The composed stream after an edit — whole, or, given the stream ``before`` it,
+    only the splice between the two (``?delta=true`` on the edit endpoints). The delta
+    saves the response and the client's reload — the workspace patches the open text and
+    its tokens with it — not the work here: the stream is recomposed and diffed in full
+    either way."""
     tokens = compose_secondary(conn, text_id)
+    if before is not None:
+        return {"delta": compose_delta(before, tokens)}
     return {"tokens": tokens, "raw_text": composed_raw_text(tokens)}
 
 
+def _stream_before(conn, text_id: int, delta: bool):
+    # The stream the client holds, captured before the edit (a stream_cache hit as a rule).
+    # Only for secondaries: anything else is refused by the edit itself.
+    if not delta:
+        return None
+    row = conn.execute("SELECT text_type FROM texts WHERE id = ?", (text_id,)).fetchone()
+    return compose_secondary(conn, text_id) if row and row["text_type"] == "secondary" else None
+
+
 @router.get("/texts/{text_id}/composed", response_model=ComposedOut)
 def get_composed(text_id: int):
     """The derived syllable sequence for a secondary text (parent links + overrides +
-    added/transcluded), each token tagged with its ``source`` provenance."""
+    added/transcluded), each token tagged with its ``source`` provenance. Streamed
+    (``app/streaming.py``): tokens are shaped as ``ComposedToken`` without validation."""
     conn = get_db()
     try:
         row = conn.execute(
@@ -28,25 +48,28 @@ def get_composed(text_id: int):
             raise HTTPException(404, "Text not found")
         if row["text_type"] != "secondary":
             raise HTTPException(400, "Not a secondary text.")
-        return _composed_payload(conn, text_id)
+        tokens = compose_secondary(conn, text_id)
     finally:
         conn.close()
+    return json_stream({"raw_text": composed_raw_text(tokens)}, "tokens", tokens,
+                       model=ComposedOut, encode=_composed_token)
 
 
 @router.post("/texts/{text_id}/edit-range", response_model=ComposedOut)
-def post_edit_range(text_id: int, payload: EditRangeIn):
+def post_edit_range(text_id: int, payload: EditRangeIn, delta: bool = False):
     """Edit a run of a secondary text as free text; reconcile into derivation ops."""
     conn = get_db()
     try:
+        before = _stream_before(conn, text_id, delta)
         edit_range(conn, text_id, payload.start_syl_id, payload.end_syl_id, payload.new_text)
         conn.commit()
-        return _composed_payload(conn, text_id)
+        return _composed_payload(conn, text_id, before)
     finally:
         conn.close()
 
 
 @router.post("/texts/{text_id}/transclude", response_model=ComposedOut)
-def post_transclude(text_id: int, payload: TranscludeIn):
+def post_transclude(text_id: int, payload: TranscludeIn, delta: bool = False):
     """Splice a range from another text into a secondary text (links, not copies).
 
     ``as_segment`` also gives the run a boundary at its head, scoped to THIS occurrence, so
@@ -54,6 +77,7 @@ def post_transclude(text_id: int, payload: TranscludeIn):
     because only this call knows the op it just created, and that op id is the scope."""
     conn = get_db()
     try:
+        before = _stream_before(conn, text_id, delta)
         made = transclude(conn, text_id, payload.anchor_syl_id, payload.src_text_id,
                           payload.src_start_syl_id, payload.src_end_syl_id,
                           anchor_op_id=payload.anchor_op_id)
@@ -64,20 +88,21 @@ def post_transclude(text_id: int, payload: TranscludeIn):
                 "INSERT OR IGNORE INTO markers (text_id, syl_id, op_id) VALUES (?, ?, ?)",
                 (text_id, made["first_syl_id"], made["op_id"]))
         conn.commit()
-        return _composed_payload(conn, text_id)
+        return _composed_payload(conn, text_id, before)
     finally:
         conn.close()
 
 
 @router.post("/texts/{text_id}/insert-break", response_model=ComposedOut)
-def post_insert_break(text_id: int, payload: InsertBreakIn):
+def post_insert_break(text_id: int, payload: InsertBreakIn, delta: bool = False):
     """Insert a manual line break (a hosted "\\n" token) before a composed token."""
     conn = get_db()
     try:
+        before = _stream_before(conn, text_id, delta)
         insert_break(conn, text_id, payload.before_syl_id,
                      anchor_op_id=payload.anchor_op_id)
         conn.commit()
-        return _composed_payload(conn, text_id)
+        return _composed_payload(conn, text_id, before)
     finally:
         conn.close()
 
@@ -135,12 +160,16 @@ def list_derivation_ops(text_id: int):
 
 
 @router.delete("/derivation-ops/{op_id}")
-def delete_derivation_op(op_id: int):
+def delete_derivation_op(op_id: int, delta: bool = False):
     conn = get_db()
     try:
+        row = conn.execute("SELECT text_id FROM derivation_ops WHERE id = ?", (op_id,)).fetchone()
+        before = _stream_before(conn, row["text_id"], delta) if row else None
         if not delete_op(conn, op_id):
             raise HTTPException(404, "Derivation op not found")
         conn.commit()
+        if before is not None:
+            return {"status": "ok", **_composed_payload(conn, row["text_id"], before)}
         return {"status": "ok"}
     finally:
         conn.close()
@@ -30,25 +30,29 @@ def list_display_breaks(text_id: int):
     inherited one (and stays editable)."""
     conn = get_db()
     try:
-        valid = {t["id"] for t in base_tokens(conn, text_id)}
-        cursor = conn.cursor()
-        by_syl: dict = {}  # syl_id -> {"count", "own"}
-        for origin in [text_id] + source_texts(cursor, text_id):
-            own = origin == text_id
-            for r in cursor.execute(
-                "SELECT syl_id, count FROM display_breaks WHERE text_id = ?", (origin,)
-            ).fetchall():
-                syl = r["syl_id"]
-                if syl not in valid:
-                    continue  # dead/foreign anchor — graceful dangling floor
-                if syl in by_syl and by_syl[syl]["own"]:
-                    continue  # the child's own break already claims this syllable
-                by_syl[syl] = {"count": r["count"], "own": own}
-        return [{"syl_id": syl, "count": v["count"]} for syl, v in by_syl.items()]
+        return _display_break_rows(conn, text_id)
     finally:
         conn.close()
 
 
+def _display_break_rows(conn, text_id: int, cache: dict | None = None) -> list[dict]:
+    valid = {t["id"] for t in base_tokens(conn, text_id, cache=cache)}
+    cursor = conn.cursor()
+    by_syl: dict = {}  # syl_id -> {"count", "own"}
+    for origin in [text_id] + source_texts(cursor, text_id):
+        own = origin == text_id
+        for r in cursor.execute(
+            "SELECT syl_id, count FROM display_breaks WHERE text_id = ?", (origin,)
+        ).fetchall():
+            syl = r["syl_id"]
+            if syl not in valid:
+                continue  # dead/foreign anchor — graceful dangling floor
+            if syl in by_syl and by_syl[syl]["own"]:
+                continue  # the child's own break already claims this syllable
+            by_syl[syl] = {"count": r["count"], "own": own}
+    return [{"syl_id": syl, "count": v["count"]} for syl, v in by_syl.items()]
+
+
 @router.put("/texts/{text_id}/display-breaks/{syl_id}", response_model=DisplayBreakOut)
 def put_display_break(text_id: int, syl_id: str, payload: DisplayBreakIn):
     """Upsert the override at one position. The anchor must be a token of the text's
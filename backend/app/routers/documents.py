@@ -13,8 +13,10 @@ from fastapi import APIRouter, HTTPException, UploadFile, File, Request
 from fastapi.responses import FileResponse, Response
 from starlette.background import BackgroundTask
 
+from .. import layer_cache
 from ..auth import active_org_id, mint_print_token
 from ..db import get_db
+from ..inherit import text_closure
 from ..origins import allowed_origins
 import gzip
 import io
@@ -579,10 +581,14 @@ def _gathered_layout_rows(conn, document_id: int) -> List[DocumentLayoutRow]:
 
 
 @router.get("/documents/{document_id}/layout", response_model=DocumentLayoutOut)
-def get_layout(document_id: int):
+def get_layout(document_id: int, request: Request = None, response: Response = None):
     conn = get_db()
     try:
         row = _require_doc(conn, document_id)
+        not_modified = layer_cache.document_not_modified(
+            conn, request, response, "layout", document_id, ("layout",))
+        if not_modified is not None:
+            return not_modified
         rows = _gathered_layout_rows(conn, document_id)
         keys = row.keys()
         return DocumentLayoutOut(
@@ -752,10 +758,14 @@ def delete_layout_row(document_id: int, payload: DocumentLayoutDeleteIn):
 # ─── Furniture content (per-language authored text for cover/title/copyright) ────
 
 @router.get("/documents/{document_id}/furniture", response_model=List[DocumentFurnitureRow])
-def list_furniture(document_id: int):
+def list_furniture(document_id: int, request: Request = None, response: Response = None):
     conn = get_db()
     try:
         _require_doc(conn, document_id)
+        not_modified = layer_cache.document_not_modified(
+            conn, request, response, "furniture", document_id, ("furniture",))
+        if not_modified is not None:
+            return not_modified
         return [DocumentFurnitureRow(item_id=r["item_id"], lang=r["lang"],
                                     block=r["block"], body=r["body"])
                 for r in conn.execute(
@@ -1308,21 +1318,7 @@ def _text_closure(conn, root_ids: list[int]) -> list[int]:
     ancestors (parent_text_id) and derivation sources (derivation_ops.src_text_id).
     Snapshotting this whole closure makes the capture faithful to what the print route
     actually renders (transcluded content lives in the source texts)."""
-    seen: set[int] = set()
-    stack = [t for t in root_ids if t is not None]
-    while stack:
-        tid = stack.pop()
-        if tid is None or tid in seen:
-            continue
-        seen.add(tid)
-        r = conn.execute("SELECT parent_text_id FROM texts WHERE id=?", (tid,)).fetchone()
-        if r and r["parent_text_id"] is not None:
-            stack.append(r["parent_text_id"])
-        for s in conn.execute(
-                "SELECT DISTINCT src_text_id FROM derivation_ops "
-                "WHERE text_id=? AND src_text_id IS NOT NULL", (tid,)):
-            stack.append(s["src_text_id"])
-    return sorted(seen)
+    return text_closure(conn, root_ids)
 
 
 def _in_clause(ids: list) -> str:
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List
 
+from .. import layer_cache
 from ..db import get_db
 from ..inherit import source_texts
 from ..schemas import MarkerOut, MarkerCreate
+from ..stream_members import current as stream_members_current, member_clause
 from ..syllable_anchors import (
     anchor_for_point, offset_for_syl_start, _syl_offset_maps, _occurrence_offsets,
 )
@@ -26,7 +28,7 @@ def _position_for(syl_id, id2start, total_len, op_id=0, per_occurrence=None):
 
 
 @router.get("/texts/{text_id}/markers", response_model=List[MarkerOut])
-def list_markers(text_id: int):
+def list_markers(text_id: int, request: Request = None, response: Response = None):
     """Segment boundaries applicable to this text: its OWN markers plus those
     INHERITED from the source chain (parent + transclusion sources), resolved onto
     this text's composed stream. A source boundary applies wherever its anchor
@@ -34,14 +36,31 @@ def list_markers(text_id: int):
     live (the child no longer carries a frozen copy). Deduped by anchor: the child's
     own boundary at a position shadows an inherited one (and stays editable)."""
     conn = get_db()
+    try:
+        not_modified = layer_cache.text_not_modified(
+            conn, request, response, "markers", text_id, ("markers",))
+        if not_modified is not None:
+            return not_modified
+        return _marker_rows(conn, text_id)
+    finally:
+        conn.close()
+
+
+def _marker_rows(conn, text_id: int) -> list[dict]:
     cursor = conn.cursor()
     id2start, id2end = _syl_offset_maps(conn, text_id)
     total_len = max(id2end.values(), default=0)
     per_occurrence = _occurrence_offsets(conn, text_id)
+    # A secondary pre-filters in SQL: rows whose anchor is absent from the stream stay
+    # in the database. The checks below still run (they also scope occurrences).
+    live = stream_members_current(conn, text_id)
+    sql = "SELECT * FROM markers WHERE text_id = ?"
+    if live:
+        sql += f" AND {member_clause('syl_id')}"
     by_key: dict = {}
     for origin in [text_id] + source_texts(cursor, text_id):
         inherited = origin != text_id
-        for r in cursor.execute("SELECT * FROM markers WHERE text_id = ?", (origin,)).fetchall():
+        for r in cursor.execute(sql, (origin, text_id) if live else (origin,)).fetchall():
             syl = r["syl_id"]
             # An INHERITED boundary is the source's own segmentation, which applies wherever
             # its syllable appears here: its op scope belongs to the source's stream, not
@@ -63,7 +82,6 @@ def list_markers(text_id: int):
                 "position": _position_for(syl, id2start, total_len, op, per_occurrence),
                 "inherited": inherited,
             }
-    conn.close()
     return sorted(by_key.values(), key=lambda d: d["position"])
 
 
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List, Tuple
 
+from .. import layer_cache
 from ..db import get_db
 from ..schemas import (
     NoteOut,
@@ -9,6 +10,7 @@ from ..schemas import (
     NoteCategoryOut,
     NoteCategoryCreate,
 )
+from ..stream_members import current as stream_members_current, member_clause
 from ..syllable_anchors import anchor_for_range, _syl_offset_maps
 
 router = APIRouter(prefix="/api", tags=["notes"])
@@ -146,19 +148,35 @@ def _hydrate_note_row(cursor, row: dict) -> dict:
 
 
 @router.get("/texts/{text_id}/notes", response_model=List[NoteOut])
-def list_notes(text_id: int):
+def list_notes(text_id: int, request: Request = None, response: Response = None):
     """This text's own notes plus those INHERITED from the source chain, resolved
     onto this text's stream (a source note applies where its anchor syllables appear
     here). Own notes shadow an inherited note on the same range."""
-    from ..inherit import source_texts
     conn = get_db()
+    try:
+        # Session links carry their tags' names.
+        not_modified = layer_cache.text_not_modified(
+            conn, request, response, "notes", text_id, ("notes", "tags"))
+        if not_modified is not None:
+            return not_modified
+        return _note_rows(conn, text_id)
+    finally:
+        conn.close()
+
+
+def _note_rows(conn, text_id: int) -> list[dict]:
+    from ..inherit import source_texts
     cursor = conn.cursor()
     id2start, id2end = _syl_offset_maps(conn, text_id)
+    live = stream_members_current(conn, text_id)
+    sql = f"{NOTE_SELECT} WHERE n.text_id = ?"
+    if live:
+        sql += f" AND {member_clause('n.start_syl_id')} AND {member_clause('n.end_syl_id')}"
     rows = []
     emitted = set()
     for origin in [text_id] + source_texts(cursor, text_id):
         inherited = origin != text_id
-        cursor.execute(f"{NOTE_SELECT} WHERE n.text_id = ?", (origin,))
+        cursor.execute(sql, (origin, text_id, text_id) if live else (origin,))
         for r in cursor.fetchall():
             d = _derive_note_offsets(dict(r), id2start, id2end)
             if d is None:  # anchors don't resolve in this stream
@@ -190,7 +208,6 @@ def list_notes(text_id: int):
         ids, names = by_note.get(row["id"], ([], []))
         row["session_tag_ids"] = ids
         row["session_tag_names"] = names
-    conn.close()
     rows.sort(key=lambda r: (r["start_offset"], r.get("created_at") or ""))
     return rows
 
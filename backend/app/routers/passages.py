@@ -3,47 +3,67 @@ from fastapi import APIRouter, HTTPException
 from typing import List
 
 from ..db import get_db
-from ..manifest import syllable_ids_between
-from ..derivation import base_tokens
+from ..derivation import base_stream
 from ..schemas import PassageCreate, PassageUpdate, PassageOut, PassageSplitIn, PassageSplitOut
+from ..stream_members import current as stream_members_current, member_clause
 
 router = APIRouter(prefix="/api", tags=["passages"])
 
-# Passages resolve over the text's TOKEN SEQUENCE (base_tokens): a primary's own
+# Passages resolve over the text's TOKEN SEQUENCE (base_stream): a primary's own
 # syllables — identical to before — or a secondary's composed sequence, so passages
 # work on derived texts whose tokens are parent-links.
 
 
+_MEMBER_COLS = "passage_id, position, src_start_syl_id, src_end_syl_id"
+
+
 def _resolve_members(conn, text_id: int, passage_id: int, cache: dict | None = None) -> list[dict]:
     """Resolve a passage's member runs into ordered syllable link dicts. Each member
     is a contiguous run of existing tokens in the same text (links, by uuid)."""
-    syls = base_tokens(conn, text_id, cache=cache)
-    by_id = {s["id"]: s for s in syls}
-    syl_pos = {s["id"]: i for i, s in enumerate(syls)}
     members = conn.execute(
-        "SELECT position, src_start_syl_id, src_end_syl_id FROM passage_members "
-        "WHERE passage_id = ? ORDER BY position",
+        f"SELECT {_MEMBER_COLS} FROM passage_members WHERE passage_id = ? ORDER BY position",
         (passage_id,),
     ).fetchall()
+    return _resolve_runs(base_stream(conn, text_id, cache=cache), members)
+
+
+def _members_by_passage(conn, origins: list[int]) -> dict:
+    """passage_id → its member rows in position order, for every passage of ``origins``
+    — one query where ``_resolve_members`` per passage would issue one each."""
+    marks = ",".join("?" * len(origins))
+    out: dict = {}
+    for m in conn.execute(
+            f"SELECT {', '.join('m.' + c for c in _MEMBER_COLS.split(', '))} "
+            "FROM passage_members m JOIN passages p ON p.id = m.passage_id "
+            f"WHERE p.text_id IN ({marks}) ORDER BY m.passage_id, m.position", origins):
+        out.setdefault(m["passage_id"], []).append(m)
+    return out
+
+
+def _resolve_runs(syls, members) -> list[dict]:
+    """Member rows resolved against the stream ``syls`` (a ``TokenStream``)."""
     out = []
     for m in members:
-        ids = syllable_ids_between(syls, m["src_start_syl_id"], m["src_end_syl_id"], pos=syl_pos)
+        span = syls.span_between(m["src_start_syl_id"], m["src_end_syl_id"])
+        run = range(span[0], span[1] + 1) if span else ()
         out.append({
             "position": m["position"],
             "src_start_syl_id": m["src_start_syl_id"],
             "src_end_syl_id": m["src_end_syl_id"],
             "syllables": [
-                {"syl_id": sid, "idx": by_id[sid]["idx"],
-                 "text": by_id[sid]["text"], "nature": by_id[sid]["nature"]}
-                for sid in ids if sid in by_id
+                {"syl_id": syls.ids[k], "idx": syls.idxs[k],
+                 "text": syls.texts[k], "nature": syls.natures[k]}
+                for k in run
             ],
         })
     return out
 
 
-def _passage_out(conn, row, stream_text_id=None, inherited=False, cache: dict | None = None) -> dict:
+def _passage_out(conn, row, stream_text_id=None, inherited=False, cache: dict | None = None,
+                 members: list[dict] | None = None) -> dict:
     # Members resolve against the STREAM text (the child for an inherited passage),
     # and the returned text_id is the stream's so the frontend attributes it here.
+    # A caller that has already resolved them passes ``members``.
     stream_text_id = stream_text_id if stream_text_id is not None else row["text_id"]
     d = dict(row)
     d["text_id"] = stream_text_id
@@ -54,14 +74,16 @@ def _passage_out(conn, row, stream_text_id=None, inherited=False, cache: dict |
         d["translations"] = json.loads(d.get("translations") or "{}")
     except (ValueError, TypeError):
         d["translations"] = {}
-    return {**d, "members": _resolve_members(conn, stream_text_id, row["id"], cache=cache)}
+    if members is None:
+        members = _resolve_members(conn, stream_text_id, row["id"], cache=cache)
+    return {**d, "members": members}
 
 
 def _validate_members(conn, text_id: int, members) -> None:
     """Each member's endpoints must be real tokens of this text and non-reversed."""
-    syls = base_tokens(conn, text_id)
+    syls = base_stream(conn, text_id)
     for m in members:
-        if not syllable_ids_between(syls, m.src_start_syl_id, m.src_end_syl_id):
+        if syls.span_between(m.src_start_syl_id, m.src_end_syl_id) is None:
             raise HTTPException(
                 400, "Passage member endpoints must be syllables of this text, in order")
 
@@ -72,13 +94,12 @@ def _validate_downstream_anchor(conn, text_id: int, anchor_syl_id, members) -> N
     anchor means "at the end of the text", which is trivially downstream."""
     if anchor_syl_id is None:
         return
-    syls = base_tokens(conn, text_id)
-    pos = {s["id"]: i for i, s in enumerate(syls)}
-    anchor_i = pos.get(anchor_syl_id)
+    syls = base_stream(conn, text_id)
+    anchor_i = syls.index_of(anchor_syl_id)
     if anchor_i is None:
         raise HTTPException(400, "Passage anchor must be a syllable of this text")
     for m in members:
-        end_i = pos.get(m.src_end_syl_id)
+        end_i = syls.index_of(m.src_end_syl_id)
         if end_i is not None and anchor_i <= end_i:
             raise HTTPException(
                 400, "Passage must be placed downstream of the selected source range")
@@ -89,41 +110,58 @@ def list_passages(text_id: int):
     """This text's own passages plus those INHERITED from the source chain, resolved
     onto this text's stream (a source passage applies where its anchor + members all
     appear here). Own passages come first so a redeclared one stays editable."""
-    from ..inherit import source_texts
     conn = get_db()
     try:
-        compose_cache: dict = {}
-        stream = {t["id"] for t in base_tokens(conn, text_id, cache=compose_cache)}
-        out = []
-        emitted = set()  # (anchor, member-ranges) already shown
-        for origin in [text_id] + source_texts(conn.cursor(), text_id):
-            inherited = origin != text_id
-            for r in conn.execute(
-                "SELECT * FROM passages WHERE text_id = ? ORDER BY position, id", (origin,)
-            ).fetchall():
-                if r["anchor_syl_id"] is not None and r["anchor_syl_id"] not in stream:
-                    continue
-                members = _resolve_members(conn, text_id, r["id"], cache=compose_cache)
-                # Every member must have at least one surviving syllable in the stream.
-                if not members or any(not m["syllables"] for m in members):
-                    continue
-                key = (r["anchor_syl_id"],
-                       tuple((m["src_start_syl_id"], m["src_end_syl_id"]) for m in members))
-                # OWN passages always render (same-anchor siblings with identical
-                # ranges are distinct); an INHERITED passage is suppressed only when
-                # an already-emitted one (own or earlier source) covers the same range.
-                if inherited and key in emitted:
-                    continue
-                emitted.add(key)
-                d = _passage_out(conn, r, stream_text_id=text_id, inherited=inherited,
-                                 cache=compose_cache)
-                d["members"] = members
-                out.append(d)
-        return out
+        return _passage_rows(conn, text_id)
     finally:
         conn.close()
 
 
+def _passage_rows(conn, text_id: int, compose_cache: dict | None = None) -> list[dict]:
+    compose_cache = {} if compose_cache is None else compose_cache
+    syls = base_stream(conn, text_id, cache=compose_cache)
+    return [_passage_out(conn, r, stream_text_id=text_id, inherited=inherited,
+                         members=_resolve_runs(syls, members))
+            for r, inherited, members in _applicable_passages(conn, text_id, compose_cache)]
+
+
+def _applicable_passages(conn, text_id: int, compose_cache: dict | None = None):
+    """``(row, inherited, member rows)`` for every passage shown on this text's stream,
+    in listing order. Members are only checked (each run must resolve), not resolved —
+    what a caller needing only WHICH passages apply (the tree gather) pays for."""
+    from ..inherit import source_texts
+    syls = base_stream(conn, text_id, cache=compose_cache)
+    stream = syls.index()
+    live = stream_members_current(conn, text_id)
+    sql = "SELECT * FROM passages WHERE text_id = ?"
+    if live:
+        sql += f" AND {member_clause('anchor_syl_id')}"
+    sql += " ORDER BY position, id"
+    emitted = set()  # (anchor, member-ranges) already shown
+    origins = [text_id] + source_texts(conn.cursor(), text_id)
+    member_rows = _members_by_passage(conn, origins)
+    for origin in origins:
+        inherited = origin != text_id
+        for r in conn.execute(sql, (origin, text_id) if live else (origin,)).fetchall():
+            if r["anchor_syl_id"] is not None and r["anchor_syl_id"] not in stream:
+                continue
+            members = member_rows.get(r["id"], [])
+            # Every member must have at least one surviving syllable in the stream.
+            if not members or any(syls.span_between(m["src_start_syl_id"],
+                                                    m["src_end_syl_id"]) is None
+                                  for m in members):
+                continue
+            key = (r["anchor_syl_id"],
+                   tuple((m["src_start_syl_id"], m["src_end_syl_id"]) for m in members))
+            # OWN passages always render (same-anchor siblings with identical
+            # ranges are distinct); an INHERITED passage is suppressed only when
+            # an already-emitted one (own or earlier source) covers the same range.
+            if inherited and key in emitted:
+                continue
+            emitted.add(key)
+            yield r, inherited, members
+
+
 @router.post("/texts/{text_id}/passages", response_model=PassageOut)
 def create_passage(text_id: int, payload: PassageCreate):
     conn = get_db()
@@ -203,14 +241,13 @@ def split_passage(passage_id: int, payload: PassageSplitIn):
         conn.close()
         raise HTTPException(404, "Passage not found")
     text_id = row["text_id"]
-    syls = base_tokens(conn, text_id)
+    syls = base_stream(conn, text_id)
     members = conn.execute(
         "SELECT position, src_start_syl_id, src_end_syl_id FROM passage_members "
         "WHERE passage_id = ? ORDER BY position",
         (passage_id,),
     ).fetchall()
-    runs = [syllable_ids_between(syls, m["src_start_syl_id"], m["src_end_syl_id"])
-            for m in members]
+    runs = [syls.ids_between(m["src_start_syl_id"], m["src_end_syl_id"]) for m in members]
     flat = [sid for run in runs for sid in run]
     if payload.after_syl_id not in flat:
         conn.close()
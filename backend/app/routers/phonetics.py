@@ -14,14 +14,16 @@ resolves there (maximum reuse); else anchor at the booklet (context text).
 import json
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel
 
+from .. import layer_cache
 from ..auth import active_org_id
 from ..db import get_db
-from ..derivation import base_tokens
-from ..manifest import syllable_ids_between
+from ..derivation import base_stream
+from ..stream_members import current as stream_members_current, range_member_clause
 from .spans import _span_source_texts
+from .translations import _is_primary
 
 router = APIRouter(prefix="/api", tags=["phonetics"])
 
@@ -70,7 +72,7 @@ def _owner_text(conn, syl_id: str):
 
 
 def _resolve_range(conn, text_id: int, start_syl_id: str, end_syl_id: str):
-    return syllable_ids_between(base_tokens(conn, text_id), start_syl_id, end_syl_id)
+    return base_stream(conn, text_id).ids_between(start_syl_id, end_syl_id)
 
 
 def _origin_for(conn, context_text_id: int, start_syl_id: str, end_syl_id: str) -> int:
@@ -86,14 +88,12 @@ def _origin_for(conn, context_text_id: int, start_syl_id: str, end_syl_id: str)
 
 
 def _phonetic_out(conn, row, origin: int) -> PhoneticOut:
-    toks = base_tokens(conn, origin)
-    by_id = {t["id"]: t for t in toks}
-    ids = syllable_ids_between(toks, row["start_syl_id"], row["end_syl_id"])
+    toks = base_stream(conn, origin)
     return PhoneticOut(
         id=row["id"], origin_text_id=origin,
         start_syl_id=row["start_syl_id"], end_syl_id=row["end_syl_id"],
         kind=row["kind"], lang=row["lang"], body=row["body"], status=row["status"],
-        text="".join(by_id[i]["text"] for i in ids if i in by_id),
+        text=toks.text_between(row["start_syl_id"], row["end_syl_id"]),
         updated_at=str(row["updated_at"]),
     )
 
@@ -101,7 +101,8 @@ def _phonetic_out(conn, row, origin: int) -> PhoneticOut:
 # ─── Endpoints ──────────────────────────────────────────────────────────────────
 
 @router.get("/texts/{text_id}/phonetics", response_model=List[PhoneticOut])
-def list_text_phonetics(text_id: int, lang: Optional[str] = None):
+def list_text_phonetics(text_id: int, lang: Optional[str] = None,
+                        request: Request = None, response: Response = None):
     """Every phonetics row applicable to this text's stream — its own plus those of
     every ancestor/transclusion source (the same graph tag inheritance walks). A row
     applies when ANY of its member syllables appears in the stream; the response
@@ -112,32 +113,40 @@ def list_text_phonetics(text_id: int, lang: Optional[str] = None):
         cursor = conn.cursor()
         if not cursor.execute("SELECT 1 FROM texts WHERE id = ?", (text_id,)).fetchone():
             raise HTTPException(404, "Text not found")
+        not_modified = layer_cache.text_not_modified(
+            conn, request, response, f"phonetics:{lang or ''}", text_id, ("phonetics",))
+        if not_modified is not None:
+            return not_modified
         compose_cache: dict = {}
-        stream_ids = {t["id"] for t in base_tokens(conn, text_id, cache=compose_cache)}
+        stream_ids = base_stream(conn, text_id, cache=compose_cache).index()
         origins = [text_id] + _span_source_texts(cursor, text_id)
+        live = stream_members_current(conn, text_id)
         out: List[PhoneticOut] = []
         for origin in origins:
+            sql, params = "SELECT * FROM phonetics WHERE origin_text_id = ?", (origin,)
             if lang is not None:
-                rows = cursor.execute(
-                    "SELECT * FROM phonetics WHERE origin_text_id = ? AND lang = ?",
-                    (origin, lang)).fetchall()
-            else:
-                rows = cursor.execute(
-                    "SELECT * FROM phonetics WHERE origin_text_id = ?", (origin,)).fetchall()
+                sql += " AND lang = ?"
+                params += (lang,)
+            # As list_text_translations: SQL drops what the check below would, while current.
+            if live and origin != text_id and _is_primary(cursor, origin):
+                sql += " AND " + range_member_clause(
+                    "phonetics.origin_text_id", "start_syl_id", "end_syl_id")
+                params += (text_id,)
+            rows = cursor.execute(sql, params).fetchall()
             if not rows:
                 continue
-            toks = base_tokens(conn, origin, cache=compose_cache)
-            by_id = {t["id"]: t for t in toks}
-            tok_pos = {t["id"]: i for i, t in enumerate(toks)}
+            toks = base_stream(conn, origin, cache=compose_cache)
+            # As list_text_translations: O(1) applicability per row by membership prefix sums.
+            hits = None if origin == text_id else toks.member_counts(stream_ids)
             for r in rows:
-                ids = syllable_ids_between(toks, r["start_syl_id"], r["end_syl_id"], pos=tok_pos)
-                if not ids or not any(i in stream_ids for i in ids):
+                span = toks.span_between(r["start_syl_id"], r["end_syl_id"])
+                if span is None or (hits is not None and hits[span[1] + 1] == hits[span[0]]):
                     continue
                 out.append(PhoneticOut(
                     id=r["id"], origin_text_id=origin,
                     start_syl_id=r["start_syl_id"], end_syl_id=r["end_syl_id"],
                     kind=r["kind"], lang=r["lang"], body=r["body"], status=r["status"],
-                    text="".join(by_id[i]["text"] for i in ids),
+                    text=toks.text_of(*span),
                     updated_at=str(r["updated_at"]),
                 ))
         return out
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List
 
+from .. import layer_cache
 from ..db import get_db
 from ..schemas import SpanOut, SpanCreate, SpanUpdate
+from ..stream_members import current as stream_members_current, member_clause
 from ..syllable_anchors import anchor_for_range, offsets_for_syls, _syl_offset_maps
 
 router = APIRouter(prefix="/api", tags=["spans"])
@@ -43,8 +45,19 @@ from ..inherit import source_texts as _span_source_texts  # noqa: E402,F401
 
 
 @router.get("/texts/{text_id}/spans", response_model=List[SpanOut])
-def list_spans(text_id: int):
+def list_spans(text_id: int, request: Request = None, response: Response = None):
     conn = get_db()
+    try:
+        not_modified = layer_cache.text_not_modified(
+            conn, request, response, "spans", text_id, ("spans", "tags"))
+        if not_modified is not None:
+            return not_modified
+        return _span_rows(conn, text_id)
+    finally:
+        conn.close()
+
+
+def _span_rows(conn, text_id: int) -> list[dict]:
     cursor = conn.cursor()
 
     # Offset "spaces": a primary has one (its own syllables). A secondary has the HOST
@@ -98,22 +111,22 @@ def list_spans(text_id: int):
     if is_secondary:
         src_ids = _span_source_texts(cursor, text_id)
         seen = {(s["tag_id"], s["start_syl_id"], s["end_syl_id"]) for s in results}
+        # An ancestor's spans mostly lie outside the run this text shows of it: skip those
+        # in SQL (emit() still drops any that resolve in no offset space).
+        live = stream_members_current(conn, text_id)
+        sql = ("SELECT s.*, t.name as tag_name, t.color as tag_color, t.tag_kind as tag_kind "
+               "FROM spans s JOIN tags t ON s.tag_id = t.id WHERE s.text_id = ?")
+        if live:
+            sql += (f" AND {member_clause('s.start_syl_id')}"
+                    f" AND {member_clause('s.end_syl_id')}")
         for src in src_ids:
-            cursor.execute(
-                """
-                SELECT s.*, t.name as tag_name, t.color as tag_color, t.tag_kind as tag_kind
-                FROM spans s JOIN tags t ON s.tag_id = t.id
-                WHERE s.text_id = ?
-                """,
-                (src,),
-            )
+            cursor.execute(sql, (src, text_id, text_id) if live else (src,))
             for r in cursor.fetchall():
                 d = dict(r)
                 if (d["tag_id"], d["start_syl_id"], d["end_syl_id"]) in seen:
                     continue  # host already carries an identical span
                 results.extend(emit(d, True))
 
-    conn.close()
     # Order by derived start offset (was ORDER BY s.start_offset).
     results.sort(key=lambda s: s["start_offset"])
     return results
@@ -96,15 +96,19 @@ def _serialize_suggestion(d: dict, id2start: dict, id2end: dict) -> dict:
 @router.get("/texts/{text_id}/suggestions", response_model=List[SuggestionOut])
 def list_suggestions(text_id: int):
     conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute(
+    try:
+        return _suggestion_rows(conn, text_id)
+    finally:
+        conn.close()
+
+
+def _suggestion_rows(conn, text_id: int) -> list[dict]:
+    rows = [dict(r) for r in conn.execute(
         "SELECT s.*, o.title AS origin_title FROM suggestions s "
         "LEFT JOIN texts o ON o.id = s.origin_text_id WHERE s.text_id = ?",
         (text_id,),
-    )
-    rows = [dict(r) for r in cursor.fetchall()]
+    ).fetchall()]
     id2start, id2end = _syl_offset_maps(conn, text_id)
-    conn.close()
     rows = [_serialize_suggestion(r, id2start, id2end) for r in rows]
     rows.sort(key=lambda r: (r["start_offset"], r.get("created_at") or ""))
     return rows
@@ -1,18 +1,28 @@
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Depends, Body
+from starlette.concurrency import run_in_threadpool
 from typing import List, Any, Dict
+import io
+import json
 import os
-import sqlite3
+import queue as _queue
+import threading
+import time
+import zipfile
 from typing import Optional
 
 from ..auth import active_org_id
 from ..db import get_db
-from ..schemas import TextOut, TextDetailOut, ExtractIn, CloneIn, TextMetaUpdate
+from ..schemas import (
+    TextOut, TextDetailOut, ExtractIn, CloneIn, TextMetaUpdate, BulkIngestOut, BakeJobOut,
+)
+from .. import stream_members, tokenize_pool
+from ..ingest import ingest_texts
+from ..streaming import json_stream
 from .text_groups import normalize_group_path
 from ..tokenizer import prepare_and_tokenize
 from ..manifest import (
-    persist_syllables, default_instance_id, corrected_root_units, load_syllables,
-    syllable_ids_between, _text_corrected, units_from_syllables,
-    offset_to_syllable_index,
+    persist_syllables, fallback_instance_id, corrected_root_units, load_syllables,
+    syllable_ids_between, _text_corrected, units_from_syllables, load_stream,
 )
 
 router = APIRouter(prefix="/api/texts", tags=["texts"])
@@ -23,11 +33,27 @@ def _units_for(conn, text_id: int):
     projection, not a stored ``units_json`` column). Primaries project their syllable
     partition; secondaries project their COMPOSED sequence (parent refs + ops), which
     carries the same cumulative offsets. A frontend render/selection aid."""
+    return list(_units_iter(conn, text_id))
+
+
+def _units_iter(conn, text_id: int):
+    """``_units_for`` as a lazy projection, for the streamed responses. The rows are read
+    before returning (the caller may close ``conn``); only the unit lists are built late."""
     row = conn.execute("SELECT text_type FROM texts WHERE id = ?", (text_id,)).fetchone()
     if row and row["text_type"] == "secondary":
         from ..derivation import compose_secondary
-        return units_from_syllables(compose_secondary(conn, text_id))
-    return units_from_syllables(load_syllables(conn, text_id))
+        toks = compose_secondary(conn, text_id)
+        return ([t["start_offset"], t["end_offset"], t["text"]] for t in toks)
+    texts = [r[0] for r in conn.execute(
+        "SELECT text FROM syllables WHERE text_id = ? ORDER BY idx", (text_id,))]
+
+    def units():
+        pos = 0
+        for text in texts:
+            end = pos + len(text)
+            yield [pos, end, text]
+            pos = end
+    return units()
 
 
 def _apply_instance_metadata(
@@ -39,18 +65,15 @@ def _apply_instance_metadata(
     title_bo: Optional[str] = None,
     access_level: Optional[int] = None,
     fallback_title: str = "",
+    tiles: Optional[list] = None,
 ) -> str:
     """Store catalog metadata on the text and (re)build its syllable layer.
 
     Additive: only the text's own catalog columns and the syllables table
     are written; annotation tables are untouched. Returns the instance_id used.
+    ``tiles``: ``raw_text`` already tiled (see ``persist_syllables``).
     """
-    # The fallback slug is suffixed with the text id: syllable uuids are minted from
-    # (instance_id, idx, text), so instance ids MUST be unique per text or two texts
-    # sharing (idx, syllable) mint the SAME uuid — Tibetan titles all slug to
-    # "instance", which broke global uuid uniqueness (the title-bleed bug).
-    instance_id = (instance_id or "").strip() \
-        or f"{default_instance_id(fallback_title)}_t{doc_id}"
+    instance_id = (instance_id or "").strip() or fallback_instance_id(fallback_title, doc_id)
     conn.execute(
         "UPDATE texts SET instance_id = ?, teaching_id = COALESCE(?, teaching_id), "
         "title_bo = COALESCE(?, title_bo), access_level = COALESCE(?, access_level) "
@@ -60,7 +83,7 @@ def _apply_instance_metadata(
     # Part 6, Phase 3: the syllables table is the sole tokenisation. Units are derived
     # from it on read (_units_for); annotations are anchored by syllable UUID, so there
     # are no cached offsets to heal when the syllable layer is (re)built.
-    persist_syllables(conn, doc_id, instance_id, raw_text)
+    persist_syllables(conn, doc_id, instance_id, raw_text, tiles)
     return instance_id
 
 
@@ -141,118 +164,208 @@ def _snap_refs_after_bake(conn, text_id: int, old_ordered_ids: list[str]) -> Non
     the next survivor — a wandered boundary silently mis-splits descendants); reading
     positions snap forward, else backward; tree segment links snap forward or stay
     dangling. Snapped ranges that reverse in the NEW order are left dangling."""
-    new_ordered = [s["id"] for s in load_syllables(conn, text_id)]
-    new_ids = set(new_ordered)
-    new_pos = {sid: i for i, sid in enumerate(new_ordered)}
-    deleted = [sid for sid in old_ordered_ids if sid not in new_ids]
-    if not deleted:
-        return
-    # For each old position: the nearest surviving id at-or-after / at-or-before it.
-    n = len(old_ordered_ids)
-    nxt: list = [None] * n
-    prv: list = [None] * n
+    new_ids = {r["id"] for r in conn.execute(
+        "SELECT id FROM syllables WHERE text_id = ?", (text_id,))}
+    # For each deleted id: the nearest surviving id after / before it in the OLD order.
+    snap: dict = {}
     run = None
-    for i in range(n - 1, -1, -1):
-        if old_ordered_ids[i] in new_ids:
-            run = old_ordered_ids[i]
-        nxt[i] = run
+    for sid in reversed(old_ordered_ids):
+        if sid in new_ids:
+            run = sid
+        else:
+            snap[sid] = [run, None]
+    if not snap:
+        return
     run = None
-    for i in range(n):
-        if old_ordered_ids[i] in new_ids:
-            run = old_ordered_ids[i]
-        prv[i] = run
-    pos = {sid: i for i, sid in enumerate(old_ordered_ids)}
-    dead = set(deleted)
-
-    def snap_fwd(sid):  # None = nothing survives at-or-after sid
-        return nxt[pos[sid]]
-
-    def snap_back(sid):
-        return prv[pos[sid]]
-
-    def q(ids):
-        return ",".join("?" * len(ids))
-
-    # Ranges: (table, start_col, end_col, extra WHERE). Includes the translation
-    # layer (T1–T3) so translations/phonetics/moves anchored on deleted syllables
-    # snap with everything else rather than silently orphaning.
-    for table, s_col, e_col, extra in (
-        ("derivation_ops", "src_start_syl_id", "src_end_syl_id", "op_kind = 'transclude'"),
-        ("passage_members", "src_start_syl_id", "src_end_syl_id", "1=1"),
-        ("spans", "start_syl_id", "end_syl_id", "1=1"),
-        ("notes", "start_syl_id", "end_syl_id", "1=1"),
-        ("suggestions", "start_syl_id", "end_syl_id", "1=1"),
-        ("translation_chunks", "start_syl_id", "end_syl_id", "1=1"),
-        ("phonetics", "start_syl_id", "end_syl_id", "1=1"),
-        ("chunk_layouts", "src_start_syl_id", "src_end_syl_id", "kind = 'move'"),
-    ):
-        rows = conn.execute(
-            f"SELECT rowid AS rid, {s_col} AS s, {e_col} AS e FROM {table} "
-            f"WHERE {extra} AND ({s_col} IN ({q(deleted)}) OR {e_col} IN ({q(deleted)}))",
-            (*deleted, *deleted),
-        ).fetchall()
-        for r in rows:
-            new_s = snap_fwd(r["s"]) if r["s"] in dead else r["s"]
-            new_e = snap_back(r["e"]) if r["e"] in dead else r["e"]
-            # Leave untouched when nothing survives inside the range (start/end
-            # crossed or vanished) — the row stays dangling and is skipped on read.
-            if new_s is None or new_e is None:
-                continue
-            # Reversed in the NEW order (a snapped pair can invert even when the
-            # old order was consistent) — leave dangling, skipped on read.
-            if new_s in new_pos and new_e in new_pos and new_pos[new_s] > new_pos[new_e]:
-                continue
-            try:
+    for sid in old_ordered_ids:
+        if sid in new_ids:
+            run = sid
+        else:
+            snap[sid][1] = run
+
+    # One temp table holds the snap map, so every re-anchoring below is a single
+    # set-based statement (no per-row UPDATEs, no IN-list bound by the variable limit).
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS bake_snap "
+                 "(old_id TEXT PRIMARY KEY, fwd_id TEXT, back_id TEXT) WITHOUT ROWID")
+    conn.execute("DELETE FROM temp.bake_snap")
+    conn.executemany("INSERT INTO temp.bake_snap VALUES (?, ?, ?)",
+                     [(sid, f, b) for sid, (f, b) in snap.items()])
+    try:
+        # Ranges: (table, start_col, end_col, extra WHERE, the other columns of the
+        # table's UNIQUE over the range). Includes the translation layer (T1–T3) so
+        # translations/phonetics/moves anchored on deleted syllables snap with
+        # everything else rather than silently orphaning.
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS bake_moves "
+                     "(rid INTEGER PRIMARY KEY, s TEXT NOT NULL, e TEXT NOT NULL)")
+        for table, s_col, e_col, extra, unique in (
+            ("derivation_ops", "src_start_syl_id", "src_end_syl_id", "op_kind = 'transclude'", ()),
+            ("passage_members", "src_start_syl_id", "src_end_syl_id", "1=1", ()),
+            ("spans", "start_syl_id", "end_syl_id", "1=1", ()),
+            ("notes", "start_syl_id", "end_syl_id", "1=1", ()),
+            ("suggestions", "start_syl_id", "end_syl_id", "1=1", ()),
+            ("translation_chunks", "start_syl_id", "end_syl_id", "1=1", ("origin_text_id",)),
+            ("phonetics", "start_syl_id", "end_syl_id", "1=1", ("origin_text_id", "kind", "lang")),
+            ("chunk_layouts", "src_start_syl_id", "src_end_syl_id", "kind = 'move'", ()),
+        ):
+            # The snapped range of every row that has one. Rows left out stay dangling,
+            # skipped on read: nothing survives inside the range (a snapped end is NULL),
+            # or the snapped pair is reversed in the NEW order (it can invert even when
+            # the old order was consistent). The new order is read off ``syllables.idx``
+            # by uuid (without INDEXED BY the planner walks the text's whole key range).
+            conn.execute("DELETE FROM temp.bake_moves")
+            conn.execute(
+                f"INSERT INTO temp.bake_moves (rid, s, e) "
+                f"SELECT u.rid, u.s, u.e "
+                f"FROM (SELECT t.rowid AS rid, "
+                f"      IIF(ms.old_id IS NULL, t.{s_col}, ms.fwd_id) AS s, "
+                f"      IIF(me.old_id IS NULL, t.{e_col}, me.back_id) AS e "
+                f"      FROM {table} AS t "
+                f"      LEFT JOIN temp.bake_snap AS ms ON ms.old_id = t.{s_col} "
+                f"      LEFT JOIN temp.bake_snap AS me ON me.old_id = t.{e_col} "
+                f"      WHERE {extra} AND (ms.old_id IS NOT NULL OR me.old_id IS NOT NULL)) AS u "
+                f"LEFT JOIN syllables AS ps INDEXED BY idx_syllables_sylid "
+                f"  ON ps.id = u.s AND ps.text_id = ? "
+                f"LEFT JOIN syllables AS pe INDEXED BY idx_syllables_sylid "
+                f"  ON pe.id = u.e AND pe.text_id = ? "
+                f"WHERE u.s IS NOT NULL AND u.e IS NOT NULL "
+                f"  AND NOT (ps.idx IS NOT NULL AND pe.idx IS NOT NULL AND ps.idx > pe.idx)",
+                (text_id, text_id),
+            )
+            if unique:
+                # A UNIQUE collision (translation_chunks/phonetics share (origin, start,
+                # end[, kind, lang])) leaves rows dangling rather than merging two
+                # distinct anchors into one, decided here, not by the order the UPDATE
+                # happens to visit rows in: a key some row holds now stays with it, and
+                # of the rows snapping onto one free key the oldest (MIN(rowid)) takes it.
+                same = " AND ".join(f"x.{c} = t.{c}" for c in unique)
                 conn.execute(
-                    f"UPDATE {table} SET {s_col} = ?, {e_col} = ? WHERE rowid = ?",
-                    (new_s, new_e, r["rid"]),
-                )
-            except sqlite3.IntegrityError:
-                # UNIQUE collision (translation_chunks/phonetics share
-                # (origin, start, end[, kind])) — leave the row dangling rather
-                # than merge two distinct anchors into one.
-                pass
+                    f"DELETE FROM temp.bake_moves WHERE rid NOT IN ("
+                    f"  SELECT MIN(m.rid) FROM temp.bake_moves AS m "
+                    f"  JOIN {table} AS t ON t.rowid = m.rid "
+                    f"  GROUP BY {', '.join(f't.{c}' for c in unique)}, m.s, m.e)")
+                conn.execute(
+                    f"DELETE FROM temp.bake_moves WHERE EXISTS ("
+                    f"  SELECT 1 FROM {table} AS t, {table} AS x "
+                    f"  WHERE t.rowid = bake_moves.rid AND x.{s_col} = bake_moves.s "
+                    f"    AND x.{e_col} = bake_moves.e AND {same} AND x.rowid != t.rowid)")
+            conn.execute(
+                f"UPDATE {table} SET {s_col} = m.s, {e_col} = m.e FROM temp.bake_moves AS m "
+                f"WHERE {table}.rowid = m.rid")
 
-    # "Before this syllable" anchors: forward, else NULL (= end of text).
-    for table, col in (("derivation_ops", "anchor_syl_id"), ("passages", "anchor_syl_id"),
-                       ("chunk_layouts", "anchor_syl_id")):
-        rows = conn.execute(
-            f"SELECT rowid AS rid, {col} AS a FROM {table} WHERE {col} IN ({q(deleted)})",
-            deleted,
-        ).fetchall()
-        for r in rows:
-            conn.execute(f"UPDATE {table} SET {col} = ? WHERE rowid = ?",
-                         (snap_fwd(r["a"]), r["rid"]))
-
-    # Markers: a segment boundary whose anchor syllable was deleted is DELETED, not
-    # snapped forward — the segmentation there was rewritten, so a boundary wandering
-    # to the next survivor would silently mis-split this text and its descendants
-    # (the copied-marker-on-a-child bug). Same for display breaks: a break has no
-    # home once its syllable is gone.
-    conn.execute(f"DELETE FROM markers WHERE syl_id IN ({q(deleted)})", deleted)
-    conn.execute(f"DELETE FROM display_breaks WHERE syl_id IN ({q(deleted)})", deleted)
-
-    # Reading positions: forward, else backward.
-    for r in conn.execute(
-            f"SELECT rowid AS rid, syl_id AS a FROM reading_positions "
-            f"WHERE syl_id IN ({q(deleted)})", deleted).fetchall():
-        tgt = snap_fwd(r["a"]) or snap_back(r["a"])
-        if tgt is not None:
-            conn.execute("UPDATE reading_positions SET syl_id = ? WHERE rowid = ?",
-                         (tgt, r["rid"]))
-
-    # Tree segment links: forward; if nothing follows, leave dangling (existing
-    # tree behavior for unresolvable links).
-    for r in conn.execute(
-            f"SELECT rowid AS rid, segment_start_syl_id AS a FROM tree_nodes "
-            f"WHERE segment_start_syl_id IN ({q(deleted)})", deleted).fetchall():
-        tgt = snap_fwd(r["a"])
-        if tgt is not None:
-            conn.execute("UPDATE tree_nodes SET segment_start_syl_id = ? WHERE rowid = ?",
-                         (tgt, r["rid"]))
-
-
-def _apply_corrections_core(conn, text_id: int) -> bool:
+        # "Before this syllable" anchors: forward, else NULL (= end of text).
+        for table, col in (("derivation_ops", "anchor_syl_id"), ("passages", "anchor_syl_id"),
+                           ("chunk_layouts", "anchor_syl_id")):
+            conn.execute(
+                f"UPDATE {table} SET {col} = m.fwd_id FROM temp.bake_snap AS m "
+                f"WHERE {table}.{col} = m.old_id")
+
+        # Markers: a segment boundary whose anchor syllable was deleted is DELETED, not
+        # snapped forward — the segmentation there was rewritten, so a boundary wandering
+        # to the next survivor would silently mis-split this text and its descendants
+        # (the copied-marker-on-a-child bug). Same for display breaks: a break has no
+        # home once its syllable is gone.
+        conn.execute("DELETE FROM markers WHERE syl_id IN (SELECT old_id FROM temp.bake_snap)")
+        conn.execute(
+            "DELETE FROM display_breaks WHERE syl_id IN (SELECT old_id FROM temp.bake_snap)")
+
+        # Reading positions: forward, else backward.
+        conn.execute(
+            "UPDATE reading_positions SET syl_id = COALESCE(m.fwd_id, m.back_id) "
+            "FROM temp.bake_snap AS m WHERE reading_positions.syl_id = m.old_id "
+            "AND COALESCE(m.fwd_id, m.back_id) IS NOT NULL")
+
+        # Tree segment links: forward; if nothing follows, leave dangling (existing
+        # tree behavior for unresolvable links).
+        conn.execute(
+            "UPDATE tree_nodes SET segment_start_syl_id = m.fwd_id FROM temp.bake_snap AS m "
+            "WHERE tree_nodes.segment_start_syl_id = m.old_id AND m.fwd_id IS NOT NULL")
+    finally:
+        conn.execute("DROP TABLE temp.bake_snap")
+        conn.execute("DROP TABLE IF EXISTS temp.bake_moves")
+
+
+_BAKE_ATTEMPTS = 3
+
+
+def _applied_suggestions(conn, text_id: int) -> list[tuple]:
+    return [tuple(r) for r in conn.execute(
+        "SELECT id, start_syl_id, end_syl_id, suggested_text FROM suggestions "
+        "WHERE text_id = ? AND status = 'applied' ORDER BY id", (text_id,))]
+
+
+def _rebake(conn, text_id: int, consumed, splice, timings: dict | None = None) -> bool:
+    """Re-persist ``text_id``'s base as ``splice(conn)`` → ``(corrected_text, instance)``,
+    delete the suggestions it baked (``consumed(conn)`` → their rows, read before the
+    splice) and snap references to what it deleted. Returns False when there is nothing
+    to bake.
+
+    The splice, tokenization and id alignment only READ (``manifest.diff_syllables``),
+    so when the caller holds no transaction they run before the write lock is taken;
+    the lock covers just the row writes and the snap. Under the lock the stored syllables
+    and the consumed suggestions are re-read: if another writer changed either
+    since the bake first read them, it starts over (at most ``_BAKE_ATTEMPTS`` times,
+    then 409).
+    Per-phase wall time (ms) accumulates into ``timings`` when given."""
+    from ..manifest import diff_syllables, tile_text, write_syllable_diff
+
+    timings = {} if timings is None else timings
+    held = conn.in_transaction      # the caller already writes: nothing can interleave
+    t = [time.perf_counter()]
+
+    def lap(phase):
+        now = time.perf_counter()
+        timings[phase] = round(timings.get(phase, 0.0) + (now - t[0]) * 1000, 1)
+        t[0] = now
+
+    def stored():
+        return [tuple(r) for r in conn.execute(
+            "SELECT id, text FROM syllables WHERE text_id = ? ORDER BY idx", (text_id,))]
+
+    for _attempt in range(1 if held else _BAKE_ATTEMPTS):
+        rows = consumed(conn)
+        if not rows:
+            return False
+        before = stored()
+        got = splice(conn)
+        if got is None:
+            return False
+        corrected_text, instance = got
+        lap("splice")
+        # Same normalization as upload/clone so the base layer stays canonical.
+        raw_text, _units = prepare_and_tokenize(corrected_text)
+        tiles = tile_text(raw_text)
+        lap("tokenize")
+        diff = diff_syllables(conn, text_id, instance, raw_text, tiles)
+        lap("align")
+        if not held:
+            conn.execute("BEGIN IMMEDIATE")
+            if (stored() != before or [sid for sid, _t in before] != diff["old_ids"]
+                    or consumed(conn) != rows):
+                conn.rollback()
+                lap("retry")
+                continue
+        conn.execute(
+            "UPDATE texts SET raw_text = ?, instance_id = ? WHERE id = ?",
+            (raw_text, instance, text_id),
+        )
+        write_syllable_diff(conn, text_id, diff)
+        conn.executemany("DELETE FROM suggestions WHERE id = ?", [(r[0],) for r in rows])
+        lap("write")
+        _snap_refs_after_bake(conn, text_id, diff["old_ids"])
+        lap("snap")
+        stream_members.refresh(conn, text_id)
+        lap("members")
+        return True
+    raise HTTPException(409, "The text changed while it was being baked; try again.")
+
+
+def _bake_instance(conn, text_id: int, instance_id) -> str:
+    row = conn.execute("SELECT title, filename FROM texts WHERE id = ?", (text_id,)).fetchone()
+    return (instance_id or "").strip() \
+        or fallback_instance_id(row['title'] or row['filename'] or '', text_id)
+
+
+def _apply_corrections_core(conn, text_id: int, timings: dict | None = None) -> bool:
     """Bake the text's staged suggestions into its base layer — the ripple mechanism.
 
     ``raw_text`` becomes the corrected text and the syllable layer is re-persisted with
@@ -268,31 +381,15 @@ def _apply_corrections_core(conn, text_id: int) -> bool:
     The consumed suggestions are deleted (they are now part of the base). Only APPLIED
     suggestions bake — 'pending' rows (incoming from derived texts, awaiting review)
     survive untouched, their uuid anchors intact. Returns True if anything was baked,
-    False for a no-op (no applied suggestions)."""
-    n = conn.execute(
-        "SELECT COUNT(*) FROM suggestions WHERE text_id = ? AND status = 'applied'",
-        (text_id,),
-    ).fetchone()[0]
-    if n == 0:
-        return False
-    got = _text_corrected(conn, text_id)
-    if got is None:
-        return False
-    instance_id, corrected_text, _segments = got
-    old_ordered_ids = [s["id"] for s in load_syllables(conn, text_id)]
-    # Same normalization as upload/clone so the base layer stays canonical.
-    raw_text, _units = prepare_and_tokenize(corrected_text)
-    row = conn.execute("SELECT title, filename FROM texts WHERE id = ?", (text_id,)).fetchone()
-    instance = (instance_id or "").strip() \
-        or f"{default_instance_id(row['title'] or row['filename'] or '')}_t{text_id}"
-    conn.execute(
-        "UPDATE texts SET raw_text = ?, instance_id = ? WHERE id = ?",
-        (raw_text, instance, text_id),
-    )
-    persist_syllables(conn, text_id, instance, raw_text)
-    conn.execute("DELETE FROM suggestions WHERE text_id = ? AND status = 'applied'", (text_id,))
-    _snap_refs_after_bake(conn, text_id, old_ordered_ids)
-    return True
+    False for a no-op (no applied suggestions). See ``_rebake`` for the locking."""
+    def splice(conn):
+        got = _text_corrected(conn, text_id)
+        if got is None:
+            return None
+        instance_id, corrected_text, _segments = got
+        return corrected_text, _bake_instance(conn, text_id, instance_id)
+
+    return _rebake(conn, text_id, lambda c: _applied_suggestions(c, text_id), splice, timings)
 
 
 def _apply_one_suggestion_core(conn, suggestion_id: int) -> bool:
@@ -311,23 +408,21 @@ def _apply_one_suggestion_core(conn, suggestion_id: int) -> bool:
     if row is None:
         return False
     text_id = row["text_id"]
-    txt = conn.execute(
-        "SELECT title, filename, instance_id FROM texts WHERE id = ?", (text_id,)
-    ).fetchone()
-    raw_syllables = load_syllables(conn, text_id)
-    old_ordered_ids = [s["id"] for s in raw_syllables]
-    segments = splice_suggestions(raw_syllables, [dict(row)])
-    raw_text, _units = prepare_and_tokenize(segments_text(segments))
-    instance = (txt["instance_id"] or "").strip() \
-        or f"{default_instance_id(txt['title'] or txt['filename'] or '')}_t{text_id}"
-    conn.execute(
-        "UPDATE texts SET raw_text = ?, instance_id = ? WHERE id = ?",
-        (raw_text, instance, text_id),
-    )
-    persist_syllables(conn, text_id, instance, raw_text)
-    conn.execute("DELETE FROM suggestions WHERE id = ?", (suggestion_id,))
-    _snap_refs_after_bake(conn, text_id, old_ordered_ids)
-    return True
+
+    def consumed(conn):
+        return [tuple(r) for r in conn.execute(
+            "SELECT id, start_syl_id, end_syl_id, suggested_text FROM suggestions "
+            "WHERE id = ?", (suggestion_id,))]
+
+    def splice(conn):
+        sug = conn.execute("SELECT * FROM suggestions WHERE id = ?", (suggestion_id,)).fetchone()
+        if sug is None:
+            return None
+        txt = conn.execute("SELECT instance_id FROM texts WHERE id = ?", (text_id,)).fetchone()
+        segments = splice_suggestions(load_syllables(conn, text_id), [dict(sug)])
+        return segments_text(segments), _bake_instance(conn, text_id, txt["instance_id"])
+
+    return _rebake(conn, text_id, consumed, splice)
 
 
 @router.post("/{id}/apply-corrections", response_model=TextDetailOut)
@@ -356,6 +451,136 @@ def apply_corrections(id: int):
     return {**row, "units": units, "span_count": span_count, "tag_count": tag_count}
 
 
+# ═══ Bake jobs: apply-corrections off the request thread ═════════════════════════════
+#
+# A bake of a long text (splice, retokenize, align, rewrite, snap the whole corpus's
+# references) can run for seconds. Queued as a job, it runs on a single module-level
+# daemon thread fed by a queue — like the booklet version render (documents.py), NOT
+# FastAPI BackgroundTasks, which would pin a request-threadpool slot. One worker also
+# serializes bakes, which SQLite's single writer would anyway. ``_rebake`` keeps the
+# write lock to the row writes and the snap, so other users' saves don't stall behind
+# the tokenizing and alignment. ASSUMES a single uvicorn worker (in-process queue);
+# jobs a restart interrupts are marked failed in init_db.
+
+_bake_q: "_queue.Queue[int]" = _queue.Queue()
+_bake_worker_started = False
+_bake_worker_lock = threading.Lock()
+
+
+def _start_bake_worker():
+    global _bake_worker_started
+    with _bake_worker_lock:
+        if _bake_worker_started:
+            return
+        threading.Thread(target=_bake_worker_loop, name="bake", daemon=True).start()
+        _bake_worker_started = True
+
+
+def _bake_worker_loop():
+    while True:
+        job_id = _bake_q.get()
+        try:
+            _run_bake_job(job_id)
+        except Exception as e:  # never let the worker thread die
+            conn = get_db()
+            try:
+                conn.execute(
+                    "UPDATE bake_jobs SET status = 'failed', error = ?, "
+                    "finished_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    (str(getattr(e, "detail", e))[:500], job_id))
+                conn.commit()
+            except Exception:
+                pass
+            finally:
+                conn.close()
+        finally:
+            _bake_q.task_done()
+
+
+def _run_bake_job(job_id: int):
+    conn = get_db()
+    try:
+        job = conn.execute("SELECT text_id FROM bake_jobs WHERE id = ?", (job_id,)).fetchone()
+        if not job:
+            return
+        conn.execute("UPDATE bake_jobs SET status = 'running', started_at = CURRENT_TIMESTAMP "
+                     "WHERE id = ?", (job_id,))
+        conn.commit()
+        timings: dict = {}
+        try:
+            baked = _apply_corrections_core(conn, job["text_id"], timings)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            conn.execute("UPDATE bake_jobs SET timings = ? WHERE id = ?",
+                         (json.dumps(timings), job_id))
+            conn.commit()
+            raise
+        conn.execute(
+            "UPDATE bake_jobs SET status = 'done', baked = ?, timings = ?, "
+            "finished_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (int(baked), json.dumps(timings), job_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _bake_job_out(row) -> BakeJobOut:
+    return BakeJobOut(
+        id=row["id"], text_id=row["text_id"], status=row["status"], baked=bool(row["baked"]),
+        error=row["error"], timings=json.loads(row["timings"] or "{}"),
+        created_at=row["created_at"], started_at=row["started_at"],
+        finished_at=row["finished_at"])
+
+
+@router.post("/{id}/apply-corrections/jobs", response_model=BakeJobOut, status_code=202)
+def queue_apply_corrections(id: int):
+    """``apply-corrections`` as a queued job: returns at once with the job, which the
+    client polls (``GET /{id}/bake-jobs/{job_id}``) until ``done`` or ``failed``."""
+    conn = get_db()
+    try:
+        src = conn.execute("SELECT text_type FROM texts WHERE id = ?", (id,)).fetchone()
+        if not src:
+            raise HTTPException(404, "Text not found")
+        if src["text_type"] != "primary":
+            raise HTTPException(
+                400, "Only a primary text's corrections can be applied to its base.")
+        job_id = conn.execute("INSERT INTO bake_jobs (text_id) VALUES (?)", (id,)).lastrowid
+        conn.commit()
+        row = conn.execute("SELECT * FROM bake_jobs WHERE id = ?", (job_id,)).fetchone()
+    finally:
+        conn.close()
+    _start_bake_worker()
+    _bake_q.put(job_id)
+    return _bake_job_out(row)
+
+
+@router.get("/{id}/bake-jobs", response_model=List[BakeJobOut])
+def list_bake_jobs(id: int, limit: int = 20):
+    """The text's most recent bake jobs, newest first."""
+    conn = get_db()
+    try:
+        rows = conn.execute(
+            "SELECT * FROM bake_jobs WHERE text_id = ? ORDER BY id DESC LIMIT ?",
+            (id, max(1, min(limit, 200)))).fetchall()
+    finally:
+        conn.close()
+    return [_bake_job_out(r) for r in rows]
+
+
+@router.get("/{id}/bake-jobs/{job_id}", response_model=BakeJobOut)
+def get_bake_job(id: int, job_id: int):
+    conn = get_db()
+    try:
+        row = conn.execute("SELECT * FROM bake_jobs WHERE id = ? AND text_id = ?",
+                           (job_id, id)).fetchone()
+    finally:
+        conn.close()
+    if not row:
+        raise HTTPException(404, "Bake job not found")
+    return _bake_job_out(row)
+
+
 @router.post("", response_model=TextDetailOut)
 async def upload_text(
     file: UploadFile = File(...),
@@ -372,8 +597,19 @@ async def upload_text(
     source_text = contents.decode("utf-8")
     doc_title = title or file.filename.rsplit(".", 1)[0]
 
-    raw_text, _units = prepare_and_tokenize(source_text)
+    # The botok tiling runs in the warm tokenizer pool and the writes on a worker
+    # thread: neither holds the event loop.
+    try:
+        raw_text, tiles = await tokenize_pool.prepare_async(source_text)
+    except ValueError as exc:
+        raise HTTPException(400, f"Could not tokenize the text: {exc}")
+    return await run_in_threadpool(
+        _store_upload, file.filename, doc_title, source_text, raw_text, tiles,
+        instance_id, teaching_id, title_bo, access_level)
+
 
+def _store_upload(filename, doc_title, source_text, raw_text, tiles, instance_id,
+                  teaching_id, title_bo, access_level) -> dict:
     conn = get_db()
     cursor = conn.cursor()
     cursor.execute(
@@ -381,12 +617,12 @@ async def upload_text(
         INSERT INTO texts (org_id, filename, title, source_text, raw_text)
         VALUES (?, ?, ?, ?, ?)
         """,
-        (active_org_id(), file.filename, doc_title, source_text, raw_text)
+        (active_org_id(), filename, doc_title, source_text, raw_text)
     )
     doc_id = cursor.lastrowid
     _apply_instance_metadata(
         conn, doc_id, raw_text, instance_id, teaching_id, title_bo, access_level,
-        fallback_title=doc_title,
+        fallback_title=doc_title, tiles=tiles,
     )
     conn.commit()
 
@@ -403,6 +639,46 @@ async def upload_text(
     }
 
 
+@router.post("/bulk", response_model=BulkIngestOut)
+def bulk_upload_texts(
+    file: UploadFile = File(...),
+    text_group: Optional[str] = Form(None),
+    batch_size: int = Form(50),
+):
+    """Ingest every ``.txt`` in a zip archive as a primary text (app/ingest.py): the
+    tokenization runs in a process pool, the syllables are written in one transaction
+    per ``batch_size`` texts. Titles are the file stems; instance ids are the fallback
+    slugs. Files that are not UTF-8 are reported in ``errors`` and skipped."""
+    if not file.filename.endswith(".zip"):
+        raise HTTPException(400, "Only .zip archives are supported.")
+    if batch_size < 1:
+        raise HTTPException(400, "batch_size must be positive")
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(file.file.read()))
+    except zipfile.BadZipFile:
+        raise HTTPException(400, "Not a valid zip archive.")
+    files, undecodable = [], []
+    for name in sorted(archive.namelist()):
+        if not name.endswith(".txt") or name.startswith("__MACOSX/"):
+            continue
+        try:
+            files.append((name, archive.read(name).decode("utf-8")))
+        except UnicodeDecodeError:
+            undecodable.append({"filename": name, "error": "not UTF-8"})
+    if not files and not undecodable:
+        raise HTTPException(400, "The archive holds no .txt files.")
+
+    conn = get_db()
+    try:
+        report = ingest_texts(conn, files, active_org_id(),
+                              text_group=normalize_group_path(text_group),
+                              batch_size=batch_size)
+    finally:
+        conn.close()
+    report["errors"] = undecodable + report["errors"]
+    return report
+
+
 @router.post("/{id}/build-manifest", response_model=TextDetailOut)
 def build_manifest(
     id: int,
@@ -513,7 +789,24 @@ def update_text_meta(id: int, patch: TextMetaUpdate):
 
 @router.get("/{id}", response_model=TextDetailOut)
 def get_text(id: int):
+    """The text with its units. Streamed (``app/streaming.py``): only the head is
+    validated against ``TextDetailOut``, the units go out as they are projected."""
+    from ..derivation import compose_secondary, composed_raw_text
     conn = get_db()
+    try:
+        res = _text_row(conn, id)
+        if res.get("text_type") == "secondary":
+            toks = compose_secondary(conn, id)
+            res["raw_text"] = composed_raw_text(toks)
+            units = ([t["start_offset"], t["end_offset"], t["text"]] for t in toks)
+        else:
+            units = _units_iter(conn, id)
+    finally:
+        conn.close()
+    return json_stream(res, "units", units, model=TextDetailOut)
+
+
+def _text_row(conn, id: int) -> dict:
     cursor = conn.cursor()
     cursor.execute("""
         SELECT d.*,
@@ -524,10 +817,12 @@ def get_text(id: int):
     """, (id,))
     row = cursor.fetchone()
     if not row:
-        conn.close()
         raise HTTPException(404, "Text not found")
+    return dict(row)
+
 
-    res = dict(row)
+def _text_detail(conn, id: int) -> dict:
+    res = _text_row(conn, id)
     # A secondary text has no raw_text of its own — project its composed content so
     # the workspace (which builds segments from raw_text) renders the derived text.
     # One compose serves both the units projection and the raw text.
@@ -538,7 +833,6 @@ def get_text(id: int):
         res["raw_text"] = composed_raw_text(toks)
     else:
         res["units"] = _units_for(conn, id)
-    conn.close()
     return res
 
 
@@ -589,6 +883,7 @@ def derive_secondary_text(id: int, payload: Dict[str, Any] = Body(default={})):
     _copy_annotations(conn, id, new_id, remap, src_tokens, copy_tree=False,
                       copy_spans=False, copy_markers=False, copy_notes=False,
                       copy_passages=False)
+    stream_members.refresh(conn, new_id)
 
     conn.commit()
     row = dict(cursor.execute("SELECT * FROM texts WHERE id = ?", (new_id,)).fetchone())
@@ -799,20 +1094,26 @@ def _copy_annotations(conn, src_id: int, new_id: int, remap: dict, src_syls: lis
                 )
 
 
+def _syl_at(stream, offset: int):
+    """Id of the syllable of ``stream`` covering char ``offset`` — clamped to the text, so
+    an offset past either end resolves to the first/last syllable — or None when the
+    stream is empty. On a boundary that is the syllable starting there."""
+    if not len(stream):
+        return None
+    k = stream.containing(min(max(offset, 0), stream.ends[-1] - 1))
+    return stream.ids[k] if k is not None else stream.ids[-1]
+
+
 def _copy_range_annotations(conn, src_id: int, new_id: int, ids: list,
                             start_off: int, end_off: int, by_id: dict) -> None:
     """/extract: build a relative-offset remap (source syllable -> new syllable at the same
     offset from the extraction start) for the extracted range and copy its in-range
     annotations (no tree). Delegates to ``_copy_annotations``."""
-    new_syls = load_syllables(conn, new_id)
-    newstart2id = {s["start_offset"]: s["id"] for s in new_syls}
+    new = load_stream(conn, new_id)
     remap: dict = {}
     for sid in ids:
-        rel = by_id[sid]["start_offset"] - start_off
-        nid = newstart2id.get(rel)
-        if nid is None:  # tokenisation shifted (e.g. a trimmed leading space): fall back
-            k = offset_to_syllable_index(new_syls, rel)
-            nid = new_syls[k]["id"] if k is not None else None
+        # Tokenisation may have shifted (e.g. a trimmed leading space): containment.
+        nid = _syl_at(new, by_id[sid]["start_offset"] - start_off)
         if nid is not None:
             remap[sid] = nid
     _copy_annotations(conn, src_id, new_id, remap, load_syllables(conn, src_id), copy_tree=False)
@@ -893,17 +1194,15 @@ def clone_text(id: int, payload: CloneIn = Body(default=CloneIn())):
     # the corrected text (replaced/inserted content is baked in; deleted content is gone, so
     # annotations sitting on it are dropped / spans clamped).
     segments = got[2] if got else []
-    clone_syls = load_syllables(conn, new_id)
-    clonestart2id = {s["start_offset"]: s["id"] for s in clone_syls}
+    clone = load_stream(conn, new_id)
     remap: dict = {}
     pos = 0
     for seg in segments:
         if seg["kind"] == "keep":
             syl = seg["syl"]
-            cid = clonestart2id.get(pos)
-            if cid is None:  # re-tokenisation shifted a boundary — fall back to containment
-                k = offset_to_syllable_index(clone_syls, pos)
-                cid = clone_syls[k]["id"] if k is not None else None
+            # The clone syllable starting at ``pos`` — or, where re-tokenisation shifted a
+            # boundary, the one containing it.
+            cid = _syl_at(clone, pos)
             if cid is not None:
                 remap[syl["id"]] = cid
             pos += len(syl["text"])
@@ -1001,7 +1300,7 @@ def get_editor_tokens(id: int):
     one entry per syllable `{idx, id, text, nature, inserted, start_offset,
     end_offset}`, corrected text with accepted suggestions applied. The frontend
     renders this as the live selectable text and derives both syllable-UUID anchors
-    and raw offsets from it. Read-only."""
+    and raw offsets from it. Read-only. Streamed (``app/streaming.py``)."""
     from ..exporters.manifest_exporter import build_editor_tokens
     from ..derivation import compose_secondary
     conn = get_db()
@@ -1012,10 +1311,12 @@ def get_editor_tokens(id: int):
         # A secondary text's editor tokens are its composed derivation (parent links +
         # overrides + added/transcluded), tagged with `source` provenance.
         if row["text_type"] == "secondary":
-            return {"tokens": compose_secondary(conn, id)}
-        return {"tokens": build_editor_tokens(conn, id)}
+            tokens = compose_secondary(conn, id)
+        else:
+            tokens = build_editor_tokens(conn, id)
     finally:
         conn.close()
+    return json_stream({}, "tokens", tokens)
 
 
 @router.post("/{id}/retokenize", response_model=TextDetailOut)
@@ -1052,7 +1353,7 @@ def retokenize_text(id: int):
     # merge, so every derived offset (markers, tree-node segment starts, portions) follows
     # its anchor automatically — no offset re-snapping pass is needed anymore.
     persist_syllables(conn, id,
-                      row["instance_id"] or f"{default_instance_id(row['title'])}_t{id}",
+                      row["instance_id"] or fallback_instance_id(row['title'], id),
                       raw_text)
     conn.commit()
 
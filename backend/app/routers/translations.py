@@ -16,13 +16,14 @@ import html as html_mod
 from html.parser import HTMLParser
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 
+from .. import layer_cache
 from ..auth import active_user_id
 from ..db import get_db
-from ..derivation import base_tokens
-from ..manifest import syllable_ids_between
+from ..derivation import base_stream
+from ..stream_members import current as stream_members_current, range_member_clause
 from .spans import _span_source_texts
 
 router = APIRouter(prefix="/api", tags=["translations"])
@@ -212,9 +213,17 @@ def _owner_text(conn, syl_id: str):
     return row["text_id"] if row else None
 
 
+def _is_primary(cursor, text_id: int) -> bool:
+    """Whether ``base_stream`` reads ``text_id`` off its own syllables (``idx`` order) —
+    the ranges ``range_member_clause`` can walk in SQL."""
+    row = cursor.execute(
+        "SELECT text_type, parent_text_id FROM texts WHERE id = ?", (text_id,)).fetchone()
+    return row is not None and not (row["text_type"] == "secondary" and row["parent_text_id"])
+
+
 def _resolve_chunk_range(conn, text_id: int, start_syl_id: str, end_syl_id: str):
     """Ids of the chunk's tokens over ``text_id``'s exposed sequence, or []."""
-    return syllable_ids_between(base_tokens(conn, text_id), start_syl_id, end_syl_id)
+    return base_stream(conn, text_id).ids_between(start_syl_id, end_syl_id)
 
 
 def _find_or_create_chunk(conn, context_text_id: int, start_syl_id: str,
@@ -246,7 +255,8 @@ def _find_or_create_chunk(conn, context_text_id: int, start_syl_id: str,
 # ─── Endpoints ──────────────────────────────────────────────────────────────────
 
 @router.get("/texts/{text_id}/translations", response_model=List[ChunkOut])
-def list_text_translations(text_id: int):
+def list_text_translations(text_id: int, request: Request = None,
+                           response: Response = None):
     """Every chunk applicable to this text's stream — its own plus those of every
     ancestor/transclusion source (the same graph tag inheritance walks). A chunk
     applies when ANY of its member syllables appears in the stream; the response
@@ -256,19 +266,30 @@ def list_text_translations(text_id: int):
         cursor = conn.cursor()
         if not cursor.execute("SELECT 1 FROM texts WHERE id = ?", (text_id,)).fetchone():
             raise HTTPException(404, "Text not found")
+        not_modified = layer_cache.text_not_modified(
+            conn, request, response, "translations", text_id, ("translations",))
+        if not_modified is not None:
+            return not_modified
         compose_cache: dict = {}
-        stream_ids = {t["id"] for t in base_tokens(conn, text_id, cache=compose_cache)}
+        stream_ids = base_stream(conn, text_id, cache=compose_cache).index()
         origins = [text_id] + _span_source_texts(cursor, text_id)
+        live = stream_members_current(conn, text_id)
         out = []
         for origin in origins:
-            rows = cursor.execute(
-                "SELECT * FROM translation_chunks WHERE origin_text_id = ?", (origin,)
-            ).fetchall()
+            # A primary origin's chunks that touch nothing in this stream are dropped in
+            # SQL while the stream_members rows are current; the check below still runs.
+            sql, params = "SELECT * FROM translation_chunks WHERE origin_text_id = ?", (origin,)
+            if live and origin != text_id and _is_primary(cursor, origin):
+                sql += " AND " + range_member_clause(
+                    "translation_chunks.origin_text_id", "start_syl_id", "end_syl_id")
+                params += (text_id,)
+            rows = cursor.execute(sql, params).fetchall()
             if not rows:
                 continue
-            toks = base_tokens(conn, origin, cache=compose_cache)
-            by_id = {t["id"]: t for t in toks}
-            tok_pos = {t["id"]: i for i, t in enumerate(toks)}
+            toks = base_stream(conn, origin, cache=compose_cache)
+            # A chunk applies when one of its tokens is in this stream: O(1) per chunk by
+            # the membership prefix sums. Own chunks resolve on this very stream.
+            hits = None if origin == text_id else toks.member_counts(stream_ids)
             # One batched query for every chunk's translations (was one per chunk).
             trans_by_chunk: dict = {}
             chunk_ids = [ch["id"] for ch in rows]
@@ -278,8 +299,8 @@ def list_text_translations(text_id: int):
             ).fetchall():
                 trans_by_chunk.setdefault(t["chunk_id"], []).append(t)
             for ch in rows:
-                ids = syllable_ids_between(toks, ch["start_syl_id"], ch["end_syl_id"], pos=tok_pos)
-                if not ids or not any(i in stream_ids for i in ids):
+                span = toks.span_between(ch["start_syl_id"], ch["end_syl_id"])
+                if span is None or (hits is not None and hits[span[1] + 1] == hits[span[0]]):
                     continue
                 translations = [
                     TranslationOut(
@@ -293,7 +314,7 @@ def list_text_translations(text_id: int):
                     id=ch["id"], origin_text_id=origin,
                     start_syl_id=ch["start_syl_id"], end_syl_id=ch["end_syl_id"],
                     kind=ch["kind"], level=ch["level"], render_as=ch["render_as"],
-                    text="".join(by_id[i]["text"] for i in ids),
+                    text=toks.text_of(*span),
                     translations=translations,
                 ))
         return out
@@ -324,9 +345,7 @@ def upsert_translation(payload: TranslationUpsertIn):
         )
         conn.commit()
         ch = conn.execute("SELECT * FROM translation_chunks WHERE id = ?", (chunk_id,)).fetchone()
-        toks = base_tokens(conn, ch["origin_text_id"])
-        by_id = {t["id"]: t for t in toks}
-        ids = syllable_ids_between(toks, ch["start_syl_id"], ch["end_syl_id"])
+        toks = base_stream(conn, ch["origin_text_id"])
         translations = [
             TranslationOut(lang=t["lang"], body=t["body"], status=t["status"],
                            translated_from=t["translated_from"], updated_at=str(t["updated_at"]))
@@ -337,7 +356,8 @@ def upsert_translation(payload: TranslationUpsertIn):
             id=ch["id"], origin_text_id=ch["origin_text_id"],
             start_syl_id=ch["start_syl_id"], end_syl_id=ch["end_syl_id"], kind=ch["kind"],
             level=ch["level"], render_as=ch["render_as"],
-            text="".join(by_id[i]["text"] for i in ids), translations=translations,
+            text=toks.text_between(ch["start_syl_id"], ch["end_syl_id"]),
+            translations=translations,
         )
     finally:
         conn.close()
@@ -414,9 +434,7 @@ def set_chunk_level(payload: ChunkLevelIn):
                      (payload.level, chunk_id))
         conn.commit()
         ch = conn.execute("SELECT * FROM translation_chunks WHERE id = ?", (chunk_id,)).fetchone()
-        toks = base_tokens(conn, ch["origin_text_id"])
-        by_id = {t["id"]: t for t in toks}
-        ids = syllable_ids_between(toks, ch["start_syl_id"], ch["end_syl_id"])
+        toks = base_stream(conn, ch["origin_text_id"])
         translations = [
             TranslationOut(lang=t["lang"], body=t["body"], status=t["status"],
                            translated_from=t["translated_from"], updated_at=str(t["updated_at"]))
@@ -427,7 +445,8 @@ def set_chunk_level(payload: ChunkLevelIn):
             id=ch["id"], origin_text_id=ch["origin_text_id"],
             start_syl_id=ch["start_syl_id"], end_syl_id=ch["end_syl_id"], kind=ch["kind"],
             level=ch["level"], render_as=ch["render_as"],
-            text="".join(by_id[i]["text"] for i in ids), translations=translations,
+            text=toks.text_between(ch["start_syl_id"], ch["end_syl_id"]),
+            translations=translations,
         )
     finally:
         conn.close()
@@ -464,9 +483,7 @@ def set_chunk_render_as(payload: ChunkRenderAsIn):
                      (value, chunk_id))
         conn.commit()
         ch = conn.execute("SELECT * FROM translation_chunks WHERE id = ?", (chunk_id,)).fetchone()
-        toks = base_tokens(conn, ch["origin_text_id"])
-        by_id = {t["id"]: t for t in toks}
-        ids = syllable_ids_between(toks, ch["start_syl_id"], ch["end_syl_id"])
+        toks = base_stream(conn, ch["origin_text_id"])
         translations = [
             TranslationOut(lang=t["lang"], body=t["body"], status=t["status"],
                            translated_from=t["translated_from"], updated_at=str(t["updated_at"]))
@@ -477,7 +494,8 @@ def set_chunk_render_as(payload: ChunkRenderAsIn):
             id=ch["id"], origin_text_id=ch["origin_text_id"],
             start_syl_id=ch["start_syl_id"], end_syl_id=ch["end_syl_id"], kind=ch["kind"],
             level=ch["level"], render_as=ch["render_as"],
-            text="".join(by_id[i]["text"] for i in ids), translations=translations,
+            text=toks.text_between(ch["start_syl_id"], ch["end_syl_id"]),
+            translations=translations,
         )
     finally:
         conn.close()
@@ -671,7 +689,7 @@ def list_suggestions(text_id: int):
     conn = get_db()
     try:
         cursor = conn.cursor()
-        stream_ids = {t["id"] for t in base_tokens(conn, text_id)}
+        stream_ids = base_stream(conn, text_id).index()
         origins = [text_id] + _span_source_texts(cursor, text_id)
         out: List[SuggestionOut] = []
         for origin in origins:
@@ -682,8 +700,7 @@ def list_suggestions(text_id: int):
             ).fetchall():
                 ch = cursor.execute("SELECT * FROM translation_chunks WHERE id = ?",
                                     (r["chunk_id"],)).fetchone()
-                ids = syllable_ids_between(
-                    base_tokens(conn, ch["origin_text_id"]),
+                ids = base_stream(conn, ch["origin_text_id"]).ids_between(
                     ch["start_syl_id"], ch["end_syl_id"])
                 if ids and any(i in stream_ids for i in ids):
                     out.append(_suggestion_out(r))
@@ -787,13 +804,17 @@ def _layout_out(conn, r) -> LayoutOut:
 
 
 @router.get("/texts/{text_id}/chunk-layouts", response_model=List[LayoutOut])
-def list_layouts(text_id: int):
+def list_layouts(text_id: int, request: Request = None, response: Response = None):
     """Layout rows applicable to this booklet: its own rows plus GLOBAL rows whose
     anchors/ranges resolve in its stream. A booklet 'move' row shadows a global row
     with the same source range (the booklet-override rule)."""
     conn = get_db()
     try:
-        stream_ids = {t["id"] for t in base_tokens(conn, text_id)}
+        not_modified = layer_cache.text_not_modified(
+            conn, request, response, "chunk-layouts", text_id, ("layouts",))
+        if not_modified is not None:
+            return not_modified
+        stream_ids = base_stream(conn, text_id).index()
         rows = conn.execute(
             "SELECT * FROM chunk_layouts WHERE text_id = ? OR text_id IS NULL "
             "ORDER BY position, id", (text_id,)).fetchall()
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Query
+from bisect import bisect_right
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import List, Optional
 import sqlite3
 
+from .. import layer_cache
 from ..db import get_db
+from ..stream_members import current as stream_members_current, member_clause
 from ..schemas import (
     TreeNodeOut, TreeNodeCreate, TreeNodeUpdate, TreeNodeMove, TreeNodeReorder
 )
@@ -160,26 +163,24 @@ def _gathered_tree_rows(conn, text_id: int) -> list[dict]:
     from ..inherit import source_texts
     cursor = conn.cursor()
     id2start, _ = _syl_offset_maps(conn, text_id)
-    stream = set(id2start)
-    live_passage_ids = {
-        p["id"] for p in cursor.execute(
-            "SELECT id FROM passages WHERE text_id = ?", (text_id,)).fetchall()
-    }
-    # NOTE: passages now inherit live, but tree.passage_id references the OWNING
-    # text's passage id; resolve via the passages endpoint's id space.
-    from .passages import list_passages
-    try:
-        live_passage_ids |= {p["id"] for p in list_passages(text_id)}
-    except Exception:
-        pass
 
+    # One indexed query per text in the chain (idx_tree_nodes_text), each row carrying
+    # its display slot (a primary-key probe) — never a scan of either table. While the
+    # stream_members rows are current, an inherited segment node with no children whose
+    # anchor is not in this stream is dropped in SQL: `applies` below would drop it too.
+    live = stream_members_current(conn, text_id)
     gathered: dict[int, dict] = {}
-    display_slots = {r["node_id"]: r["before_node_id"] for r in cursor.execute(
-        "SELECT node_id, before_node_id FROM tree_node_display_slots").fetchall()}
     for origin in [text_id] + source_texts(cursor, text_id):
         inherited = origin != text_id
-        for r in cursor.execute(
-            "SELECT * FROM tree_nodes WHERE text_id = ?", (origin,)).fetchall():
+        sql = ("SELECT n.*, s.before_node_id AS display_before_node_id FROM tree_nodes n "
+               "LEFT JOIN tree_node_display_slots s ON s.node_id = n.id "
+               "WHERE n.text_id = ?")
+        params: tuple = (origin,)
+        if inherited and live:
+            sql += (f" AND ({member_clause('n.segment_start_syl_id')} OR EXISTS "
+                    f"(SELECT 1 FROM tree_nodes c WHERE c.parent_id = n.id))")
+            params += (text_id,)
+        for r in cursor.execute(sql, params).fetchall():
             if r["id"] in gathered:
                 continue
             d = _row_to_node(r, id2start)
@@ -188,14 +189,26 @@ def _gathered_tree_rows(conn, text_id: int) -> list[dict]:
             # actually owns it — what ordering and position arithmetic key on.
             d["text_id"] = text_id
             d["inherited"] = inherited
-            d["display_before_node_id"] = display_slots.get(r["id"])
             gathered[r["id"]] = d
 
+    # NOTE: passages now inherit live, but tree.passage_id references the OWNING
+    # text's passage id; resolve via the passages listing's id space. Only asked for
+    # when some gathered node is passage-linked.
+    live_passage_ids: set = set()
+    if any(d.get("passage_id") is not None for d in gathered.values()):
+        from .passages import _applicable_passages
+        live_passage_ids = {p["id"] for p in cursor.execute(
+            "SELECT id FROM passages WHERE text_id = ?", (text_id,)).fetchall()}
+        try:
+            live_passage_ids |= {r["id"] for r, _, _ in _applicable_passages(conn, text_id)}
+        except Exception:
+            pass
+
     # Directly-applicable: anchor resolves in this stream.
     def anchored_ok(d) -> bool:
         syl = d.get("segment_start_syl_id")
         if syl is not None:
-            return syl in stream
+            return syl in id2start
         if d.get("passage_id") is not None:
             return d["passage_id"] in live_passage_ids
         return False  # free-form: decided by descendants
@@ -263,22 +276,45 @@ def _order_level(nodes: list[dict], own_text_id: int) -> list[dict]:
         if n.get("segment_start") is not None:
             last = n["segment_start"]
         offsets.append(last)
+    ids = [n["id"] for n in out]
+    placed = set(ids)
+    # `keys` is `offsets` with each gap (None) borrowing the anchor before it, -1 when
+    # none does. While the anchored offsets run in order — the usual case — it is sorted,
+    # and "after the last anchored node at or before o" is a bisection rather than a scan.
+    keys = [-1 if bo is None else bo for bo in offsets]
+    ordered = all(a <= b for a, b in zip(keys, keys[1:]))
 
     after = len(out)  # default landing spot for an unanchored own node: the end
     for n in own:
         o = n.get("segment_start")
         before_id = n.get("display_before_node_id")
-        if before_id is not None and any(x["id"] == before_id for x in out):
-            idx = next(i for i, x in enumerate(out) if x["id"] == before_id)
+        if before_id is not None and before_id in placed:
+            idx = ids.index(before_id)
         elif o is None:
             idx = after
+        elif ordered:
+            idx = bisect_right(keys, o)
+            while idx and offsets[idx - 1] is None:   # step back over borrowed keys
+                idx -= 1
         else:
             idx = 0
             for i, bo in enumerate(offsets):
                 if bo is not None and bo <= o:
                     idx = i + 1
+        v = o if o is not None else (offsets[idx - 1] if idx else None)
         out.insert(idx, n)
-        offsets.insert(idx, o if o is not None else (offsets[idx - 1] if idx else None))
+        ids.insert(idx, n["id"])
+        placed.add(n["id"])
+        offsets.insert(idx, v)
+        keys.insert(idx, v if v is not None else (keys[idx - 1] if idx else -1))
+        j = idx + 1
+        if v is not None:                             # the gap after now borrows v
+            while j < len(offsets) and offsets[j] is None:
+                keys[j] = v
+                j += 1
+        if ordered and ((idx and keys[idx - 1] > keys[idx])
+                        or (j < len(keys) and keys[j - 1] > keys[j])):
+            ordered = False                           # a display slot broke the order
         after = idx + 1
     return out
 
@@ -298,28 +334,60 @@ def _with_sort_index(rows: list[dict], text_id: int) -> list[dict]:
     return rows
 
 
+# What an outline read is computed from, besides the closure's streams: the tree rows and
+# display slots ('outline') and the passages its passage-linked nodes resolve through.
+_OUTLINE_LAYERS = ("outline", "passages")
+
+
+def _cached_outline(conn, text_id: int, shape: str, build,
+                    request: Optional[Request], response: Optional[Response]):
+    """Serve the ``shape`` outline of ``text_id`` from ``layer_cache`` (``build(conn)`` on a
+    miss), or a 304 when the client's ETag is current (see ``layer_cache.revalidate``).
+    Called directly (no request), it is the plain payload. SHARED: read-only."""
+    current = layer_cache.stamp(conn, text_id, _OUTLINE_LAYERS)
+    not_modified = layer_cache.revalidate(
+        request, response, layer_cache.etag(shape, text_id, current))
+    if not_modified is not None:
+        return not_modified
+    payload = layer_cache.lookup(shape, text_id, current)
+    if payload is None:
+        payload = build(conn)
+        layer_cache.store(conn, shape, text_id, current, payload)
+    return payload
+
+
 @router.get("/texts/{text_id}/tree-nodes", response_model=List[TreeNodeOut])
-def list_tree_nodes(text_id: int):
-    """Flat list of the text's own + inherited tree nodes (see _gathered_tree_rows)."""
+def list_tree_nodes(text_id: int, request: Request = None, response: Response = None):
+    """Flat list of the text's own + inherited tree nodes (see _gathered_tree_rows).
+    Revalidates by ETag: an unchanged outline answers ``If-None-Match`` with a 304."""
     conn = get_db()
     try:
-        rows = _with_sort_index(_gathered_tree_rows(conn, text_id), text_id)
+        return _cached_outline(conn, text_id, "flat", lambda c: _tree_node_rows(c, text_id),
+                               request, response)
     finally:
         conn.close()
+
+
+def _tree_node_rows(conn, text_id: int) -> list[dict]:
+    rows = _with_sort_index(_gathered_tree_rows(conn, text_id), text_id)
     rows.sort(key=lambda n: (n["parent_id"] is not None, n["parent_id"] or 0,
                              n["sort_index"]))
     return rows
 
 
 @router.get("/texts/{text_id}/tree-nodes/tree")
-def get_nested_tree(text_id: int):
-    """Convenience: nested tree shape for read-only consumption."""
+def get_nested_tree(text_id: int, request: Request = None, response: Response = None):
+    """Convenience: nested tree shape for read-only consumption (ETag as above)."""
     conn = get_db()
     try:
-        rows = _with_sort_index(_gathered_tree_rows(conn, text_id), text_id)
+        return _cached_outline(conn, text_id, "nested", lambda c: _nested_tree(c, text_id),
+                               request, response)
     finally:
         conn.close()
 
+
+def _nested_tree(conn, text_id: int) -> dict:
+    rows = _with_sort_index(_gathered_tree_rows(conn, text_id), text_id)
     present = {r["id"] for r in rows}
     by_parent: dict[Optional[int], list[dict]] = {}
     for r in rows:
@@ -163,9 +163,20 @@ class ComposedToken(BaseModel):
     # OCCURRENCES: the same source transcluded twice repeats the same uuids.
     op_id: Optional[int] = None
 
+class ComposedDelta(BaseModel):
+    # Splice from the stream before an edit to the stream after it (see derivation.compose_delta):
+    # old[start : start + delete_count] -> tokens; later tokens shift by the length/offset change.
+    start: int
+    delete_count: int
+    tokens: List[ComposedToken] = []
+    offset_shift: int = 0
+    length: int                     # token count of the stream after the edit
+
 class ComposedOut(BaseModel):
     tokens: List[ComposedToken] = []
     raw_text: str = ''              # concatenation of composed token texts (frontend aid)
+    # Set instead of tokens/raw_text when an edit endpoint is called with ?delta=true.
+    delta: Optional[ComposedDelta] = None
 
 class EditRangeIn(BaseModel):
     start_syl_id: str               # inclusive first PARENT syllable of the edited run
@@ -824,3 +835,49 @@ class TitleShiftIn(BaseModel):
     item_id: int
     field: str          # image|tibetan|title|subtitle|origin|author
     shift_mm: float
+
+
+# ─── Bulk ingest ──────────────────────────────────────────────────────────────
+# POST /api/texts/bulk: a whole corpus ingested at once (app/ingest.py).
+
+class BulkIngestError(BaseModel):
+    filename: str
+    error: str
+
+
+class BulkIngestOut(BaseModel):
+    text_ids: List[int]
+    errors: List[BulkIngestError]
+    syllables: int
+    seconds: float
+    syllables_per_sec: float
+
+
+# ─── Bake jobs ────────────────────────────────────────────────────────────────
+# POST /api/texts/{id}/apply-corrections queues one; GET .../bake-jobs/{job_id} polls it.
+
+class BakeJobOut(BaseModel):
+    id: int
+    text_id: int
+    status: str                        # 'queued' | 'running' | 'done' | 'failed'
+    baked: bool = False
+    error: Optional[str] = None
+    timings: Dict[str, float] = {}     # per-phase ms: splice, tokenize, align, write, snap, members
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+# ─── Workspace bundle ─────────────────────────────────────────────────────────
+# Every layer the text workspace loads, in one response (GET /api/texts/{id}/bundle).
+# Each field has exactly the shape of its own endpoint; a layer not asked for is null.
+
+class TextBundleOut(BaseModel):
+    text: Optional[TextDetailOut] = None
+    spans: Optional[List[SpanOut]] = None
+    markers: Optional[List[MarkerOut]] = None
+    notes: Optional[List[NoteOut]] = None
+    passages: Optional[List[PassageOut]] = None
+    tree_nodes: Optional[List[TreeNodeOut]] = None
+    display_breaks: Optional[List[DisplayBreakOut]] = None
+    suggestions: Optional[List[SuggestionOut]] = None
@@ -0,0 +1,70 @@
+"""Process-wide cache of composed secondary streams.
+
+``compose_secondary`` is the hottest read in the app: every annotation endpoint, the
+workspace text and the editor tokens recompose the same stream from its parent chain
+and ops on every request. The composition only changes when a syllable, derivation op
+or op syllable of some text in the stream's ``source_texts`` closure is written, and
+each such write bumps that text's row in ``stream_generations`` (SQLite triggers, see
+app/db.py). So a composed stream is keyed by its text id and *stamped* with the
+generations of ``[text_id] + source_texts(text_id)``: a lookup whose stamp differs from
+the stored one is a miss, and no write path has to remember to invalidate anything.
+
+Primaries' own syllable streams are cached the same way (``kind="primary"``): their stamp
+is their own generation, which every syllable write bumps.
+
+Cached token lists are SHARED between requests — callers must treat them as read-only
+(every current caller only reads or copies them). Entries are only stored outside a
+transaction, so a stream composed from uncommitted (possibly rolled-back) writes is
+never served to anyone else.
+"""
+
+import threading
+from collections import OrderedDict
+
+from . import db
+from .inherit import source_texts
+
+_MAX_ENTRIES = 64
+
+_lock = threading.Lock()
+_entries: OrderedDict = OrderedDict()   # (db path, kind, text_id) -> (stamp, tokens)
+
+
+def stamp(conn, text_id: int) -> tuple:
+    """The generations of every text the stream of ``text_id`` is composed from.
+    A text never written yet reads as -1 (its first write creates the row at 0)."""
+    closure = [text_id] + source_texts(conn, text_id)
+    marks = ",".join("?" * len(closure))
+    gens = {r["text_id"]: r["generation"] for r in conn.execute(
+        f"SELECT text_id, generation FROM stream_generations WHERE text_id IN ({marks})",
+        closure)}
+    return tuple((t, gens.get(t, -1)) for t in closure)
+
+
+def lookup(text_id: int, current: tuple, kind: str = "composed"):
+    """The cached stream of ``text_id`` if it was composed at ``current``, else None."""
+    key = (db.DB_PATH, kind, text_id)
+    with _lock:
+        hit = _entries.get(key)
+        if hit is None or hit[0] != current:
+            return None
+        _entries.move_to_end(key)
+        return hit[1]
+
+
+def store(conn, text_id: int, current: tuple, tokens, kind: str = "composed") -> None:
+    """Remember ``tokens`` as the stream of ``text_id`` at ``current``. Skipped inside a
+    transaction: the writes it saw may yet roll back."""
+    if conn.in_transaction:
+        return
+    key = (db.DB_PATH, kind, text_id)
+    with _lock:
+        _entries[key] = (current, tokens)
+        _entries.move_to_end(key)
+        while len(_entries) > _MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
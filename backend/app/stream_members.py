@@ -0,0 +1,112 @@
+"""The materialized stream-membership table of a secondary text.
+
+Inherited-annotation reads gather rows from every text in ``source_texts`` and keep the
+ones whose anchors appear in this text's composed stream. ``stream_members`` holds that
+stream as rows (text_id, syl_id, op_id) — a multiset, one row per token — so the read can
+push the "appears here" test into SQL (``member_clause``, ``range_member_clause``) and
+skip a dead ancestor row without loading it.
+
+The rows are derived data, written by the writers that change a composition: every
+write to syllables or derivation ops (the writes that bump ``stream_generations``) calls
+``refresh`` for the written text inside its own transaction, so the rows of every
+secondary composed from it commit — or roll back — with the write, under the write lock
+the writer already holds. A refresh patches the table: only the tokens that left the
+stream are deleted and only those that joined it inserted, so an edit writes rows the
+size of the edited run, not of the stream.
+
+Reads never write. ``current`` tells a read whether the rows match the stream it is
+about to filter against — the stored stamp (the ``stream_generations`` of the text's
+source closure, as in app/stream_cache.py) against the live one. A text whose rows are
+behind (a write path that does not refresh, a re-parented text) keeps its Python-side
+filter until the next refresh. The SQL clauses only ever narrow what the existing checks
+would drop anyway.
+"""
+
+import json
+
+from .inherit import dependent_texts
+from .stream_cache import stamp
+
+
+def member_clause(col: str) -> str:
+    """SQL true when ``col`` (a syl_id column, or NULL) appears in the stream bound by
+    the one ``?`` parameter (the reading text id). NULL passes: it is an end sentinel."""
+    return (f"({col} IS NULL OR EXISTS (SELECT 1 FROM stream_members sm "
+            f"WHERE sm.text_id = ? AND sm.syl_id = {col}))")
+
+
+def range_member_clause(origin: str, start_col: str, end_col: str) -> str:
+    """SQL true when ANY syllable of the run ``[start_col, end_col]`` of the PRIMARY text
+    ``origin`` appears in the stream bound by the one ``?`` parameter. The run's syllables
+    are walked in ``idx`` order off the primary key and the walk stops at the first member:
+    one probe for a run that applies, the run's length for one that does not. A run whose
+    ends do not resolve in ``origin`` (or are reversed) is false."""
+    return (f"EXISTS (SELECT 1 FROM syllables st "
+            f"JOIN stream_members sm ON sm.text_id = ? AND sm.syl_id = st.id "
+            f"WHERE st.text_id = {origin} AND st.idx BETWEEN "
+            f"(SELECT idx FROM syllables WHERE text_id = {origin} AND id = {start_col}) AND "
+            f"(SELECT idx FROM syllables WHERE text_id = {origin} AND id = {end_col}))")
+
+
+def current(conn, text_id: int) -> bool:
+    """True when the stored rows of ``text_id`` are its composed stream as it reads now.
+    Primaries are never materialized (they have no source texts to filter): False."""
+    row = conn.execute(
+        "SELECT s.stamp FROM texts t JOIN stream_members_state s ON s.text_id = t.id "
+        "WHERE t.id = ? AND t.text_type = 'secondary'", (text_id,)).fetchone()
+    return row is not None and row["stamp"] == json.dumps(stamp(conn, text_id))
+
+
+def refresh(conn, text_id: int) -> None:
+    """Bring the rows of every secondary composed from ``text_id`` (itself included) up
+    to date. Called by a writer after its write, inside its transaction."""
+    from .derivation import compose_secondary  # late import (no module cycle)
+    deps = dependent_texts(conn, text_id)
+    marks = ",".join("?" * len(deps))
+    compose_cache: dict = {}
+    for r in conn.execute(
+            f"SELECT id FROM texts WHERE text_type = 'secondary' AND id IN ({marks}) "
+            f"ORDER BY id", deps).fetchall():
+        _refresh_one(conn, r["id"], compose_cache, compose_secondary)
+
+
+def refresh_stale(conn) -> None:
+    """``refresh`` every secondary whose rows are behind its stream (init_db: fills the
+    table of a database that predates it, and catches up after any unrefreshed write)."""
+    from .derivation import compose_secondary
+    compose_cache: dict = {}
+    for r in conn.execute(
+            "SELECT id FROM texts WHERE text_type = 'secondary' ORDER BY id").fetchall():
+        _refresh_one(conn, r["id"], compose_cache, compose_secondary)
+
+
+def _refresh_one(conn, text_id: int, compose_cache: dict, compose_secondary) -> None:
+    now = json.dumps(stamp(conn, text_id))
+    held = conn.execute(
+        "SELECT stamp FROM stream_members_state WHERE text_id = ?", (text_id,)).fetchone()
+    if held is not None and held["stamp"] == now:
+        return
+    _patch(conn, text_id, compose_secondary(conn, text_id, cache=compose_cache))
+    conn.execute(
+        "INSERT INTO stream_members_state (text_id, stamp) VALUES (?, ?) "
+        "ON CONFLICT(text_id) DO UPDATE SET stamp = excluded.stamp", (text_id, now))
+
+
+def _patch(conn, text_id: int, tokens: list) -> None:
+    """Turn the stored rows of ``text_id`` into ``tokens``' (syl_id, op_id) multiset,
+    writing only the difference."""
+    stored: dict = {}
+    for r in conn.execute(
+            "SELECT rowid, syl_id, op_id FROM stream_members WHERE text_id = ?", (text_id,)):
+        stored.setdefault((r["syl_id"], r["op_id"]), []).append(r["rowid"])
+    added = []
+    for t in tokens:
+        rowids = stored.get((t["id"], t.get("op_id")))
+        if rowids:
+            rowids.pop()
+        else:
+            added.append((text_id, t["id"], t.get("op_id")))
+    conn.executemany("DELETE FROM stream_members WHERE rowid = ?",
+                     [(rowid,) for rowids in stored.values() for rowid in rowids])
+    conn.executemany("INSERT INTO stream_members (text_id, syl_id, op_id) VALUES (?, ?, ?)",
+                     added)
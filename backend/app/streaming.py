@@ -0,0 +1,76 @@
+"""Chunked JSON for the large per-syllable payloads.
+
+The text, composed-stream and editor-token endpoints return one small object around one
+array with an entry per syllable — tens of thousands for a long text. Returning them as
+plain values makes FastAPI validate every entry against the response model and hold the
+whole encoded body in memory before GZip sees the first byte. ``json_stream`` instead
+validates only the small head (so field filtering, defaults and bool/datetime coercion
+stay exactly the model's) and streams the array in fragments, each entry already in its
+final JSON shape.
+
+Entries are encoded as the caller hands them over: the caller is responsible for giving
+them the shape the model would (``model_row`` does that for a flat model).
+
+The connection cannot travel with the generator — Starlette iterates a sync body on
+worker threads and a sqlite3 connection is bound to the thread that made it — so callers
+fetch their rows first and the generator only encodes.
+"""
+import json
+from typing import Iterable, Optional
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+_CHUNK = 2000   # array entries per yielded fragment
+
+
+def _dumps(value) -> str:
+    # Byte-identical to fastapi.responses.JSONResponse.render.
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":"))
+
+
+def model_row(model: type[BaseModel]):
+    """An encoder giving a dict the field set/order/defaults ``model`` would serialize —
+    for flat models of JSON-native fields, without validating each row."""
+    fields = [(name, None if f.is_required() else f.get_default())
+              for name, f in model.model_fields.items()]
+    return lambda d: {name: d.get(name, default) for name, default in fields}
+
+
+def json_stream(head: dict, key: str, items: Iterable,
+                model: Optional[type[BaseModel]] = None, encode=None) -> StreamingResponse:
+    """Stream ``{**head, key: [*items]}``. ``model`` (the endpoint's response model)
+    validates and serializes the head with an empty ``key`` array; the array keeps the
+    model's field position."""
+    if model is not None:
+        head = model.model_validate({**head, key: []}).model_dump(mode="json")
+    else:
+        head = {**head, key: []}
+    before, after = {}, {}
+    seen = False
+    for k, v in head.items():
+        if k == key:
+            seen = True
+        elif seen:
+            after[k] = v
+        else:
+            before[k] = v
+
+    def body():
+        opening = _dumps(before)[:-1]
+        yield f'{opening}{"," if before else ""}{_dumps(key)}:['
+        batch: list[str] = []
+        first = True
+        for item in items:
+            batch.append(_dumps(encode(item) if encode else item))
+            if len(batch) >= _CHUNK:
+                yield ("" if first else ",") + ",".join(batch)
+                first = False
+                batch = []
+        if batch:
+            yield ("" if first else ",") + ",".join(batch)
+        closing = _dumps(after)[1:]
+        yield "]" + ("," + closing if after else "}")
+
+    return StreamingResponse(body(), media_type="application/json")
@@ -19,6 +19,101 @@ Convention (see db.py):
 by ``notes``, whose payload is offset-based) back to a syllable id; ``offsets_for_*``
 / ``offset_for_syl_*`` derive offsets from syllable ids for read responses.
 """
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Set inside `shared_offset_maps()`: (kind, text_id) -> AnchorIndex. A request reading
+# several layers of one text (the workspace bundle) then looks each index up once.
+_shared_maps: ContextVar = ContextVar("shared_offset_maps", default=None)
+
+
+@contextmanager
+def shared_offset_maps():
+    """Within the block, a text's ``anchor_index`` is looked up once and the same
+    (read-only) index handed to every caller — even one read inside a transaction, which
+    the process-wide cache would not keep. For read paths only: a write inside the block
+    would not be seen by an index already built."""
+    token = _shared_maps.set({})
+    try:
+        yield
+    finally:
+        _shared_maps.reset(token)
+
+
+def _memoized(kind: str, text_id, derive):
+    memo = _shared_maps.get()
+    if memo is None:
+        return derive()
+    key = (kind, text_id)
+    if key not in memo:
+        memo[key] = derive()
+    return memo[key]
+
+
+class AnchorIndex:
+    """Every offset map of one token sequence, each derived on first use and then kept:
+    ``id -> start``, ``id -> end``, ``start -> id``, ``end -> id`` and
+    ``(id, op_id) -> start``.
+
+    It is held by the ``TokenStream`` it indexes (``stream.anchors``), so it is shared the
+    way the stream is and lives exactly as long: a cached stream is replaced once a write
+    bumps the generation of a text it is read from (``stream_cache``), and its index goes
+    with it — no write path has to invalidate anything. Read-only for callers."""
+
+    __slots__ = ("_stream", "_syl", "_root", "_occurrence")
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._syl = self._root = self._occurrence = None
+
+    def syl_maps(self):
+        """``(id -> start, id -> end)``; a repeated id keeps its LAST occurrence."""
+        if self._syl is None:
+            s = self._stream
+            self._syl = dict(zip(s.ids, s.starts())), dict(zip(s.ids, s.ends))
+        return self._syl
+
+    def root_maps(self):
+        """``(start -> id, end -> id)``; of tokens sharing a boundary, the last."""
+        if self._root is None:
+            s = self._stream
+            self._root = dict(zip(s.starts(), s.ids)), dict(zip(s.ends, s.ids))
+        return self._root
+
+    def occurrence_offsets(self):
+        """``(id, op_id or 0) -> start``; the FIRST occurrence of each pair."""
+        if self._occurrence is None:
+            s = self._stream
+            out: dict = {}
+            for tid, op, pos in zip(s.ids, s.op_ids, s.starts()):
+                out.setdefault((tid, op or 0), pos)
+            self._occurrence = out
+        return self._occurrence
+
+
+def anchor_index(conn, text_id) -> AnchorIndex:
+    """The ``AnchorIndex`` of a text's anchor space: its own syllable rows for a primary,
+    its COMPOSED sequence for a secondary (parent refs + derivation ops, recursive), whose
+    token ids are real syllable uuids owned by the texts in its chain — this is what makes
+    secondaries taggable/markable/annotatable with the exact same anchor machinery.
+
+    Built once per stream generation and reused across calls and requests while the
+    stream is cached (never for a stream read inside a write transaction)."""
+    return _memoized("anchors", text_id, lambda: _index_of(_anchor_stream(conn, text_id)))
+
+
+def _anchor_stream(conn, text_id):
+    from .derivation import composed_stream, primary_stream  # late import (no module cycle)
+    row = conn.execute("SELECT text_type FROM texts WHERE id = ?", (text_id,)).fetchone()
+    if row and row["text_type"] == "secondary":
+        return composed_stream(conn, text_id)
+    return primary_stream(conn, text_id)
+
+
+def _index_of(stream) -> AnchorIndex:
+    if stream.anchors is None:
+        stream.anchors = AnchorIndex(stream)
+    return stream.anchors
 
 
 def _occurrence_offsets(conn, text_id):
@@ -30,48 +125,12 @@ def _occurrence_offsets(conn, text_id):
     text standing alone here, sitting inside a segment there). ``op_id`` names the occurrence,
     0 meaning "not tied to one".
     """
-    out: dict = {}
-    pos = 0
-    for tid, text, op in _token_seq(conn, text_id, with_op=True):
-        out.setdefault((tid, op or 0), pos)
-        pos += len(text)
-    return out
-
-
-def _token_seq(conn, text_id, with_op: bool = False):
-    """Ordered ``(id, text)`` pairs — the anchor space of a text.
-
-    ``with_op=True`` yields ``(id, text, op_id)`` instead: which derivation op emitted the
-    token, so a caller can tell two occurrences of the same syllable apart.
-
-    A primary anchors on its own syllable rows. A secondary anchors on its COMPOSED
-    sequence (parent refs + derivation ops, recursive), whose token ids are real
-    syllable uuids owned by the texts in its chain — this is what makes secondaries
-    taggable/markable/annotatable with the exact same anchor machinery."""
-    row = conn.execute("SELECT text_type FROM texts WHERE id = ?", (text_id,)).fetchone()
-    if row and row["text_type"] == "secondary":
-        from .derivation import compose_secondary  # late import (no module cycle)
-        toks = compose_secondary(conn, text_id)
-        if with_op:
-            return [(t["id"], t["text"], t.get("op_id")) for t in toks]
-        return [(t["id"], t["text"]) for t in toks]
-    rows = conn.execute(
-        "SELECT id, text FROM syllables WHERE text_id=? ORDER BY idx", (text_id,)).fetchall()
-    if with_op:
-        return [(r["id"], r["text"], None) for r in rows]   # a primary has no ops
-    return [(r["id"], r["text"]) for r in rows]
+    return anchor_index(conn, text_id).occurrence_offsets()
 
 
 def _root_maps(conn, text_id):
     # Offsets are derived from the token sequence (cumulative text lengths, E5).
-    start2id, end2id = {}, {}
-    pos = 0
-    for tid, text in _token_seq(conn, text_id):
-        end = pos + len(text)
-        start2id[pos] = tid
-        end2id[end] = tid
-        pos = end
-    return start2id, end2id
+    return anchor_index(conn, text_id).root_maps()
 
 
 # --- Per-row anchor helpers: map a legacy char offset back to the syllable id at
@@ -96,16 +155,8 @@ def anchor_for_range(conn, text_id, start_offset, end_offset):
 
 def _syl_offset_maps(conn, text_id):
     """(id->start_offset, id->end_offset) for a text, offsets derived from cumulative
-    text lengths (E5) over its anchor space (own syllables, or the composed sequence
-    for a secondary — see ``_token_seq``)."""
-    id2start, id2end = {}, {}
-    pos = 0
-    for tid, text in _token_seq(conn, text_id):
-        end = pos + len(text)
-        id2start[tid] = pos
-        id2end[tid] = end
-        pos = end
-    return id2start, id2end
+    text lengths (E5) over its anchor space (see ``anchor_index``)."""
+    return anchor_index(conn, text_id).syl_maps()
 
 
 def offsets_for_syls(conn, text_id, start_syl_id, end_syl_id):
@@ -35,7 +35,8 @@ both consumers can iterate once. Op kinds and how identity flows:
 - ``delete``  — gone → drop / retained empty slot.
 """
 
-from collections import defaultdict
+from bisect import bisect_left
+from collections import Counter, defaultdict
 from typing import NamedTuple
 
 from rapidfuzz.distance import Levenshtein
@@ -47,6 +48,59 @@ class Op(NamedTuple):
     new: int | None    # index into new sequence (None for delete)
 
 
+# A run of at least this many tokens is matched as a block before the per-syllable pass.
+_MOVE_RUN = 4
+# Candidate targets examined per run start (common k-grams have many; the first few
+# unclaimed ones are enough to find the block they belong to).
+_MOVE_CANDIDATES = 8
+
+
+def _match_runs(
+    del_old: list[int], ins_new: list[int], old: list[str], new: list[str]
+) -> tuple[set[int], dict[int, int]]:
+    """Pair residual deleted and inserted tokens as RUNS: maximal stretches, contiguous
+    on both sides, of identical text. A moved block moves as a whole, so matching it
+    run for run keeps each of its syllables paired with its own old self — where the
+    per-syllable pass would hand a common syllable (པ་) the id of a same-text syllable
+    from some other deleted block. Runs shorter than ``_MOVE_RUN`` are left to it.
+
+    Hashing: inserted positions are indexed by the ``_MOVE_RUN``-gram they start; the
+    deleted side is scanned once, each run start extended as far as it matches, and the
+    scan resumes after the run found. The runs are then accepted longest first."""
+    k = _MOVE_RUN
+    dels, inss = set(del_old), set(ins_new)
+    starts: dict[tuple, list[int]] = defaultdict(list)
+    for b in ins_new:
+        if all(b + t in inss for t in range(1, k)):
+            starts[tuple(new[b:b + k])].append(b)
+
+    runs: list[tuple[int, int, int]] = []      # (length, a, b)
+    skip_to = -1
+    for a in del_old:
+        if a < skip_to or not all(a + t in dels for t in range(1, k)):
+            continue
+        best = (0, 0)
+        for b in starts.get(tuple(old[a:a + k]), ())[:_MOVE_CANDIDATES]:
+            n = k
+            while a + n in dels and b + n in inss and old[a + n] == new[b + n]:
+                n += 1
+            if n > best[0]:
+                best = (n, b)
+        if best[0]:
+            runs.append((best[0], a, best[1]))
+            skip_to = a + best[0]
+
+    moved_old: set[int] = set()
+    tgt2src: dict[int, int] = {}
+    for n, a, b in sorted(runs, key=lambda r: (-r[0], r[1])):
+        if any(b + t in tgt2src for t in range(n)):
+            continue        # target already claimed by a longer run
+        for t in range(n):
+            moved_old.add(a + t)
+            tgt2src[b + t] = a + t
+    return moved_old, tgt2src
+
+
 def _match_moves(
     del_old: list[int], ins_new: list[int], old: list[str], new: list[str]
 ) -> tuple[set[int], dict[int, int]]:
@@ -55,17 +109,19 @@ def _match_moves(
     is the set of old indices that moved (their delete is suppressed) and
     ``target_to_source`` maps each new index that is a move target to its old index.
 
-    Duplicate identical texts are matched in ascending index order, which minimises
-    total positional displacement (the right one of two identical syllables wins)."""
+    Blocks are paired run for run first (``_match_runs``). The leftovers are matched
+    per text in ascending index order, which minimises total positional displacement
+    (the right one of two identical syllables wins)."""
+    moved_old, tgt2src = _match_runs(del_old, ins_new, old, new)
     by_text_old: dict[str, list[int]] = defaultdict(list)
     by_text_new: dict[str, list[int]] = defaultdict(list)
     for a in del_old:
-        by_text_old[old[a]].append(a)
+        if a not in moved_old:
+            by_text_old[old[a]].append(a)
     for b in ins_new:
-        by_text_new[new[b]].append(b)
+        if b not in tgt2src:
+            by_text_new[new[b]].append(b)
 
-    moved_old: set[int] = set()
-    tgt2src: dict[int, int] = {}
     for text, olds in by_text_old.items():
         news = by_text_new.get(text)
         if not news:
@@ -76,6 +132,122 @@ def _match_moves(
     return moved_old, tgt2src
 
 
+# Anchored windowing. A bake that corrects a few syllables of a 60k-syllable text used to
+# hand the whole sequence pair to ``Levenshtein.opcodes``, whose cost grows with the
+# product of the span between the first and last edit — seconds when the edits are far
+# apart. ``_opcodes`` trims the common prefix and suffix, then cuts the edited window at
+# anchors: runs of ``_ANCHOR_RUN`` tokens that occur exactly once on each side, kept in
+# a common increasing order (patience: the longest increasing subsequence). Single
+# syllables are almost never unique in a long text; a run of them almost always is. Each
+# piece between anchors is aligned on its own and the opcodes concatenated; the move
+# pass still runs once over the residuals of ALL pieces, so a block moved across pieces
+# keeps its ids exactly as before.
+_ANCHOR_RUN = 16
+_MIN_SEGMENTED = 512    # windows shorter than this are aligned whole
+
+
+def _common_affix(old: list[str], new: list[str]) -> tuple[int, int]:
+    """Lengths of the common prefix and (non-overlapping) common suffix. Compared a block
+    at a time (list slices compare in C), then token by token inside the first block
+    that differs."""
+    n = min(len(old), len(new))
+    step = 1024
+    p = 0
+    while p + step <= n and old[p:p + step] == new[p:p + step]:
+        p += step
+    while p < n and old[p] == new[p]:
+        p += 1
+    lo, ho = len(old), len(new)
+    s = 0
+    while s + step <= n - p and old[lo - s - step:lo - s] == new[ho - s - step:ho - s]:
+        s += step
+    while s < n - p and old[lo - 1 - s] == new[ho - 1 - s]:
+        s += 1
+    return p, s
+
+
+def _anchors(old: list[str], new: list[str], a0: int, a1: int, b0: int, b1: int):
+    """Anchor runs ``(i, j)`` with ``old[i:i+K] == new[j:j+K]`` in ``old[a0:a1]`` ×
+    ``new[b0:b1]``, increasing and non-overlapping on both sides. Candidates are the old
+    runs starting every K tokens (one per K is all the cutting needs) that occur once
+    anywhere in the old window — at every offset, not only among the samples: a verse
+    repeated off the sampling grid would otherwise pass as unique, and be paired with the
+    new side's copy of the OTHER occurrence — and once anywhere on the new side."""
+    k = _ANCHOR_RUN
+    at_new: dict[tuple, int] = {}
+    repeated: set[tuple] = set()
+    for j in range(b0, b1 - k + 1):
+        run = tuple(new[j:j + k])
+        if run in at_new:
+            repeated.add(run)
+        at_new[run] = j
+    on_old = Counter(tuple(old[i:i + k]) for i in range(a0, a1 - k + 1))
+    pairs = []
+    for i in range(a0, a1 - k + 1, k):
+        run = tuple(old[i:i + k])
+        if on_old[run] == 1 and run in at_new and run not in repeated:
+            pairs.append((i, at_new[run]))
+    # Longest increasing subsequence of the new positions (patience sorting).
+    tails: list[int] = []
+    tail_at: list[int] = []
+    back: list[int] = []
+    for n, (_i, j) in enumerate(pairs):
+        x = bisect_left(tails, j)
+        back.append(tail_at[x - 1] if x else -1)
+        if x == len(tails):
+            tails.append(j)
+            tail_at.append(n)
+        else:
+            tails[x] = j
+            tail_at[x] = n
+    chain = []
+    n = tail_at[-1] if tail_at else -1
+    while n >= 0:
+        chain.append(pairs[n])
+        n = back[n]
+    chain.reverse()
+    out: list[tuple[int, int]] = []
+    for i, j in chain:
+        if not out or j >= out[-1][1] + k:
+            out.append((i, j))
+    return out
+
+
+def _opcodes(old: list[str], new: list[str]) -> list[tuple]:
+    """``Levenshtein.opcodes(old, new)`` computed window by window (see above)."""
+    p, s = _common_affix(old, new)
+    a1, b1 = len(old) - s, len(new) - s
+    out: list[tuple] = []
+    _equal(out, 0, p, 0, p)
+    cuts = _anchors(old, new, p, a1, p, b1) if max(a1, b1) - p >= _MIN_SEGMENTED else []
+    a, b = p, p
+    k = _ANCHOR_RUN
+    for i, j in cuts + [(a1, b1)]:
+        if i - a == j - b and old[a:i] == new[b:j]:
+            _equal(out, a, i, b, j)
+        else:
+            for tag, x1, x2, y1, y2 in Levenshtein.opcodes(old[a:i], new[b:j]).as_list():
+                if tag == "equal":
+                    _equal(out, a + x1, a + x2, b + y1, b + y2)
+                else:
+                    out.append((tag, a + x1, a + x2, b + y1, b + y2))
+        if (i, j) != (a1, b1):
+            _equal(out, i, i + k, j, j + k)
+        a, b = i + k, j + k
+    _equal(out, a1, len(old), b1, len(new))
+    return out
+
+
+def _equal(out: list, a1: int, a2: int, b1: int, b2: int) -> None:
+    """Append an ``equal`` opcode, extending the previous one when contiguous."""
+    if a1 == a2:
+        return
+    if out and out[-1][0] == "equal" and out[-1][2] == a1 and out[-1][4] == b1:
+        out[-1] = ("equal", out[-1][1], a2, out[-1][3], b2)
+    else:
+        out.append(("equal", a1, a2, b1, b2))
+
+
 def align_tokens(old: list[str], new: list[str], *, detect_moves: bool) -> list[Op]:
     """Align two token-text sequences into ordered identity-carrying ops.
 
@@ -83,7 +255,7 @@ def align_tokens(old: list[str], new: list[str], *, detect_moves: bool) -> list[
     carried by content) instead of delete+insert. With ``detect_moves=False`` the
     result is the classic ``equal/replace/insert/delete`` (used as a test/comparison
     baseline)."""
-    opcodes = Levenshtein.opcodes(old, new).as_list()  # equal/replace/insert/delete
+    opcodes = _opcodes(old, new)  # equal/replace/insert/delete
 
     moved_old: set[int] = set()
     tgt2src: dict[int, int] = {}
@@ -0,0 +1,195 @@
+"""Columnar token sequences for composition and anchoring.
+
+A composed stream of a long compilation is 100k tokens; as a list of dicts that is 100k
+dicts of up to twelve keys each, rebuilt for every ancestor on every compose. A
+``TokenStream`` keeps the same sequence as parallel lists — one per field, ``nature`` and
+``source`` interned — with offsets as a prefix-sum array computed on first use. It is
+what ``derivation`` composes with, what ``stream_cache`` holds and what
+``syllable_anchors`` derives its offset maps from (kept on the stream as ``anchors``, so
+they live exactly as long as the cached stream does).
+
+Dicts exist only at the API boundary: ``dicts()`` builds (once per stream, then shares)
+exactly the dicts ``load_syllables`` / ``compose_secondary`` always returned, key for key.
+"""
+import sys
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+# What a token is, which decides the keys of its dict view.
+PRIMARY = 0       # a primary's own syllable row
+LINK = 1          # composed: an unchanged parent token
+HOSTED = 2        # composed: a syllable hosted by an override/insert op
+TRANSCLUDED = 3   # composed: a token linked in by a transclude op
+
+_intern = sys.intern
+
+
+class TokenStream:
+    __slots__ = ("ids", "texts", "natures", "kinds", "idxs", "sources", "op_ids",
+                 "parent_syl_ids", "originals", "src_text_ids", "_ends", "_index", "_dicts",
+                 "_joined", "anchors")
+
+    def __init__(self):
+        self.ids: list[str] = []
+        self.texts: list[str] = []
+        self.natures: list[str] = []
+        self.kinds = array("b")
+        self.idxs: list[int] = []           # 1-based position
+        self.sources: list = []
+        self.op_ids: list = []
+        self.parent_syl_ids: list = []
+        self.originals: list = []
+        self.src_text_ids: list = []
+        self._ends = None
+        self._index = None
+        self._dicts = None
+        self._joined = None
+        self.anchors = None                 # syllable_anchors.AnchorIndex, built on first use
+
+    @classmethod
+    def from_rows(cls, rows) -> "TokenStream":
+        """A primary's syllable rows ``(id, idx, text, nature)``, in idx order."""
+        s = cls()
+        for r in rows:
+            s.ids.append(r["id"])
+            s.idxs.append(len(s.ids))       # the position; stored idx is a gapped key
+            s.texts.append(r["text"])
+            s.natures.append(_intern(r["nature"]))
+        s.kinds = array("b", bytes(len(s.ids)))
+        n = len(s.ids)
+        s.sources = s.op_ids = s.parent_syl_ids = s.originals = s.src_text_ids = [None] * n
+        return s
+
+    # ── building a composed stream ───────────────────────────────────────────────
+    def _add(self, kind, syl_id, text, nature, source, op_id, parent_syl_id, original,
+             src_text_id) -> None:
+        self.ids.append(syl_id)
+        self.texts.append(text)
+        self.natures.append(_intern(nature))
+        self.kinds.append(kind)
+        self.idxs.append(len(self.ids))
+        self.sources.append(source)
+        self.op_ids.append(op_id)
+        self.parent_syl_ids.append(parent_syl_id)
+        self.originals.append(original)
+        self.src_text_ids.append(src_text_id)
+
+    def add_link(self, syl_id, text, nature) -> None:
+        self._add(LINK, syl_id, text, nature, "parent-link", None, None, None, None)
+
+    def add_hosted(self, syl_id, text, nature, source, op_id, parent_syl_id=None,
+                   original=None) -> None:
+        self._add(HOSTED, syl_id, text, nature, source, op_id, parent_syl_id, original, None)
+
+    def add_transcluded(self, syl_id, text, nature, op_id, src_text_id) -> None:
+        self._add(TRANSCLUDED, syl_id, text, nature, "transclusion", op_id, None, None,
+                  src_text_id)
+
+    # ── reading ──────────────────────────────────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def ends(self) -> array:
+        """Cumulative end offset of every token (the start of token i is ``ends[i-1]``)."""
+        if self._ends is None:
+            ends = array("q", bytes(8 * len(self.texts)))
+            pos = 0
+            for i, t in enumerate(self.texts):
+                pos += len(t)
+                ends[i] = pos
+            self._ends = ends
+        return self._ends
+
+    def starts(self) -> array:
+        ends = self.ends
+        out = array("q", bytes(8 * len(ends)))
+        if len(ends) > 1:
+            out[1:] = ends[:-1]
+        return out
+
+    def index(self) -> dict:
+        """syl_id → position. A uuid repeated (the same source transcluded twice) maps to
+        its LAST occurrence, as ``{s["id"]: i for i, s in enumerate(...)}`` always did."""
+        if self._index is None:
+            self._index = {sid: i for i, sid in enumerate(self.ids)}
+        return self._index
+
+    def span_between(self, start_syl_id, end_syl_id):
+        """``(i, j)`` positions of an inclusive run, or None when either end is absent or
+        the run is reversed (``manifest.syllable_ids_between`` semantics)."""
+        pos = self.index()
+        i, j = pos.get(start_syl_id), pos.get(end_syl_id)
+        if i is None or j is None or i > j:
+            return None
+        return i, j
+
+    def index_of(self, syl_id):
+        """Position of ``syl_id`` (its last occurrence), or None."""
+        return self.index().get(syl_id)
+
+    def ids_between(self, start_syl_id, end_syl_id) -> list[str]:
+        """``manifest.syllable_ids_between`` over this stream: ids of the inclusive run,
+        or [] when either end is absent or the run is reversed."""
+        span = self.span_between(start_syl_id, end_syl_id)
+        return self.ids[span[0]:span[1] + 1] if span else []
+
+    def text_between(self, start_syl_id, end_syl_id) -> str:
+        """The concatenated text of the inclusive run ('' when it does not resolve)."""
+        span = self.span_between(start_syl_id, end_syl_id)
+        return self.text_of(*span) if span else ""
+
+    def joined(self) -> str:
+        """The whole stream's text, built once."""
+        if self._joined is None:
+            self._joined = "".join(self.texts)
+        return self._joined
+
+    def text_of(self, i: int, j: int) -> str:
+        """Text of the inclusive position run ``[i, j]``: one slice of ``joined()`` between
+        two prefix sums, not a join of its tokens."""
+        ends = self.ends
+        return self.joined()[ends[i - 1] if i else 0:ends[j]]
+
+    def member_counts(self, index) -> array:
+        """``out[k]`` = how many of the first ``k`` tokens have their id in ``index`` (another
+        stream's ``index()``): the prefix sum of a membership bitmap over this stream's
+        positions, so whether the run ``[i, j]`` shares a token with that stream is
+        ``out[j + 1] > out[i]`` — O(1) per run after one pass."""
+        out = array("q", [0])
+        out.extend(accumulate(map(index.__contains__, self.ids)))
+        return out
+
+    def containing(self, offset: int):
+        """Position of the token whose ``[start, end)`` covers char ``offset``, or None."""
+        i = bisect_right(self.ends, offset)
+        return i if 0 <= offset and i < len(self.ends) else None
+
+    def dict_at(self, i: int, start: int, end: int) -> dict:
+        kind = self.kinds[i]
+        if kind == PRIMARY:
+            return {"id": self.ids[i], "idx": self.idxs[i], "text": self.texts[i],
+                    "nature": self.natures[i], "start_offset": start, "end_offset": end}
+        d = {"id": self.ids[i], "text": self.texts[i], "nature": self.natures[i],
+             "source": self.sources[i]}
+        if kind == HOSTED:
+            d["parent_syl_id"] = self.parent_syl_ids[i]
+            d["original"] = self.originals[i]
+            d["op_id"] = self.op_ids[i]
+        elif kind == TRANSCLUDED:
+            d["src_text_id"] = self.src_text_ids[i]
+            d["op_id"] = self.op_ids[i]
+        d["idx"] = i + 1
+        d["inserted"] = False
+        d["start_offset"] = start
+        d["end_offset"] = end
+        return d
+
+    def dicts(self) -> list[dict]:
+        """The API-boundary view, built once and SHARED — callers must not mutate it."""
+        if self._dicts is None:
+            ends = self.ends
+            self._dicts = [self.dict_at(i, ends[i - 1] if i else 0, ends[i])
+                           for i in range(len(self.ids))]
+        return self._dicts
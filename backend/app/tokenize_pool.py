@@ -0,0 +1,113 @@
+"""A warm process pool for the botok tiling of uploaded texts.
+
+Tiling a text (``normalize_upload`` + ``manifest.tile_text``) is pure CPU: a
+``ChunkTokenizer`` per line, seconds for a long text. Run inline in an ``async``
+handler it froze every other request on the uvicorn worker. Handlers instead await
+``prepare_async``, which runs it in a process pool created on first use and kept for
+the life of the app: each worker imports botok and tiles a sample line once at start
+(the initializer), so no request pays for that. Workers are started by a forkserver,
+never forked from the server itself: the pool is made lazily, inside a process already
+running threads (the threadpool, the bake worker), and a fork copies whatever lock one
+of them held at that instant into a child that will never release it.
+
+Configuration (environment, read on use — tests and dev flip it without reloads):
+- ``SAPCHE_TOKENIZE_WORKERS`` — pool size (default: CPU count, at most 4), checked on
+  every call; the size is fixed when the pool is made. ``0`` runs the tiling on a
+  thread instead — still off the event loop, no extra processes.
+- ``SAPCHE_TOKENIZE_CONCURRENCY`` — tilings in flight at once across requests (default:
+  the pool size, or 1), read when an event loop first tiles; the rest wait their turn
+  without blocking the loop.
+"""
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from .manifest import tile_line, tile_text
+from .tokenizer import normalize_upload
+
+_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+# One semaphore per event loop: an asyncio.Semaphore is bound to the loop it first
+# waits on (each TestClient runs its own loop).
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def workers() -> int:
+    return _env_int("SAPCHE_TOKENIZE_WORKERS", min(os.cpu_count() or 1, 4))
+
+
+def prepare_text(source_text: str):
+    """``(raw_text, tiles)`` for one uploaded text, or ``(None, error)``. Top-level so it
+    pickles; a failure is returned, not raised, so one bad file does not end a
+    ``map`` over a corpus."""
+    try:
+        raw_text = normalize_upload(source_text)
+        return raw_text, tile_text(raw_text)
+    except Exception as exc:  # noqa: BLE001
+        return None, str(exc)
+
+
+def _warm() -> None:
+    tile_line("བཀྲ་ཤིས་བདེ་ལེགས། །")
+
+
+def process_pool(max_workers: int, **kwargs) -> ProcessPoolExecutor:
+    """A process pool whose workers do not inherit this process's threads' state
+    (forkserver where the platform has it, else spawn)."""
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               mp_context=multiprocessing.get_context(method), **kwargs)
+
+
+def executor() -> Optional[ProcessPoolExecutor]:
+    """The shared pool, made (and warmed) on first call; None when configured off."""
+    global _pool
+    if workers() == 0:
+        return None
+    with _lock:
+        if _pool is None:
+            _pool = process_pool(workers(), initializer=_warm)
+        return _pool
+
+
+def shutdown() -> None:
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+atexit.register(shutdown)
+
+
+async def prepare_async(source_text: str) -> tuple[str, list[tuple[str, str]]]:
+    """``prepare_text`` off the event loop, at most ``SAPCHE_TOKENIZE_CONCURRENCY`` at a
+    time. Raises ValueError when the text cannot be tiled."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(
+            _env_int("SAPCHE_TOKENIZE_CONCURRENCY", workers()) or 1)
+    async with semaphore:
+        pool = executor()
+        if pool is None:
+            raw_text, tiles = await asyncio.to_thread(prepare_text, source_text)
+        else:
+            raw_text, tiles = await loop.run_in_executor(pool, prepare_text, source_text)
+    if raw_text is None:
+        raise ValueError(tiles)
+    return raw_text, tiles
@@ -0,0 +1,92 @@
+"""Micro-benchmark: offset-map lookups on a long primary and on a secondary over it.
+
+Times what one ``list_markers``-style request asks for — ``_syl_offset_maps`` then
+``_occurrence_offsets`` — and ten single-row ``offsets_for_syls`` calls, against the
+previous per-call derivation (re-read the syllables, walk the whole sequence into fresh
+dicts), kept here as the baseline. The anchor index is built on the first request and
+reused by the rest while the stream's generation stands.
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_anchor_index.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import db as _dbmod  # noqa: E402
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+_dbmod.DB_PATH = _tmp.name
+
+from app import syllable_anchors as sa  # noqa: E402
+from app.db import get_db, init_db  # noqa: E402
+from app.derivation import composed_stream  # noqa: E402
+from app.manifest import load_stream, persist_syllables  # noqa: E402
+
+LINE = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ། བྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།"
+LINES = 2000
+REQUESTS = 20
+
+
+def legacy_stream(conn, text_id):
+    row = conn.execute("SELECT text_type FROM texts WHERE id = ?", (text_id,)).fetchone()
+    if row["text_type"] == "secondary":
+        return composed_stream(conn, text_id)
+    return load_stream(conn, text_id)
+
+
+def legacy_syl_maps(conn, text_id):
+    s = legacy_stream(conn, text_id)
+    return dict(zip(s.ids, s.starts())), dict(zip(s.ids, s.ends))
+
+
+def legacy_occurrence(conn, text_id):
+    out, pos = {}, 0
+    s = legacy_stream(conn, text_id)
+    for tid, text, op in zip(s.ids, s.texts, s.op_ids):
+        out.setdefault((tid, op or 0), pos)
+        pos += len(text)
+    return out
+
+
+def request(conn, text_id, ids, syl_maps, occurrence):
+    syl_maps(conn, text_id)
+    occurrence(conn, text_id)
+    for sid in ids:
+        id2start, id2end = syl_maps(conn, text_id)
+        assert id2start[sid] < id2end[sid]
+
+
+def main():
+    init_db()
+    conn = get_db()
+    raw = "\n".join(f"{LINE}ཀ{i}་" for i in range(LINES))
+    primary = conn.execute(
+        "INSERT INTO texts (filename, title, source_text, raw_text) VALUES ('b.txt', 'b', '', ?)",
+        (raw,)).lastrowid
+    persist_syllables(conn, primary, "bench", raw)
+    secondary = conn.execute(
+        "INSERT INTO texts (filename, title, source_text, raw_text, text_type, parent_text_id) "
+        "VALUES ('b.txt', 's', '', '', 'secondary', ?)", (primary,)).lastrowid
+    conn.commit()
+    ids = load_stream(conn, primary).ids[::len(raw) // 40][:10]
+    for label, tid in (("primary", primary), ("secondary", secondary)):
+        timings = []
+        for syl_maps, occurrence in ((legacy_syl_maps, legacy_occurrence),
+                                     (sa._syl_offset_maps, sa._occurrence_offsets)):
+            t0 = time.perf_counter()
+            for _ in range(REQUESTS):
+                request(conn, tid, ids, syl_maps, occurrence)
+            timings.append((time.perf_counter() - t0) / REQUESTS)
+        print(f"{len(load_stream(conn, primary)):>6} syllables, {label:<9} per request: "
+              f"per-call derive {timings[0] * 1000:7.1f} ms   anchor index "
+              f"{timings[1] * 1000:6.2f} ms")
+    conn.close()
+    os.unlink(_tmp.name)
+
+
+if __name__ == "__main__":
+    main()
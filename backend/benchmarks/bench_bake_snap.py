@@ -0,0 +1,239 @@
+"""Micro-benchmark: `routers.texts._snap_refs_after_bake` after a bake that deletes 10k
+syllables referenced by thousands of annotations.
+
+Compares the previous implementation (``IN (?,…)`` lists of every deleted id and one
+UPDATE per affected row), kept verbatim as the baseline, with the temp snap-map table and
+one ``UPDATE … FROM`` per table. Both run on the same state inside a savepoint and must
+leave every reference table the same (see ``compare``).
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_bake_snap.py
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import db as _dbmod  # noqa: E402
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import get_db, init_db  # noqa: E402
+from app.manifest import load_syllables, persist_syllables  # noqa: E402
+from app.routers.texts import _snap_refs_after_bake  # noqa: E402
+
+LINE = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ། བྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།"
+LINES = 2000                   # ~46k syllables
+DELETED_LINES = (600, 1035)    # ~10k syllables
+PER_TABLE = 2000
+TABLES = ("spans", "notes", "translation_chunks", "phonetics", "markers",
+          "display_breaks", "tree_nodes", "passages")
+
+
+def legacy_snap(conn, text_id, old_ordered_ids):
+    """The pre-temp-table ``_snap_refs_after_bake``."""
+    new_ordered = [s["id"] for s in load_syllables(conn, text_id)]
+    new_ids = set(new_ordered)
+    new_pos = {sid: i for i, sid in enumerate(new_ordered)}
+    deleted = [sid for sid in old_ordered_ids if sid not in new_ids]
+    if not deleted:
+        return
+    # For each old position: the nearest surviving id at-or-after / at-or-before it.
+    n = len(old_ordered_ids)
+    nxt: list = [None] * n
+    prv: list = [None] * n
+    run = None
+    for i in range(n - 1, -1, -1):
+        if old_ordered_ids[i] in new_ids:
+            run = old_ordered_ids[i]
+        nxt[i] = run
+    run = None
+    for i in range(n):
+        if old_ordered_ids[i] in new_ids:
+            run = old_ordered_ids[i]
+        prv[i] = run
+    pos = {sid: i for i, sid in enumerate(old_ordered_ids)}
+    dead = set(deleted)
+
+    def snap_fwd(sid):  # None = nothing survives at-or-after sid
+        return nxt[pos[sid]]
+
+    def snap_back(sid):
+        return prv[pos[sid]]
+
+    def q(ids):
+        return ",".join("?" * len(ids))
+
+    # Ranges: (table, start_col, end_col, extra WHERE). Includes the translation
+    # layer (T1–T3) so translations/phonetics/moves anchored on deleted syllables
+    # snap with everything else rather than silently orphaning.
+    for table, s_col, e_col, extra in (
+        ("derivation_ops", "src_start_syl_id", "src_end_syl_id", "op_kind = 'transclude'"),
+        ("passage_members", "src_start_syl_id", "src_end_syl_id", "1=1"),
+        ("spans", "start_syl_id", "end_syl_id", "1=1"),
+        ("notes", "start_syl_id", "end_syl_id", "1=1"),
+        ("suggestions", "start_syl_id", "end_syl_id", "1=1"),
+        ("translation_chunks", "start_syl_id", "end_syl_id", "1=1"),
+        ("phonetics", "start_syl_id", "end_syl_id", "1=1"),
+        ("chunk_layouts", "src_start_syl_id", "src_end_syl_id", "kind = 'move'"),
+    ):
+        rows = conn.execute(
+            f"SELECT rowid AS rid, {s_col} AS s, {e_col} AS e FROM {table} "
+            f"WHERE {extra} AND ({s_col} IN ({q(deleted)}) OR {e_col} IN ({q(deleted)}))",
+            (*deleted, *deleted),
+        ).fetchall()
+        for r in rows:
+            new_s = snap_fwd(r["s"]) if r["s"] in dead else r["s"]
+            new_e = snap_back(r["e"]) if r["e"] in dead else r["e"]
+            # Leave untouched when nothing survives inside the range (start/end
+            # crossed or vanished) — the row stays dangling and is skipped on read.
+            if new_s is None or new_e is None:
+                continue
+            # Reversed in the NEW order (a snapped pair can invert even when the
+            # old order was consistent) — leave dangling, skipped on read.
+            if new_s in new_pos and new_e in new_pos and new_pos[new_s] > new_pos[new_e]:
+                continue
+            try:
+                conn.execute(
+                    f"UPDATE {table} SET {s_col} = ?, {e_col} = ? WHERE rowid = ?",
+                    (new_s, new_e, r["rid"]),
+                )
+            except sqlite3.IntegrityError:
+                # UNIQUE collision (translation_chunks/phonetics share
+                # (origin, start, end[, kind])) — leave the row dangling rather
+                # than merge two distinct anchors into one.
+                pass
+
+    # "Before this syllable" anchors: forward, else NULL (= end of text).
+    for table, col in (("derivation_ops", "anchor_syl_id"), ("passages", "anchor_syl_id"),
+                       ("chunk_layouts", "anchor_syl_id")):
+        rows = conn.execute(
+            f"SELECT rowid AS rid, {col} AS a FROM {table} WHERE {col} IN ({q(deleted)})",
+            deleted,
+        ).fetchall()
+        for r in rows:
+            conn.execute(f"UPDATE {table} SET {col} = ? WHERE rowid = ?",
+                         (snap_fwd(r["a"]), r["rid"]))
+
+    # Markers: a segment boundary whose anchor syllable was deleted is DELETED, not
+    # snapped forward — the segmentation there was rewritten, so a boundary wandering
+    # to the next survivor would silently mis-split this text and its descendants
+    # (the copied-marker-on-a-child bug). Same for display breaks: a break has no
+    # home once its syllable is gone.
+    conn.execute(f"DELETE FROM markers WHERE syl_id IN ({q(deleted)})", deleted)
+    conn.execute(f"DELETE FROM display_breaks WHERE syl_id IN ({q(deleted)})", deleted)
+
+    # Reading positions: forward, else backward.
+    for r in conn.execute(
+            f"SELECT rowid AS rid, syl_id AS a FROM reading_positions "
+            f"WHERE syl_id IN ({q(deleted)})", deleted).fetchall():
+        tgt = snap_fwd(r["a"]) or snap_back(r["a"])
+        if tgt is not None:
+            conn.execute("UPDATE reading_positions SET syl_id = ? WHERE rowid = ?",
+                         (tgt, r["rid"]))
+
+    # Tree segment links: forward; if nothing follows, leave dangling (existing
+    # tree behavior for unresolvable links).
+    for r in conn.execute(
+            f"SELECT rowid AS rid, segment_start_syl_id AS a FROM tree_nodes "
+            f"WHERE segment_start_syl_id IN ({q(deleted)})", deleted).fetchall():
+        tgt = snap_fwd(r["a"])
+        if tgt is not None:
+            conn.execute("UPDATE tree_nodes SET segment_start_syl_id = ? WHERE rowid = ?",
+                         (tgt, r["rid"]))
+
+
+def seed(conn):
+    """A primary, then PER_TABLE references per table, half of them touching the lines
+    the bake deletes. Returns (text_id, the old id order, the edited raw text)."""
+    lines = [f"{LINE}ཀ{i}་" for i in range(LINES)]
+    raw = "\n".join(lines)
+    tid = conn.execute(
+        "INSERT INTO texts (filename, title, source_text, raw_text) VALUES ('b.txt', 'b', '', ?)",
+        (raw,)).lastrowid
+    persist_syllables(conn, tid, f"bench_{tid}", raw)
+    ids = [s["id"] for s in load_syllables(conn, tid)]
+    rng = random.Random(0)
+    lo = len(ids) * DELETED_LINES[0] // LINES
+    hi = len(ids) * DELETED_LINES[1] // LINES
+
+    def pick():
+        return rng.randrange(lo - 50, hi + 50) if rng.random() < 0.5 else rng.randrange(len(ids))
+
+    def ranges():
+        for _ in range(PER_TABLE):
+            a = pick()
+            yield ids[a], ids[min(a + rng.randrange(1, 200), len(ids) - 1)]
+
+    tag = conn.execute("INSERT INTO tags (text_id, name) VALUES (?, 'bench')", (tid,)).lastrowid
+    conn.executemany("INSERT INTO spans (text_id, tag_id, start_syl_id, end_syl_id) "
+                     "VALUES (?, ?, ?, ?)", [(tid, tag, s, e) for s, e in ranges()])
+    conn.executemany("INSERT INTO notes (text_id, start_syl_id, end_syl_id) VALUES (?, ?, ?)",
+                     [(tid, s, e) for s, e in ranges()])
+    conn.executemany("INSERT OR IGNORE INTO translation_chunks (origin_text_id, start_syl_id, "
+                     "end_syl_id) VALUES (?, ?, ?)", [(tid, s, e) for s, e in ranges()])
+    conn.executemany("INSERT OR IGNORE INTO phonetics (origin_text_id, start_syl_id, "
+                     "end_syl_id, kind) VALUES (?, ?, ?, 'bo')", [(tid, s, e) for s, e in ranges()])
+    conn.executemany("INSERT OR IGNORE INTO markers (text_id, syl_id) VALUES (?, ?)",
+                     [(tid, s) for s, _e in ranges()])
+    conn.executemany("INSERT OR IGNORE INTO display_breaks (text_id, syl_id, count) "
+                     "VALUES (?, ?, 1)", [(tid, s) for s, _e in ranges()])
+    conn.executemany("INSERT INTO tree_nodes (text_id, position, segment_start_syl_id) "
+                     "VALUES (?, ?, ?)", [(tid, i, s) for i, (s, _e) in enumerate(ranges())])
+    conn.executemany("INSERT INTO passages (text_id, anchor_syl_id) VALUES (?, ?)",
+                     [(tid, s) for s, _e in ranges()])
+    conn.commit()
+    edited = "\n".join(lines[:DELETED_LINES[0]] + lines[DELETED_LINES[1]:])
+    return tid, ids, edited
+
+
+def dump(conn):
+    return {t: [tuple(r) for r in conn.execute(f"SELECT * FROM {t} ORDER BY rowid")]
+            for t in TABLES}
+
+
+def compare(before, a, b):
+    """Rows where the two results differ. Where two rows would snap onto the same UNIQUE
+    anchor, one of them stays dangling and which one depends on the order rows are
+    visited, so a difference where either side is the untouched row is not counted."""
+    bad = 0
+    for t in TABLES:
+        for orig, x, y in zip(before[t], a[t], b[t]):
+            if x != y and orig not in (x, y):
+                bad += 1
+    return bad
+
+
+def main():
+    init_db()
+    conn = get_db()
+    tid, old_ids, edited = seed(conn)
+    persist_syllables(conn, tid, f"bench_{tid}", edited)
+    deleted = len(old_ids) - len(load_syllables(conn, tid))
+    before = dump(conn)
+    refs = sum(len(rows) for rows in before.values())
+    results = {}
+    for label, snap in (("per-row", legacy_snap), ("snap table", _snap_refs_after_bake)):
+        conn.execute("SAVEPOINT bench")
+        t0 = time.perf_counter()
+        snap(conn, tid, old_ids)
+        elapsed = time.perf_counter() - t0
+        results[label] = dump(conn)
+        conn.execute("ROLLBACK TO bench")
+        conn.execute("RELEASE bench")
+        print(f"{deleted} syllables deleted, {refs} references, {label:<10} "
+              f"{elapsed * 1000:7.1f} ms")
+    bad = compare(before, results["per-row"], results["snap table"])
+    print(f"differential: {bad} rows differ")
+    conn.close()
+    os.unlink(_tmp.name)
+    sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Micro-benchmark: listing the translation chunks of a long text.
+
+A 100k-syllable primary carrying 10k chunks — 9k line-sized ones and 1k section-sized
+ones spanning a few thousand syllables each — read on the primary and on a secondary
+deriving it (where every chunk is its origin's, so each must be checked against the
+reading stream). Times ``list_text_translations`` as it now runs (one membership prefix
+sum per origin, then two positions, an O(1) applicability test and one string slice per
+chunk) against the previous per-chunk resolution, kept here as the baseline: the run's
+id list materialized, scanned against the stream's ids, and its tokens joined — both the
+whole endpoint (where building the response models weighs most) and the per-chunk
+resolution alone. Checks identical output.
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_chunk_resolution.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import db as _dbmod  # noqa: E402
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import get_db, init_db  # noqa: E402
+from app.derivation import base_stream  # noqa: E402
+from app.inherit import source_texts  # noqa: E402
+from app.manifest import load_syllables, persist_syllables  # noqa: E402
+from app.routers.translations import (  # noqa: E402
+    ChunkOut, TranslationOut, list_text_translations,
+)
+from app.routers.texts import derive_secondary_text  # noqa: E402
+
+LINE = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ། བྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།"
+LINES = 5000
+LINE_CHUNKS, SECTION_CHUNKS = 9000, 1000
+
+
+def legacy_list_text_translations(conn, text_id):
+    """The previous ``list_text_translations`` body: per chunk, its id list scanned against
+    the stream's ids and its tokens joined."""
+    compose_cache: dict = {}
+    stream_ids = base_stream(conn, text_id, cache=compose_cache).index()
+    out = []
+    for origin in [text_id] + source_texts(conn.cursor(), text_id):
+        rows = conn.execute("SELECT * FROM translation_chunks WHERE origin_text_id = ?",
+                            (origin,)).fetchall()
+        if not rows:
+            continue
+        toks = base_stream(conn, origin, cache=compose_cache)
+        trans_by_chunk: dict = {}
+        chunk_ids = [ch["id"] for ch in rows]
+        for t in conn.execute(
+                f"SELECT * FROM translations WHERE chunk_id IN ({','.join('?' * len(chunk_ids))})",
+                chunk_ids).fetchall():
+            trans_by_chunk.setdefault(t["chunk_id"], []).append(t)
+        pos = toks.index()
+        for ch in rows:
+            i, j = pos.get(ch["start_syl_id"]), pos.get(ch["end_syl_id"])
+            ids = toks.ids[i:j + 1] if i is not None and j is not None and i <= j else []
+            if not ids or not any(x in stream_ids for x in ids):
+                continue
+            out.append(ChunkOut(
+                id=ch["id"], origin_text_id=origin,
+                start_syl_id=ch["start_syl_id"], end_syl_id=ch["end_syl_id"],
+                kind=ch["kind"], level=ch["level"], render_as=ch["render_as"],
+                text="".join(toks.texts[i:j + 1]),
+                translations=[TranslationOut(
+                    lang=t["lang"], body=t["body"], status=t["status"],
+                    translated_from=t["translated_from"], updated_at=str(t["updated_at"]))
+                    for t in trans_by_chunk.get(ch["id"], [])],
+            ))
+    return out
+
+
+def resolution_only(conn, text_id, legacy):
+    """Just the per-chunk work — applicability and text — over every origin's chunks, the
+    old way (id list, scan, join) or the new (prefix sums, two positions, one slice)."""
+    compose_cache: dict = {}
+    stream_ids = base_stream(conn, text_id, cache=compose_cache).index()
+    out = []
+    for origin in [text_id] + source_texts(conn.cursor(), text_id):
+        rows = conn.execute("SELECT start_syl_id, end_syl_id FROM translation_chunks "
+                            "WHERE origin_text_id = ?", (origin,)).fetchall()
+        toks = base_stream(conn, origin, cache=compose_cache)
+        if legacy:
+            for a, b in rows:
+                ids = toks.ids_between(a, b)
+                if ids and any(x in stream_ids for x in ids):
+                    span = toks.span_between(a, b)
+                    out.append("".join(toks.texts[span[0]:span[1] + 1]))
+            continue
+        hits = None if origin == text_id else toks.member_counts(stream_ids)
+        for a, b in rows:
+            span = toks.span_between(a, b)
+            if span is None or (hits is not None and hits[span[1] + 1] == hits[span[0]]):
+                continue
+            out.append(toks.text_of(*span))
+    return out
+
+
+def seed():
+    raw = "\n".join(f"{LINE}ཀ{i}་" for i in range(LINES))
+    rng = random.Random(5)
+    conn = get_db()
+    try:
+        p = conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text, text_type) "
+            "VALUES ('b.txt', 'b', '', ?, 'primary')", (raw,)).lastrowid
+        persist_syllables(conn, p, "bench_chunks", raw)
+        ids = [s["id"] for s in load_syllables(conn, p)]
+        step = len(ids) // LINE_CHUNKS
+        spans = [(k * step, k * step + step - 1, "text") for k in range(LINE_CHUNKS)]
+        for _ in range(SECTION_CHUNKS):
+            a = rng.randrange(len(ids) - 5000)
+            spans.append((a, a + rng.randint(1000, 5000), "title"))
+        for a, b, kind in spans:
+            chunk = conn.execute(
+                "INSERT INTO translation_chunks (origin_text_id, start_syl_id, end_syl_id, "
+                "kind) VALUES (?, ?, ?, ?)", (p, ids[a], ids[b], kind)).lastrowid
+            conn.execute("INSERT INTO translations (chunk_id, lang, body) VALUES (?, 'en', 'x')",
+                         (chunk,))
+        conn.commit()
+        return p, len(ids)
+    finally:
+        conn.close()
+
+
+def timed(fn, rounds=5):
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    init_db()
+    p, n = seed()
+    sec = derive_secondary_text(p, {})["id"]
+    for label, tid in (("primary", p), ("secondary", sec)):
+        list_text_translations(tid)                         # warm the stream cache
+        conn = get_db()
+        try:
+            t_old, old = timed(lambda: legacy_list_text_translations(conn, tid))
+        finally:
+            conn.close()
+        t_new, new = timed(lambda: list_text_translations(tid))
+        assert new == old
+        print(f"{n} syllables, {len(new)} chunks on the {label:<9} endpoint    "
+              f"per-chunk ids {t_old * 1000:7.1f} ms   prefix sums {t_new * 1000:7.1f} ms")
+        conn = get_db()
+        try:
+            r_old, old = timed(lambda: resolution_only(conn, tid, legacy=True))
+            r_new, new = timed(lambda: resolution_only(conn, tid, legacy=False))
+        finally:
+            conn.close()
+        assert new == old
+        print(f"{'':>{len(str(n)) + 11}}{len(new)} chunks on the {label:<9} resolution  "
+              f"per-chunk ids {r_old * 1000:7.1f} ms   prefix sums {r_new * 1000:7.1f} ms")
+    os.unlink(_tmp.name)
+
+
+if __name__ == "__main__":
+    main()
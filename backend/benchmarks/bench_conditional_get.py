@@ -0,0 +1,87 @@
+"""Micro-benchmark: re-fetching unchanged annotation lists with their ETags.
+
+A long primary and a secondary deriving it, carrying a few thousand spans, markers and
+notes. Times each list endpoint over HTTP (TestClient, gzip on) as a client reopening
+the text pays for it: a plain GET (full composition and serialization, the only path
+before) against a revalidation with the ETag it got back (stamp + 304), and reports the
+bytes each ships.
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_conditional_get.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("SAPCHE_AUTH_DISABLED", "1")
+
+from app import db as _dbmod  # noqa: E402
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+_dbmod.DB_PATH = _tmp.name
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.db import get_db, init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.manifest import load_syllables, persist_syllables  # noqa: E402
+
+LINE = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ། བྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།"
+LINES = 1000
+READS = ("spans", "markers", "notes")
+ROUNDS = 5
+
+
+def seed(client):
+    raw = "\n".join(f"{LINE}ཀ{i}་" for i in range(LINES))
+    conn = get_db()
+    try:
+        p = conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text, text_type) "
+            "VALUES ('b.txt', 'b', '', ?, 'primary')", (raw,)).lastrowid
+        persist_syllables(conn, p, "bench_cond", raw)
+        syls = load_syllables(conn, p)
+        tag = conn.execute("INSERT INTO tags (text_id, name) VALUES (?, 't')", (p,)).lastrowid
+        for i in range(0, len(syls) - 3, 6):
+            a, b = syls[i]["id"], syls[i + 2]["id"]
+            conn.execute("INSERT INTO spans (text_id, tag_id, start_syl_id, end_syl_id) "
+                         "VALUES (?, ?, ?, ?)", (p, tag, a, b))
+            conn.execute("INSERT INTO markers (text_id, syl_id) VALUES (?, ?)", (p, a))
+            conn.execute("INSERT INTO notes (text_id, body, start_syl_id, end_syl_id) "
+                         "VALUES (?, 'n', ?, ?)", (p, a, b))
+        conn.commit()
+    finally:
+        conn.close()
+    sec = client.post(f"/api/texts/{p}/derive", json={}).json()["id"]
+    return p, sec
+
+
+def timed(client, url, headers=None):
+    best, r = float("inf"), None
+    for _ in range(ROUNDS):
+        t0 = time.perf_counter()
+        r = client.get(url, headers={"Accept-Encoding": "gzip", **(headers or {})})
+        best = min(best, time.perf_counter() - t0)
+    return best, r
+
+
+def main():
+    init_db()
+    client = TestClient(app)
+    for label, tid in zip(("primary", "secondary"), seed(client)):
+        for read in READS:
+            url = f"/api/texts/{tid}/{read}"
+            full, r = timed(client, url)
+            size = int(r.headers.get("content-length") or len(r.content))
+            cond, r304 = timed(client, url, {"If-None-Match": r.headers["etag"]})
+            assert r304.status_code == 304
+            print(f"{label:<9} {read:<8} {len(r.json()):>5} rows  GET {full * 1000:7.1f} ms "
+                  f"({size / 1024:6.1f} KiB)   If-None-Match {cond * 1000:6.1f} ms (304)")
+    os.unlink(_tmp.name)
+
+
+if __name__ == "__main__":
+    main()
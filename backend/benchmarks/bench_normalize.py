@@ -0,0 +1,81 @@
+"""Micro-benchmark: upload pre-processing (`normalize_spaces` + `fold_punct_newlines`)
+on multi-megabyte texts.
+
+Compares the per-character implementations (a ``unicodedata.category`` call per char; a
+``list(text)`` with a neighbour rescan per newline), kept verbatim as the baseline, with
+the fold-table regex and the newline-run regex, checking identical output.
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_normalize.py
+"""
+import os
+import random
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.tokenizer import _CLUSTER_PUNCT, _TSEK_FOLD, fold_punct_newlines, normalize_spaces  # noqa: E402
+
+SIZES_MB = (1, 4)
+
+
+def legacy_normalize_spaces(text):
+    return "".join(
+        " " if (unicodedata.category(c) == "Zs" and c != " ")
+        else _TSEK_FOLD.get(c, c)
+        for c in text
+    )
+
+
+def legacy_fold_punct_newlines(text):
+    chars = list(text)
+    n = len(chars)
+    for i, c in enumerate(chars):
+        if c != "\n":
+            continue
+        j = i - 1
+        while j >= 0 and chars[j] in (" ", "\t", "\n"):
+            j -= 1
+        k = i + 1
+        while k < n and chars[k] in (" ", "\t", "\n"):
+            k += 1
+        if 0 <= j and k < n and chars[j] in _CLUSTER_PUNCT and chars[k] in _CLUSTER_PUNCT:
+            chars[i] = " "
+    return "".join(chars)
+
+
+def corpus(mb: int, seed: int = 0) -> str:
+    """A pecha-like text: syllables, shad clusters split across lines, stray NBSPs."""
+    rng = random.Random(seed)
+    pieces = ["སངས་", "རྒྱས་", "ཆོས་", "དང་", "ཚོགས་", "ཀྱི་", "མཆོག་", "རྣམས་", "ལ",
+              "།\n།", "། །\n", "\n", " ", "༌", "༄༅། །"]
+    out, size = [], 0
+    while size < mb * 1_000_000:
+        p = rng.choice(pieces)
+        out.append(p)
+        size += len(p)
+    return "".join(out)
+
+
+def timed(fn, text):
+    t0 = time.perf_counter()
+    out = fn(text)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    for mb in SIZES_MB:
+        text = corpus(mb)
+        old_s, t_old_s = timed(legacy_normalize_spaces, text)
+        new_s, t_new_s = timed(normalize_spaces, text)
+        old_f, t_old_f = timed(legacy_fold_punct_newlines, old_s)
+        new_f, t_new_f = timed(fold_punct_newlines, new_s)
+        assert new_s == old_s and new_f == old_f and len(new_f) == len(text)
+        print(f"{len(text) / 1e6:.1f}M chars  normalize_spaces {t_old_s * 1000:7.1f} → "
+              f"{t_new_s * 1000:6.1f} ms   fold_punct_newlines {t_old_f * 1000:7.1f} → "
+              f"{t_new_f * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Micro-benchmark: listing the passages of a long text.
+
+``list_passages`` resolves every passage's member runs over the text's token sequence.
+Times it as it now runs (every member row in one query, positional slices of the shared
+stream) against the previous listing, kept here as the baseline: per passage, one
+member query and the dict view plus an ``id -> token`` and an ``id -> position`` dict
+rebuilt over the whole stream — twice, once more in ``_passage_out``.
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_passage_members.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import db as _dbmod  # noqa: E402
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import get_db, init_db  # noqa: E402
+from app.derivation import base_tokens  # noqa: E402
+from app.manifest import load_stream, persist_syllables, syllable_ids_between  # noqa: E402
+from app.inherit import source_texts  # noqa: E402
+from app.routers import passages  # noqa: E402
+
+LINE = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ། བྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།"
+LINES = 2000
+PASSAGES = 200
+
+
+def legacy_resolve_members(conn, text_id, passage_id, cache=None):
+    syls = base_tokens(conn, text_id, cache=cache)
+    by_id = {s["id"]: s for s in syls}
+    syl_pos = {s["id"]: i for i, s in enumerate(syls)}
+    out = []
+    for m in conn.execute(
+            "SELECT position, src_start_syl_id, src_end_syl_id FROM passage_members "
+            "WHERE passage_id = ? ORDER BY position", (passage_id,)).fetchall():
+        ids = syllable_ids_between(syls, m["src_start_syl_id"], m["src_end_syl_id"], pos=syl_pos)
+        out.append({
+            "position": m["position"],
+            "src_start_syl_id": m["src_start_syl_id"],
+            "src_end_syl_id": m["src_end_syl_id"],
+            "syllables": [{"syl_id": sid, "idx": by_id[sid]["idx"], "text": by_id[sid]["text"],
+                           "nature": by_id[sid]["nature"]} for sid in ids if sid in by_id],
+        })
+    return out
+
+
+def legacy_passage_rows(conn, text_id):
+    stream = {t["id"] for t in base_tokens(conn, text_id)}
+    out = []
+    for origin in [text_id] + source_texts(conn.cursor(), text_id):
+        for r in conn.execute("SELECT * FROM passages WHERE text_id = ? ORDER BY position, id",
+                              (origin,)).fetchall():
+            if r["anchor_syl_id"] is not None and r["anchor_syl_id"] not in stream:
+                continue
+            members = legacy_resolve_members(conn, text_id, r["id"])
+            if not members or any(not m["syllables"] for m in members):
+                continue
+            d = passages._passage_out(conn, r, stream_text_id=text_id, inherited=False,
+                                      members=legacy_resolve_members(conn, text_id, r["id"]))
+            d["members"] = members
+            out.append(d)
+    return out
+
+
+def timed(fn, conn, text_id):
+    t0 = time.perf_counter()
+    rows = fn(conn, text_id)
+    return time.perf_counter() - t0, rows
+
+
+def main():
+    init_db()
+    conn = get_db()
+    raw = "\n".join(f"{LINE}ཀ{i}་" for i in range(LINES))
+    tid = conn.execute(
+        "INSERT INTO texts (filename, title, source_text, raw_text) VALUES ('b.txt', 'b', '', ?)",
+        (raw,)).lastrowid
+    persist_syllables(conn, tid, "bench", raw)
+    ids = load_stream(conn, tid).ids
+    step = len(ids) // PASSAGES
+    for p in range(PASSAGES):
+        a = p * step
+        pid = conn.execute(
+            "INSERT INTO passages (text_id, anchor_syl_id, position) VALUES (?, ?, ?)",
+            (tid, ids[-1], p)).lastrowid
+        conn.executemany(
+            "INSERT INTO passage_members (passage_id, position, src_start_syl_id, "
+            "src_end_syl_id) VALUES (?, ?, ?, ?)",
+            [(pid, 0, ids[a], ids[a + 5]), (pid, 1, ids[a + 10], ids[a + 20])])
+    conn.commit()
+    passages._passage_rows(conn, tid)                      # warm the stream cache
+    t_old, old = timed(legacy_passage_rows, conn, tid)
+    t_new, new = timed(passages._passage_rows, conn, tid)
+    assert old == new
+    print(f"{len(ids):>6} syllables, {PASSAGES} passages: per-passage resolution "
+          f"{t_old * 1000:8.1f} ms   batched {t_new * 1000:7.1f} ms")
+    conn.close()
+    os.unlink(_tmp.name)
+
+
+if __name__ == "__main__":
+    main()
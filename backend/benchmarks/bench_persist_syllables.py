@@ -0,0 +1,74 @@
+"""Micro-benchmark: re-persisting a long text's syllable layer after a small edit.
+
+Times ``manifest.persist_syllables`` (delta write: only changed rows) against the previous
+delete-all-and-reinsert, kept here as the baseline, on a scratch WAL database, and reports
+the WAL bytes each commit appends — the pages rewritten while the write lock is held.
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_persist_syllables.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import db as _dbmod  # noqa: E402
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import get_db, init_db  # noqa: E402
+from app.id_reconcile import assign_stable_ids  # noqa: E402
+from app.manifest import IDX_GAP, generate_syllables, persist_syllables  # noqa: E402
+
+LINE = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ། བྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།"
+LINES = (500, 2000)
+
+
+def legacy_persist(conn, text_id, instance_id, raw_text):
+    """The pre-delta ``persist_syllables``: delete every row, reinsert every row."""
+    syllables = generate_syllables(raw_text, instance_id)
+    existing = [{"id": r["id"], "text": r["text"]} for r in conn.execute(
+        "SELECT id, text FROM syllables WHERE text_id = ? ORDER BY idx", (text_id,))]
+    assign_stable_ids(existing, syllables)
+    conn.execute("DELETE FROM syllables WHERE text_id = ?", (text_id,))
+    conn.executemany(
+        "INSERT INTO syllables (id, text_id, idx, text, nature) VALUES (?, ?, ?, ?, ?)",
+        [(s["id"], text_id, s["idx"] * IDX_GAP, s["text"], s["nature"]) for s in syllables])
+
+
+def timed_commit(conn, persist, text_id, raw):
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    t0 = time.perf_counter()
+    persist(conn, text_id, f"bench_{text_id}", raw)
+    conn.commit()
+    elapsed = time.perf_counter() - t0
+    return elapsed, os.path.getsize(_tmp.name + "-wal")
+
+
+def main():
+    init_db()
+    conn = get_db()
+    for n in LINES:
+        raw = "\n".join(f"{LINE}ཀ{i}་" for i in range(n))
+        cut = raw.index("\n", len(raw) // 2) + 1
+        edited = raw[:cut] + "ཁ་ག་" + raw[cut:]
+        for label, persist in (("delete+reinsert", legacy_persist), ("delta", persist_syllables)):
+            tid = conn.execute(
+                "INSERT INTO texts (filename, title, source_text, raw_text) "
+                "VALUES ('b.txt', 'b', '', ?)", (raw,)).lastrowid
+            persist_syllables(conn, tid, f"bench_{tid}", raw)
+            conn.commit()
+            elapsed, wal = timed_commit(conn, persist, tid, edited)
+            syls = conn.execute("SELECT COUNT(*) FROM syllables WHERE text_id = ?",
+                                (tid,)).fetchone()[0]
+            print(f"{syls:>6} syllables, one-line insert, {label:<16} "
+                  f"{elapsed * 1000:7.1f} ms, WAL {wal / 1024:8.1f} KiB")
+    conn.close()
+    os.unlink(_tmp.name)
+
+
+if __name__ == "__main__":
+    main()
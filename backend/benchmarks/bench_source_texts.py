@@ -0,0 +1,106 @@
+"""Micro-benchmark: `inherit.source_texts` over a 200-text derivation graph.
+
+Compares the old per-node walk (two queries per visited text) with the recursive-CTE
+walk, cold (cache just invalidated) and warm (closure cached for the graph generation),
+counting the SQL statements each issues.
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_source_texts.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+from app import db as _dbmod  # noqa: E402
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import init_db, get_db  # noqa: E402
+from app import inherit  # noqa: E402
+
+N_TEXTS = 200
+ROUNDS = 20
+
+
+def legacy_source_texts(cursor, text_id, _seen=None):
+    """The pre-CTE implementation, kept verbatim as the baseline."""
+    _seen = set() if _seen is None else _seen
+    if text_id in _seen:
+        return []
+    _seen.add(text_id)
+    out = []
+    row = cursor.execute(
+        "SELECT parent_text_id FROM texts WHERE id = ?", (text_id,)).fetchone()
+    if row and row["parent_text_id"] and row["parent_text_id"] not in _seen:
+        out.append(row["parent_text_id"])
+        out.extend(legacy_source_texts(cursor, row["parent_text_id"], _seen))
+    for r in cursor.execute(
+            "SELECT DISTINCT src_text_id FROM derivation_ops "
+            "WHERE text_id = ? AND op_kind = 'transclude' AND src_text_id IS NOT NULL "
+            "ORDER BY src_text_id", (text_id,)).fetchall():
+        src = r["src_text_id"]
+        if src not in _seen:
+            out.append(src)
+            out.extend(legacy_source_texts(cursor, src, _seen))
+    return out
+
+
+def build_graph(conn) -> list[int]:
+    """20 primaries, 180 secondaries each deriving from an earlier text and transcluding
+    up to three earlier ones — a deep, heavily shared graph."""
+    rng = random.Random(7)
+    ids: list[int] = []
+    for i in range(N_TEXTS):
+        parent = rng.choice(ids) if i >= 20 else None
+        cur = conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text, text_type, parent_text_id) "
+            "VALUES ('b.txt', ?, '', '', ?, ?)",
+            (f"T{i}", "secondary" if parent else "primary", parent))
+        tid = cur.lastrowid
+        if parent:
+            for src in rng.sample(ids, min(3, len(ids))):
+                conn.execute(
+                    "INSERT INTO derivation_ops (text_id, op_kind, src_text_id) "
+                    "VALUES (?, 'transclude', ?)", (tid, src))
+        ids.append(tid)
+    conn.commit()
+    return ids
+
+
+def run(label, fn, conn, ids, before_each=None):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        for tid in ids:
+            if before_each:
+                before_each()
+            fn(conn.cursor(), tid)
+    elapsed = time.perf_counter() - t0
+    conn.set_trace_callback(None)
+    calls = ROUNDS * len(ids)
+    print(f"{label:<28} {len(statements) / calls:8.1f} queries/call "
+          f"{elapsed / calls * 1e6:10.1f} µs/call")
+
+
+def main():
+    init_db()
+    conn = get_db()
+    ids = build_graph(conn)
+    for tid in ids:
+        assert inherit.source_texts(conn.cursor(), tid) == legacy_source_texts(conn.cursor(), tid)
+    print(f"{N_TEXTS} texts, {ROUNDS} rounds over every text")
+    run("per-node walk (before)", legacy_source_texts, conn, ids)
+    run("recursive CTE, cold cache", inherit.source_texts, conn, ids,
+        before_each=inherit._closures.clear)
+    run("recursive CTE, warm cache", inherit.source_texts, conn, ids)
+    conn.close()
+    os.unlink(_tmp.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Micro-benchmark: syllable ids stored as text vs as 16-byte blobs.
+
+``SYL_ID_STORAGE = 'blob'`` (app/db.py) keeps every canonical uuid as its 16 bytes
+instead of the 36-char string. This builds the same 200k-syllable corpus (20 texts, real
+tiling and uuid5 ids) through the app's own ``get_db``/``persist_syllables`` in each mode,
+with one marker per line anchored on a syllable, and reports the vacuumed file, the pages
+of the syllables table and its two indexes (``dbstat``), the time to persist the corpus,
+to read one text back (``load_syllables``: the blob row factory decodes every id) and to
+probe ``idx_syllables_sylid`` with 500-id ``IN`` lists, the shape of the bake's snap.
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_syl_id_storage.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import db  # noqa: E402
+from app.manifest import _tile_line_cached, load_syllables, persist_syllables  # noqa: E402
+
+LINE = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ། བྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།"
+TEXTS, LINES = 20, 435
+NAMES = ("syllables", "sqlite_autoindex_syllables_1", "idx_syllables_sylid", "markers")
+
+
+def build(path, storage, texts=TEXTS):
+    db.DB_PATH, db.SYL_ID_STORAGE = path, storage
+    db.init_db()
+    conn = db.get_db()
+    _tile_line_cached.cache_clear()          # both modes tile the corpus cold
+    t0 = time.perf_counter()
+    with conn:
+        for t in range(1, texts + 1):
+            raw = "\n".join(f"{LINE}ཀ{t}་{i}་" for i in range(LINES))
+            tid = conn.execute(
+                "INSERT INTO texts (filename, title, source_text, raw_text) "
+                "VALUES ('b.txt', 'b', '', ?)", (raw,)).lastrowid
+            persist_syllables(conn, tid, f"bench_ids_{t}", raw)
+            conn.executemany(
+                "INSERT INTO markers (text_id, syl_id) VALUES (?, ?)",
+                [(tid, s["id"]) for s in load_syllables(conn, tid)[::25]])
+    persist = time.perf_counter() - t0
+    conn.execute("VACUUM")
+    pages = dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))
+    t0 = time.perf_counter()
+    ids = [s["id"] for s in load_syllables(conn, 1)]
+    read = time.perf_counter() - t0
+    batches = [random.Random(i).sample(ids, 500) for i in range(50)]
+    t0 = time.perf_counter()
+    for b in batches:
+        conn.execute("SELECT id, idx FROM syllables INDEXED BY idx_syllables_sylid "
+                     f"WHERE id IN ({','.join('?' * len(b))})", b).fetchall()
+    probe = time.perf_counter() - t0
+    n = conn.execute("SELECT COUNT(*) FROM syllables").fetchone()[0]
+    conn.close()
+    return n, os.path.getsize(path), pages, persist, read, probe
+
+
+def main():
+    with tempfile.TemporaryDirectory() as d:
+        build(os.path.join(d, "warm.db"), "text", texts=2)   # one-time setup, off the clock
+        n, size_t, pages_t, persist_t, read_t, probe_t = build(os.path.join(d, "t.db"), "text")
+        _, size_b, pages_b, persist_b, read_b, probe_b = build(os.path.join(d, "b.db"), "blob")
+    mib = 1024 * 1024
+    print(f"{n} syllables in {TEXTS} texts")
+    print(f"  vacuumed file                 text {size_t / mib:7.1f} MiB   "
+          f"blob {size_b / mib:7.1f} MiB   ({(size_t - size_b) / size_t:.0%} smaller)")
+    for name in NAMES:
+        print(f"  {name:<30} {pages_t.get(name, 0) / mib:7.1f} MiB -> "
+              f"{pages_b.get(name, 0) / mib:7.1f} MiB")
+    print(f"  persisting the corpus         {persist_t * 1000:7.0f} ms -> {persist_b * 1000:7.0f} ms")
+    print(f"  load_syllables (one text)     {read_t * 1000:7.1f} ms -> {read_b * 1000:7.1f} ms")
+    print(f"  50 x IN (500 ids) probes      {probe_t * 1000:7.1f} ms -> {probe_b * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Micro-benchmark: what the two dropped ``syllables`` indexes cost.
+
+``_drop_redundant_syllable_indexes`` (app/db.py) drops ``idx_syllables_text(text_id)`` —
+a prefix of the primary key's own index — and ``idx_syllables_offsets(text_id,
+start_offset)``, which nothing searched. This builds the same 200k-syllable corpus (20
+texts, real tiling and uuid5 ids, their raw texts alongside) into the table as it stood
+before the drop — offset columns included, the migration ran ahead of their own drop —
+with and without the two indexes, and reports the vacuumed file, each index's pages
+(``dbstat``), the time to insert the corpus, and the plans of the per-text statements
+the primary key now has to serve alone.
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_syllable_indexes.py
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.manifest import generate_syllables  # noqa: E402
+
+LINE = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ། བྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།"
+TEXTS, LINES = 20, 435
+
+# The table as it stood when the indexes were dropped (the pre-drop DDL, verbatim), and
+# the two indexes the migration drops.
+LEGACY = """
+CREATE TABLE texts (id INTEGER PRIMARY KEY, raw_text TEXT NOT NULL);
+CREATE TABLE syllables (
+    id           TEXT NOT NULL,
+    text_id  INTEGER NOT NULL REFERENCES texts(id) ON DELETE CASCADE,
+    idx          INTEGER NOT NULL,
+    start_offset INTEGER NOT NULL,
+    end_offset   INTEGER NOT NULL,
+    text         TEXT NOT NULL,
+    nature       TEXT NOT NULL,
+    PRIMARY KEY (text_id, idx)
+);
+CREATE INDEX idx_syllables_sylid    ON syllables(id);
+"""
+DROPPED = """
+CREATE INDEX idx_syllables_text ON syllables(text_id);
+CREATE INDEX idx_syllables_offsets  ON syllables(text_id, start_offset);
+"""
+PER_TEXT = (
+    "SELECT id, text, nature FROM syllables WHERE text_id = ? ORDER BY idx",
+    "SELECT COUNT(*) FROM syllables WHERE text_id = ?",
+    "DELETE FROM syllables WHERE text_id = ?",
+)
+
+
+def corpus():
+    out = []
+    for t in range(1, TEXTS + 1):
+        raw = "\n".join(f"{LINE}ཀ{t}་{i}་" for i in range(LINES))
+        out.append((t, raw, generate_syllables(raw, f"bench_idx_{t}")))
+    return out
+
+
+def build(path, with_dropped, texts):
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY + (DROPPED if with_dropped else ""))
+    t0 = time.perf_counter()
+    with conn:
+        for tid, raw, syls in texts:
+            conn.execute("INSERT INTO texts (id, raw_text) VALUES (?, ?)", (tid, raw))
+            conn.executemany(
+                "INSERT INTO syllables VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(s["id"], tid, s["idx"], s["start_offset"], s["end_offset"], s["text"],
+                  s["nature"]) for s in syls])
+    took = time.perf_counter() - t0
+    conn.execute("VACUUM")
+    pages = dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))
+    plans = [" / ".join(r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + q, (1,)))
+             for q in PER_TEXT]
+    conn.close()
+    return os.path.getsize(path), pages, took, plans
+
+
+def main():
+    texts = corpus()
+    n = sum(len(s) for _t, _r, s in texts)
+    with tempfile.TemporaryDirectory() as d:
+        size_b, pages_b, took_b, _ = build(os.path.join(d, "before.db"), True, texts)
+        size_a, pages_a, took_a, plans = build(os.path.join(d, "after.db"), False, texts)
+    mib = 1024 * 1024
+    print(f"{n} syllables in {TEXTS} texts")
+    print(f"  vacuumed file    with the two indexes {size_b / mib:7.1f} MiB   "
+          f"without {size_a / mib:7.1f} MiB   ({(size_b - size_a) / size_b:.0%} smaller)")
+    for name in ("syllables", "sqlite_autoindex_syllables_1", "idx_syllables_sylid",
+                 "idx_syllables_text", "idx_syllables_offsets"):
+        print(f"  {name:<30} {pages_b.get(name, 0) / mib:7.1f} MiB -> "
+              f"{pages_a.get(name, 0) / mib:7.1f} MiB")
+    print(f"  inserting the corpus                  {took_b * 1000:7.0f} ms   "
+          f"without {took_a * 1000:7.0f} ms")
+    for q, plan in zip(PER_TEXT, plans):
+        print(f"  {q.split(' FROM')[0][:28]:<28} -> {plan}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Differential check + benchmark of the regex fast-path line tiler (manifest._FAST_LINE).
+
+Every line of the corpus that the fast path accepts is tiled both ways and must come out
+chunk-for-chunk identical to botok's (``manifest._tile_line``); any difference is printed
+and the script exits 1. Then both tilers are timed (uncached) on the whole corpus, in
+syllables/sec.
+
+The corpus is the ``raw_text`` of every text in a database (default: the app's
+sapche.db) and/or ``.txt`` files and directories given on the command line; with
+neither, a seeded synthetic corpus of well-formed and malformed lines is used.
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_tile_line.py [--db sapche.db] [corpus/ …]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import db as _dbmod  # noqa: E402
+from app import manifest  # noqa: E402
+from app.tokenizer import normalize_upload  # noqa: E402
+
+SYNTHETIC_LINES = 3000
+
+
+def synthetic_corpus(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    cons, sub, vow = manifest._FAST_CONS, manifest._FAST_SUB, manifest._FAST_VOW
+    well_formed = ["་", "་", "་", "་ ", "", "། ", "།", "།། །།"]
+    malformed = [" །", "་་", "༄༅། ", "ཾ", "༡ ", " "]
+    lines = []
+    for _ in range(n):
+        # Mostly well-formed lines, as in real texts, with a malformed share.
+        ends = well_formed + malformed if rng.random() < 0.3 else well_formed
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            syl = rng.choice(cons) + "".join(rng.choice(cons + sub + vow)
+                                             for _ in range(rng.randint(0, 3)))
+            parts.append(syl + rng.choice(ends))
+        lines.append("".join(parts))
+    return lines
+
+
+def load_corpus(db_path, paths) -> list[str]:
+    texts = []
+    if db_path and os.path.exists(db_path):
+        conn = sqlite3.connect(db_path)
+        texts += [r[0] for r in conn.execute(
+            "SELECT raw_text FROM texts WHERE text_type = 'primary' AND raw_text != ''")]
+        conn.close()
+    for p in map(Path, paths):
+        files = sorted(p.rglob("*.txt")) if p.is_dir() else [p]
+        texts += [normalize_upload(f.read_text(encoding="utf-8")) for f in files]
+    return [line for t in texts for line in t.split("\n")]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("paths", nargs="*", help=".txt files or directories")
+    ap.add_argument("--db", default=_dbmod.DB_PATH, help="database to read raw_text from")
+    args = ap.parse_args()
+    warnings.simplefilter("ignore")     # botok warns on non-expanded chars
+
+    lines = load_corpus(args.db, args.paths)
+    source = "corpus"
+    if not lines:
+        lines, source = synthetic_corpus(SYNTHETIC_LINES), "synthetic corpus"
+    fast = [line for line in lines if manifest._FAST_LINE.fullmatch(line)]
+    print(f"{source}: {len(lines)} lines, {len(fast)} on the fast path "
+          f"({100 * len(fast) / max(len(lines), 1):.1f}%)")
+
+    mismatches = 0
+    for line in fast:
+        got, want = manifest._tile_line_fast(line), manifest._tile_line(line)
+        if got != want:
+            mismatches += 1
+            if mismatches <= 20:
+                print(f"MISMATCH {line!r}\n  fast:  {got}\n  botok: {want}")
+    print(f"differential: {mismatches} mismatches")
+
+    def rate(tiler, sample):
+        t0 = time.perf_counter()
+        n = sum(len(tiler(line)) for line in sample)
+        return n, n / (time.perf_counter() - t0)
+
+    def dispatch(line):
+        if manifest._FAST_LINE.fullmatch(line):
+            return manifest._tile_line_fast(line)
+        return manifest._tile_line(line)
+
+    manifest._tile_line(lines[0])     # import botok outside the timings
+    n, botok_rate = rate(manifest._tile_line, lines)
+    _n, fast_rate = rate(dispatch, lines)
+    print(f"{n} syllables: botok {botok_rate:,.0f}/s, with fast path {fast_rate:,.0f}/s "
+          f"({fast_rate / botok_rate:.1f}x)")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
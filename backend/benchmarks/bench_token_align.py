@@ -0,0 +1,125 @@
+"""Micro-benchmark: `id_reconcile.assign_stable_ids` for small edits to long texts.
+
+Times the previous implementation (whole-sequence ``Levenshtein.opcodes``) against the
+windowed one (affix pre-pass + ``token_align._opcodes``' unique-run anchors) on texts
+of growing length, for one local edit and for three edits spread across the text, and
+reports how many ids each mints (that must not grow). Then a 30k-syllable block move
+beside a deleted block: the per-syllable move pairing against the run-based one, in
+time and in ids taken from the deleted block.
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_token_align.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from rapidfuzz.distance import Levenshtein  # noqa: E402
+
+from app import token_align  # noqa: E402
+from app.id_reconcile import assign_stable_ids  # noqa: E402
+
+LENGTHS = (10_000, 30_000, 60_000)
+
+
+def text(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    vocab = ["པ་", "བ་", "ཀ་", "སངས་", "རྒྱས་", "ཆོས་", "དང་", "།"] + \
+        [f"s{i}་" for i in range(3000)]
+    return [rng.choice(vocab) for _ in range(n)]
+
+
+def local_edit(old):
+    new = old[:]
+    mid = len(new) // 2
+    new[mid] = "X"
+    new.insert(mid + 5, "Y")
+    del new[mid + 12]
+    return new
+
+
+def spread_edits(old):
+    new = old[:]
+    new[100] = "X"
+    new.insert(len(new) // 2, "Y")
+    del new[len(new) - 1000]
+    return new
+
+
+def legacy_assign(existing, fresh, mint):
+    """The pre-windowing ``assign_stable_ids``: whole-sequence opcodes, no affix trim."""
+    saved = token_align._opcodes
+    token_align._opcodes = lambda o, n: Levenshtein.opcodes(o, n).as_list()
+    try:
+        old_texts = [e["text"] for e in existing]
+        new_texts = [f["text"] for f in fresh]
+        for op in token_align.align_tokens(old_texts, new_texts, detect_moves=True):
+            if op.kind in ("equal", "move", "replace"):
+                fresh[op.new]["id"] = existing[op.old]["id"]
+            elif op.kind == "insert":
+                fresh[op.new]["id"] = mint()
+    finally:
+        token_align._opcodes = saved
+    return fresh
+
+
+def run(old, new, assign):
+    existing = [{"id": f"o{i}", "text": t} for i, t in enumerate(old)]
+    fresh = [{"id": None, "text": t} for t in new]
+    t0 = time.perf_counter()
+    assign(existing, fresh, mint=lambda: "MINT")
+    elapsed = time.perf_counter() - t0
+    return elapsed, sum(f["id"] == "MINT" for f in fresh)
+
+
+def per_syllable_moves(del_old, ins_new, old, new):
+    """The pre-run ``_match_moves``: same-text residuals zipped in ascending order."""
+    by_old, by_new = {}, {}
+    for a in del_old:
+        by_old.setdefault(old[a], []).append(a)
+    for b in ins_new:
+        by_new.setdefault(new[b], []).append(b)
+    moved, tgt2src = set(), {}
+    for t, olds in by_old.items():
+        for a, b in zip(olds, by_new.get(t, ())):
+            moved.add(a)
+            tgt2src[b] = a
+    return moved, tgt2src
+
+
+def block_move():
+    old = text(60_000, seed=5)
+    # Delete A = [5000, 6000); move B = [20000, 50000) to the end.
+    new = old[:5000] + old[6000:20000] + old[50000:] + old[20000:50000]
+    for label, matcher in (("per-syllable", per_syllable_moves),
+                           ("runs", token_align._match_moves)):
+        saved = token_align._match_moves
+        token_align._match_moves = matcher
+        try:
+            existing = [{"id": i, "text": t} for i, t in enumerate(old)]
+            fresh = [{"id": None, "text": t} for t in new]
+            t0 = time.perf_counter()
+            assign_stable_ids(existing, fresh, mint=lambda: -1)
+            elapsed = time.perf_counter() - t0
+        finally:
+            token_align._match_moves = saved
+        stolen = sum(5000 <= f["id"] < 6000 for f in fresh)
+        print(f"30k block move + 1k delete, {label:<12} {elapsed * 1000:7.1f} ms, "
+              f"{stolen} ids taken from the deleted block")
+
+
+def main():
+    block_move()
+    for n in LENGTHS:
+        old = text(n)
+        for label, new in (("local edit", local_edit(old)), ("spread edits", spread_edits(old))):
+            t_base, m_base = run(old, new, legacy_assign)
+            t_new, m_new = run(old, new, assign_stable_ids)
+            print(f"{n:>6} syllables, {label:<12}  whole {t_base * 1000:8.1f} ms "
+                  f"({m_base} minted)   windowed {t_new * 1000:7.1f} ms ({m_new} minted)")
+
+
+if __name__ == "__main__":
+    main()
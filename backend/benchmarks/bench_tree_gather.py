@@ -0,0 +1,182 @@
+"""Micro-benchmark: reading the outline of a text at the end of a derivation chain.
+
+A primary and five secondaries, each deriving from the one before, every text adding its
+own sections and subsections — 5k nodes in all, gathered and ordered at the last text.
+Times ``_tree_node_rows`` as it now runs (per-text indexed queries carrying display slots,
+passages checked only when a node links one, a bisection per own node on mixed levels)
+against the previous gather and splice, kept here as the baseline: the whole display-slot
+table read, the full passage listing resolved, a set copy of the stream, and a scan of
+the level per own node. Checks identical output.
+
+Run:  cd backend && .venv/bin/python benchmarks/bench_tree_gather.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import db as _dbmod  # noqa: E402
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import get_db, init_db  # noqa: E402
+from app.inherit import source_texts  # noqa: E402
+from app.manifest import load_stream, persist_syllables  # noqa: E402
+from app.routers import tree_nodes  # noqa: E402
+from app.routers.passages import _passage_rows  # noqa: E402
+from app.syllable_anchors import _syl_offset_maps  # noqa: E402
+
+LINE = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ། བྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།"
+LINES = 500
+CHAIN = 6
+SECTIONS, SUBSECTIONS = 93, 8          # per text: up to 93 + 93 * 8 nodes, ~5k in all
+
+
+def legacy_gathered_tree_rows(conn, text_id):
+    cursor = conn.cursor()
+    id2start, _ = _syl_offset_maps(conn, text_id)
+    stream = set(id2start)
+    live_passage_ids = {p["id"] for p in cursor.execute(
+        "SELECT id FROM passages WHERE text_id = ?", (text_id,)).fetchall()}
+    try:
+        live_passage_ids |= {p["id"] for p in _passage_rows(conn, text_id)}
+    except Exception:
+        pass
+    gathered = {}
+    display_slots = {r["node_id"]: r["before_node_id"] for r in cursor.execute(
+        "SELECT node_id, before_node_id FROM tree_node_display_slots").fetchall()}
+    for origin in [text_id] + source_texts(cursor, text_id):
+        inherited = origin != text_id
+        for r in cursor.execute("SELECT * FROM tree_nodes WHERE text_id = ?", (origin,)).fetchall():
+            if r["id"] in gathered:
+                continue
+            d = tree_nodes._row_to_node(r, id2start)
+            d["text_id"] = text_id
+            d["inherited"] = inherited
+            d["display_before_node_id"] = display_slots.get(r["id"])
+            gathered[r["id"]] = d
+
+    def anchored_ok(d):
+        if d.get("segment_start_syl_id") is not None:
+            return d["segment_start_syl_id"] in stream
+        if d.get("passage_id") is not None:
+            return d["passage_id"] in live_passage_ids
+        return False
+
+    children_of = {}
+    for nid, d in gathered.items():
+        children_of.setdefault(d["parent_id"], []).append(nid)
+    keep = {}
+
+    def applies(nid):
+        if nid in keep:
+            return keep[nid]
+        keep[nid] = False
+        d = gathered[nid]
+        free_form = d.get("segment_start_syl_id") is None and d.get("passage_id") is None
+        kids = children_of.get(nid, [])
+        ok = (not d["inherited"]) or anchored_ok(d) or any(applies(c) for c in kids) \
+            or (free_form and not kids)
+        keep[nid] = ok
+        return ok
+
+    for nid in gathered:
+        applies(nid)
+    return [d for nid, d in gathered.items() if keep[nid]]
+
+
+def legacy_order_level(nodes, own_text_id):
+    if len({n.get("owner_text_id") for n in nodes}) <= 1:
+        return sorted(nodes, key=lambda n: n["position"])
+    base = sorted((n for n in nodes if n.get("owner_text_id") != own_text_id),
+                  key=lambda n: n["position"])
+    own = sorted((n for n in nodes if n.get("owner_text_id") == own_text_id),
+                 key=lambda n: n["position"])
+    out, offsets, last = list(base), [], None
+    for n in base:
+        if n.get("segment_start") is not None:
+            last = n["segment_start"]
+        offsets.append(last)
+    after = len(out)
+    for n in own:
+        o = n.get("segment_start")
+        before_id = n.get("display_before_node_id")
+        if before_id is not None and any(x["id"] == before_id for x in out):
+            idx = next(i for i, x in enumerate(out) if x["id"] == before_id)
+        elif o is None:
+            idx = after
+        else:
+            idx = 0
+            for i, bo in enumerate(offsets):
+                if bo is not None and bo <= o:
+                    idx = i + 1
+        out.insert(idx, n)
+        offsets.insert(idx, o if o is not None else (offsets[idx - 1] if idx else None))
+        after = idx + 1
+    return out
+
+
+def build(conn):
+    rng = random.Random(1)
+    raw = "\n".join(f"{LINE}ཀ{i}་" for i in range(LINES))
+    tid = conn.execute(
+        "INSERT INTO texts (filename, title, source_text, raw_text) VALUES ('b.txt', 'b', '', ?)",
+        (raw,)).lastrowid
+    persist_syllables(conn, tid, "bench", raw)
+    ids = load_stream(conn, tid).ids
+    chain = [tid]
+    for _ in range(CHAIN - 1):
+        chain.append(conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text, text_type, "
+            "parent_text_id) VALUES ('b.txt', 's', '', '', 'secondary', ?)",
+            (chain[-1],)).lastrowid)
+    span = len(ids) // SECTIONS
+    for t in chain:
+        for k in range(SECTIONS):
+            a = k * span + rng.randrange(span)
+            sec = conn.execute(
+                "INSERT INTO tree_nodes (text_id, parent_id, position, title, "
+                "segment_start_syl_id) VALUES (?, NULL, ?, 'S', ?)", (t, k, ids[a])).lastrowid
+            rest = range(a, (k + 1) * span)
+            subs = sorted(rng.sample(rest, min(SUBSECTIONS, len(rest))))
+            conn.executemany(
+                "INSERT INTO tree_nodes (text_id, parent_id, position, title, "
+                "segment_start_syl_id) VALUES (?, ?, ?, 's', ?)",
+                [(t, sec, j, ids[i]) for j, i in enumerate(subs)])
+    conn.commit()
+    return chain[-1]
+
+
+def timed(conn, text_id):
+    t0 = time.perf_counter()
+    rows = tree_nodes._tree_node_rows(conn, text_id)
+    return time.perf_counter() - t0, rows
+
+
+def main():
+    init_db()
+    conn = get_db()
+    leaf = build(conn)
+    tree_nodes._tree_node_rows(conn, leaf)                 # warm the stream cache
+    t_new, new = timed(conn, leaf)
+    saved = tree_nodes._gathered_tree_rows, tree_nodes._order_level
+    tree_nodes._gathered_tree_rows, tree_nodes._order_level = \
+        legacy_gathered_tree_rows, legacy_order_level
+    try:
+        t_old, old = timed(conn, leaf)
+    finally:
+        tree_nodes._gathered_tree_rows, tree_nodes._order_level = saved
+    assert [(n["id"], n["sort_index"]) for n in old] == [(n["id"], n["sort_index"]) for n in new]
+    print(f"{len(new)} nodes over a {CHAIN}-text chain: previous gather {t_old * 1000:7.1f} ms"
+          f"   indexed gather {t_new * 1000:7.1f} ms")
+    conn.close()
+    os.unlink(_tmp.name)
+
+
+if __name__ == "__main__":
+    main()
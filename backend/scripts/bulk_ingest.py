@@ -0,0 +1,67 @@
+"""Ingest a whole corpus of ``.txt`` texts as primary texts (app/ingest.py).
+
+The source is a zip archive or a directory (searched recursively). Each file becomes one
+primary text titled by its file stem, with a fallback instance id. Tokenization runs in a
+process pool; syllables are written in one transaction per ``--batch`` texts. Prints the
+created text ids, the files that failed and the throughput.
+
+Run:  cd backend && .venv/bin/python scripts/bulk_ingest.py corpus.zip --group "Corpus/2024"
+"""
+import argparse
+import os
+import sys
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.db import get_db, init_db  # noqa: E402
+from app.ingest import ingest_texts  # noqa: E402
+from app.routers.text_groups import normalize_group_path  # noqa: E402
+
+
+def read_corpus(source: Path) -> tuple[list[tuple[str, str]], list[str]]:
+    """``(filename, text)`` of every ``.txt`` under ``source``, and the undecodable names."""
+    files, bad = [], []
+    if source.is_dir():
+        entries = [(str(p.relative_to(source)), p.read_bytes)
+                   for p in sorted(source.rglob("*.txt"))]
+    else:
+        archive = zipfile.ZipFile(source)
+        entries = [(n, lambda n=n: archive.read(n)) for n in sorted(archive.namelist())
+                   if n.endswith(".txt") and not n.startswith("__MACOSX/")]
+    for name, read in entries:
+        try:
+            files.append((name, read().decode("utf-8")))
+        except UnicodeDecodeError:
+            bad.append(name)
+    return files, bad
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("source", type=Path, help="a .zip archive or a directory of .txt files")
+    ap.add_argument("--org", type=int, default=1, help="owning organization id (default 1)")
+    ap.add_argument("--group", default=None, help="text group path for every ingested text")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--batch", type=int, default=50, help="texts per transaction")
+    args = ap.parse_args()
+
+    files, bad = read_corpus(args.source)
+    for name in bad:
+        print(f"skip {name}: not UTF-8")
+    init_db()
+    conn = get_db()
+    try:
+        report = ingest_texts(conn, files, args.org, text_group=normalize_group_path(args.group),
+                              workers=args.workers, batch_size=args.batch)
+    finally:
+        conn.close()
+    for err in report["errors"]:
+        print(f"error {err['filename']}: {err['error']}")
+    print(f"{len(report['text_ids'])} texts, {report['syllables']} syllables "
+          f"in {report['seconds']}s ({report['syllables_per_sec']} syllables/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -114,10 +114,11 @@ def main():
             continue  # already unique (idempotent re-run)
         new_inst = f"{old_inst}_t{tid}"
         m = {}
-        for s in conn.execute(
-                "SELECT id, idx, text FROM syllables WHERE text_id=? ORDER BY idx",
-                (tid,)).fetchall():
-            new_id = syllable_id(new_inst, s["idx"], s["text"])
+        # Minted from the 1-based position, as at ingest: ``idx`` is a gapped key.
+        for pos, s in enumerate(conn.execute(
+                "SELECT id, text FROM syllables WHERE text_id=? ORDER BY idx",
+                (tid,)).fetchall(), start=1):
+            new_id = syllable_id(new_inst, pos, s["text"])
             if new_id != s["id"]:
                 m[s["id"]] = new_id
         for old, new in m.items():
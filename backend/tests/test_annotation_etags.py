@@ -0,0 +1,172 @@
+"""Conditional GET on the annotation list endpoints (app/layer_cache.py).
+
+Every list read carries a strong ETag stamped from trigger-maintained generations
+(``layer_generations`` per text, ``document_generations`` per document): a client sending
+it back gets a bodiless 304 until a row the read depends on — in the text's source
+closure, or globally (tags, global chunk layouts, the org template) — is written.
+Writes go straight to SQL here on purpose: the triggers, not the routers, keep the count.
+Run: `venv/bin/python tests/test_annotation_etags.py` (or pytest).
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+from app import db as _dbmod  # noqa: E402
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import init_db, get_db  # noqa: E402
+from app.manifest import load_syllables, persist_syllables  # noqa: E402
+
+init_db()
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+
+RAW = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ།"
+
+TEXT_READS = ("spans", "markers", "notes", "translations", "phonetics", "chunk-layouts")
+
+
+def _sql(sql, args=()):
+    conn = get_db()
+    try:
+        cur = conn.execute(sql, args)
+        conn.commit()
+        return cur.lastrowid
+    finally:
+        conn.close()
+
+
+def _mk_primary(title):
+    conn = get_db()
+    try:
+        tid = conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text, text_type) "
+            "VALUES ('t.txt', ?, '', ?, 'primary')", (title, RAW)).lastrowid
+        persist_syllables(conn, tid, title, RAW)
+        conn.commit()
+        return tid, load_syllables(conn, tid)
+    finally:
+        conn.close()
+
+
+def _tag(client, url):
+    r = client.get(url)
+    assert r.status_code == 200, r.text
+    assert r.headers["cache-control"] == "no-cache"
+    return r.headers["etag"]
+
+
+def _unchanged(client, url, tag):
+    r = client.get(url, headers={"If-None-Match": tag})
+    assert r.status_code in (200, 304), r.text
+    assert r.headers["etag"] == tag or r.status_code == 200
+    return r.status_code == 304 and not r.content
+
+
+def _changed(client, tid, tags):
+    """Which text reads' ETags no longer hold."""
+    return {k for k, t in tags.items()
+            if not _unchanged(client, f"/api/texts/{tid}/{k}", t)}
+
+
+def test_text_reads_revalidate_per_layer():
+    client = TestClient(app)
+    p, syls = _mk_primary("cond_p")
+    other, _ = _mk_primary("cond_other")
+    sec = client.post(f"/api/texts/{p}/derive", json={}).json()["id"]
+    tag = _sql("INSERT INTO tags (text_id, name) VALUES (?, 'big')", (p,))
+    span = _sql("INSERT INTO spans (text_id, tag_id, start_syl_id, end_syl_id) "
+                "VALUES (?, ?, ?, ?)", (p, tag, syls[1]["id"], syls[3]["id"]))
+    tags = {tid: {k: _tag(client, f"/api/texts/{tid}/{k}") for k in TEXT_READS}
+            for tid in (p, sec, other)}
+    for tid in (p, sec, other):
+        assert _changed(client, tid, tags[tid]) == set()
+
+    # A span write: the spans of the text and of the secondary inheriting it, only.
+    _sql("UPDATE spans SET end_syl_id = ? WHERE id = ?", (syls[4]["id"], span))
+    assert _changed(client, p, tags[p]) == {"spans"}
+    assert _changed(client, sec, tags[sec]) == {"spans"}
+    assert _changed(client, other, tags[other]) == set()
+    body = client.get(f"/api/texts/{p}/spans").json()
+    assert [s["end_syl_id"] for s in body] == [syls[4]["id"]]
+
+    tags = {tid: {k: _tag(client, f"/api/texts/{tid}/{k}") for k in TEXT_READS}
+            for tid in (p, sec, other)}
+    _sql("INSERT INTO markers (text_id, syl_id) VALUES (?, ?)", (p, syls[4]["id"]))
+    assert _changed(client, sec, tags[sec]) == {"markers"}
+    # A tag rename reaches every text's spans (and notes, which name session tags).
+    _sql("UPDATE tags SET name = 'bigger' WHERE id = ?", (tag,))
+    assert _changed(client, other, tags[other]) == {"spans", "notes"}
+
+    tags = {tid: {k: _tag(client, f"/api/texts/{tid}/{k}") for k in TEXT_READS}
+            for tid in (p, other)}
+    chunk = _sql("INSERT INTO translation_chunks (origin_text_id, start_syl_id, end_syl_id, "
+                 "kind) VALUES (?, ?, ?, 'text')", (p, syls[0]["id"], syls[2]["id"]))
+    assert _changed(client, p, tags[p]) == {"translations"}
+    tags[p]["translations"] = _tag(client, f"/api/texts/{p}/translations")
+    _sql("INSERT INTO translations (chunk_id, lang, body) VALUES (?, 'en', 'x')", (chunk,))
+    assert _changed(client, p, tags[p]) == {"translations"}
+    # A GLOBAL layout row reaches every text; a stream write reaches all of the text's reads.
+    _sql("INSERT INTO chunk_layouts (text_id, kind) VALUES (NULL, 'title')")
+    assert _changed(client, other, tags[other]) == {"chunk-layouts"}
+    conn = get_db()
+    try:
+        persist_syllables(conn, other, "cond_other", "ཀ་" + RAW)
+        conn.commit()
+    finally:
+        conn.close()
+    tags[other].pop("chunk-layouts")
+    assert _changed(client, other, tags[other]) == set(tags[other])
+
+
+def test_phonetics_tag_names_the_language_filter():
+    client = TestClient(app)
+    p, _syls = _mk_primary("cond_ph")
+    all_langs = _tag(client, f"/api/texts/{p}/phonetics")
+    en = _tag(client, f"/api/texts/{p}/phonetics?lang=en")
+    assert all_langs != en
+    assert client.get(f"/api/texts/{p}/phonetics?lang=fr",
+                      headers={"If-None-Match": en}).status_code == 200
+    assert client.get("/api/texts/999999/phonetics",
+                      headers={"If-None-Match": "*"}).status_code == 404
+
+
+def test_document_reads_revalidate():
+    client = TestClient(app)
+    t, syls = _mk_primary("cond_doc")
+    doc = client.post("/api/documents", json={"title": "Booklet"}).json()["id"]
+    other = client.post("/api/documents", json={"title": "Other"}).json()["id"]
+    item = client.post(f"/api/documents/{doc}/items",
+                       json={"kind": "text", "text_id": t}).json()["id"]
+    urls = {d: (f"/api/documents/{d}/layout", f"/api/documents/{d}/furniture")
+            for d in (doc, other)}
+    tags = {u: _tag(client, u) for d in urls for u in urls[d]}
+    assert all(_unchanged(client, u, tag) for u, tag in tags.items())
+
+    client.put(f"/api/documents/{doc}/layout", json={
+        "item_id": item, "anchor_syl_id": syls[3]["id"], "kind": "page_break"})
+    assert not _unchanged(client, urls[doc][0], tags[urls[doc][0]])
+    assert _unchanged(client, urls[doc][1], tags[urls[doc][1]])
+    assert _unchanged(client, urls[other][0], tags[urls[other][0]])
+
+    # The org template sits under every document's layout.
+    tags = {u: _tag(client, u) for d in urls for u in urls[d]}
+    _sql("INSERT INTO org_layout (org_id, config) VALUES (1, '{}') "
+         "ON CONFLICT(org_id) DO UPDATE SET config = excluded.config")
+    assert not _unchanged(client, urls[other][0], tags[urls[other][0]])
+    assert _unchanged(client, urls[other][1], tags[urls[other][1]])
+    assert client.get("/api/documents/999999/layout",
+                      headers={"If-None-Match": "*"}).status_code == 404
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for fn in fns:
+        fn()
+        print("ok", fn.__name__)
+    print(f"\n{len(fns)} passed")
@@ -0,0 +1,138 @@
+"""Queued bakes: POST /api/texts/{id}/apply-corrections/jobs and the bake worker.
+
+A bake job must leave the text exactly as the synchronous apply-corrections would, with
+its status and per-phase timings readable from the job endpoint; a bake whose text
+another writer changes between the read-only phases and the write starts over.
+Run: `venv/bin/python tests/test_bake_jobs.py` (or pytest).
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+from app import db as _dbmod  # noqa: E402
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import init_db, get_db  # noqa: E402
+from app.manifest import load_syllables, persist_syllables  # noqa: E402
+from app.routers.suggestions import create_suggestion  # noqa: E402
+from app.routers.texts import _applied_suggestions, _rebake, _text_corrected  # noqa: E402
+from app.schemas import SuggestionCreate  # noqa: E402
+
+init_db()
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+
+RAW = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ།"
+
+
+def _mk_primary(title):
+    conn = get_db()
+    try:
+        tid = conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text, text_type) "
+            "VALUES ('t.txt', ?, '', ?, 'primary')", (title, RAW)).lastrowid
+        persist_syllables(conn, tid, title, RAW)
+        conn.commit()
+        return tid, load_syllables(conn, tid)
+    finally:
+        conn.close()
+
+
+def _wait(client, tid, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/api/texts/{tid}/bake-jobs/{job_id}").json()
+        if job["status"] in ("done", "failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.02)
+
+
+def test_bake_job_runs_and_reports_phases():
+    client = TestClient(app)
+    tid, syls = _mk_primary("job_p")
+    create_suggestion(tid, SuggestionCreate(
+        suggested_text="", start_syl_id=syls[4]["id"], end_syl_id=syls[4]["id"]))
+    r = client.post(f"/api/texts/{tid}/apply-corrections/jobs")
+    assert r.status_code == 202, r.text
+    assert r.json()["status"] in ("queued", "running", "done")
+    job = _wait(client, tid, r.json()["id"])
+    assert job["status"] == "done" and job["baked"] and job["error"] is None, job
+    assert {"splice", "tokenize", "align", "write", "snap"} <= set(job["timings"])
+    assert job["started_at"] and job["finished_at"]
+
+    conn = get_db()
+    try:
+        raw = conn.execute("SELECT raw_text FROM texts WHERE id = ?", (tid,)).fetchone()[0]
+        assert raw == RAW.replace(syls[4]["text"], "", 1)
+        assert syls[4]["id"] not in {s["id"] for s in load_syllables(conn, tid)}
+        assert not _applied_suggestions(conn, tid)
+    finally:
+        conn.close()
+
+    # Nothing left staged: a second job is a no-op; both are listed, newest first.
+    again = _wait(client, tid, client.post(f"/api/texts/{tid}/apply-corrections/jobs").json()["id"])
+    assert again["status"] == "done" and not again["baked"]
+    listed = client.get(f"/api/texts/{tid}/bake-jobs").json()
+    assert [j["id"] for j in listed] == [again["id"], job["id"]]
+
+
+def test_bake_job_rejects_bad_targets():
+    client = TestClient(app)
+    assert client.post("/api/texts/999999/apply-corrections/jobs").status_code == 404
+    tid, _syls = _mk_primary("job_parent")
+    conn = get_db()
+    try:
+        sec = conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text, text_type, "
+            "parent_text_id) VALUES ('t.txt', 'job_sec', '', '', 'secondary', ?)",
+            (tid,)).lastrowid
+        conn.commit()
+    finally:
+        conn.close()
+    assert client.post(f"/api/texts/{sec}/apply-corrections/jobs").status_code == 400
+    assert client.get(f"/api/texts/{tid}/bake-jobs/999999").status_code == 404
+
+
+def test_rebake_starts_over_when_the_text_changes_underneath():
+    tid, syls = _mk_primary("job_race")
+    create_suggestion(tid, SuggestionCreate(
+        suggested_text="ཀ་", start_syl_id=syls[2]["id"], end_syl_id=syls[2]["id"]))
+    calls = []
+
+    def splice(conn):
+        got = _text_corrected(conn, tid)
+        if not calls:
+            # Another writer re-persists the text after this bake read it.
+            other = get_db()
+            try:
+                persist_syllables(other, tid, "job_race", "ཁ་" + RAW)
+                other.commit()
+            finally:
+                other.close()
+        calls.append(got[1])
+        return got[1], "job_race"
+
+    timings = {}
+    conn = get_db()
+    try:
+        assert _rebake(conn, tid, lambda c: _applied_suggestions(c, tid), splice, timings)
+        conn.commit()
+        assert len(calls) == 2 and "retry" in timings
+        raw = conn.execute("SELECT raw_text FROM texts WHERE id = ?", (tid,)).fetchone()[0]
+        assert raw == calls[1] and raw.startswith("ཁ་")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for fn in fns:
+        fn()
+        print("ok", fn.__name__)
+    print(f"\n{len(fns)} passed")
@@ -124,7 +124,90 @@ def test_no_span_reversed_in_new_order():
     conn.close()
 
 
+def test_snap_scales_past_the_sql_variable_limit():
+    """A bake deleting more syllables than SQLite binds in one statement still snaps
+    every layer; of two ranges that would snap onto one UNIQUE anchor, the earlier row
+    takes it and the later stays dangling."""
+    from app.routers.texts import _snap_refs_after_bake
+
+    lines = [f"{RAW}ཀ{i}་" for i in range(1600)]
+    conn = get_db()
+    p = _mk_primary(conn, "BigP", "big_p", "\n".join(lines))
+    old = [s["id"] for s in load_syllables(conn, p)]
+    persist_syllables(conn, p, "big_p", "\n".join([lines[0], lines[-1]]))
+    alive = {s["id"] for s in load_syllables(conn, p)}
+    assert len(old) - len(alive) > 32766 // 2
+    doomed = len(old) // 2
+    while old[doomed] in alive:
+        doomed += 1
+    fwd = next(sid for sid in old[doomed:] if sid in alive)
+    other = next(i for i in range(doomed - 1, -1, -1)
+                 if old[i] not in alive and next(s for s in old[i:] if s in alive) == fwd)
+    conn.execute("INSERT INTO reading_positions (text_id, syl_id) VALUES (?, ?)",
+                 (p, old[doomed]))
+    conn.execute("INSERT INTO tree_nodes (text_id, position, segment_start_syl_id) "
+                 "VALUES (?, 0, ?)", (p, old[doomed]))
+    early, late = (conn.execute(
+        "INSERT INTO phonetics (origin_text_id, start_syl_id, end_syl_id, kind) "
+        "VALUES (?, ?, ?, 'bo')", (p, old[i], old[-1])).lastrowid for i in (doomed, other))
+    _snap_refs_after_bake(conn, p, old)
+
+    assert conn.execute("SELECT syl_id FROM reading_positions WHERE text_id = ?",
+                        (p,)).fetchone()[0] == fwd
+    assert conn.execute("SELECT segment_start_syl_id FROM tree_nodes WHERE text_id = ?",
+                        (p,)).fetchone()[0] == fwd
+    starts = dict(conn.execute(
+        "SELECT id, start_syl_id FROM phonetics WHERE id IN (?, ?)", (early, late)).fetchall())
+    assert starts == {early: fwd, late: old[other]}
+    conn.rollback()
+    conn.close()
+
+
+def test_snap_collision_keeps_the_older_row_whatever_the_uuids():
+    """Of two ranges snapping onto one free UNIQUE key, the OLDER row wins even when the
+    later one starts on the smaller uuid — the order a covering index would visit them.
+    A key some row already holds stays with that row, however old the row snapping in."""
+    from app.routers.texts import _snap_refs_after_bake
+
+    conn = get_db()
+    p = _mk_primary(conn, "UuidP", "uuid_p", "ཀ་ཁ་ག་ང་ཅ་ཆ་ཇ་ཉ་" + RAW)
+    old = [s["id"] for s in load_syllables(conn, p)]
+    persist_syllables(conn, p, "uuid_p", RAW)
+    alive = {s["id"] for s in load_syllables(conn, p)}
+    # Doomed starts that all snap forward to one survivor, the last syllable kept alive.
+    runs: dict = {}
+    for i, sid in enumerate(old):
+        if sid not in alive:
+            runs.setdefault(next((s for s in old[i:] if s in alive), None), []).append(sid)
+    fwd, doomed = max(((f, d) for f, d in runs.items() if f is not None),
+                      key=lambda fd: len(fd[1]))
+    assert len(doomed) >= 2
+    lo, hi = min(doomed), max(doomed)
+    end = old[-1] if old[-1] in alive else next(s for s in reversed(old) if s in alive)
+    ids = {}
+    for table, extra in (("phonetics", "'bo'"), ("translation_chunks", "'text'")):
+        ids[table] = [conn.execute(
+            f"INSERT INTO {table} (origin_text_id, start_syl_id, end_syl_id, kind) "
+            f"VALUES (?, ?, ?, {extra})", (p, start, end)).lastrowid for start in (hi, lo)]
+    held = [conn.execute(
+        "INSERT INTO phonetics (origin_text_id, start_syl_id, end_syl_id, kind, lang) "
+        "VALUES (?, ?, ?, 'bo', 'de')", (p, start, end)).lastrowid for start in (lo, fwd)]
+    _snap_refs_after_bake(conn, p, old)
+
+    for table, (older, later) in ids.items():
+        starts = dict(conn.execute(
+            f"SELECT id, start_syl_id FROM {table} WHERE id IN (?, ?)", (older, later)))
+        assert starts == {older: fwd, later: lo}, table
+    starts = dict(conn.execute(
+        "SELECT id, start_syl_id FROM phonetics WHERE id IN (?, ?)", held))
+    assert starts == {held[0]: lo, held[1]: fwd}
+    conn.rollback()
+    conn.close()
+
+
 if __name__ == "__main__":
     test_bake_snaps_and_drops_all_reference_layers()
     test_no_span_reversed_in_new_order()
+    test_snap_scales_past_the_sql_variable_limit()
+    test_snap_collision_keeps_the_older_row_whatever_the_uuids()
     print("ok")
@@ -0,0 +1,119 @@
+"""POST /api/texts/bulk and app/ingest.py: a corpus ingested at once.
+
+A bulk-ingested text must be indistinguishable from the same file uploaded alone through
+POST /api/texts — same raw_text, same syllable partition, same uuids for the same
+instance id — whether the tiling ran inline or in the process pool.
+Run: `venv/bin/python tests/test_bulk_ingest.py` (or pytest).
+"""
+import io
+import os
+import sys
+import tempfile
+import zipfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+from app import db as _dbmod  # noqa: E402
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import init_db, get_db  # noqa: E402
+from app.ingest import ingest_texts  # noqa: E402
+from app.manifest import load_syllables, persist_syllables  # noqa: E402
+
+init_db()
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+
+CORPUS = {
+    "a.txt": "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ།\nབྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།",
+    "sub/b.txt": "བྱང་ཆུབ་སེམས་དཔའ།  ༄༅། །",
+    "c.txt": "ཀ་ཁ་ག་ང་",
+}
+
+
+def _zip(files: dict) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        for name, body in files.items():
+            z.writestr(name, body if isinstance(body, bytes) else body.encode("utf-8"))
+    return buf.getvalue()
+
+
+def _check_matches_single_upload(conn, text_id):
+    row = conn.execute("SELECT source_text, raw_text, instance_id FROM texts WHERE id = ?",
+                       (text_id,)).fetchone()
+    got = load_syllables(conn, text_id)
+    # The per-text path, on a scratch text, with the same instance id.
+    scratch = conn.execute(
+        "INSERT INTO texts (filename, title, source_text, raw_text) VALUES ('s.txt', 's', '', ?)",
+        (row["raw_text"],)).lastrowid
+    persist_syllables(conn, scratch, row["instance_id"], row["raw_text"])
+    want = load_syllables(conn, scratch)
+    conn.rollback()
+    assert "".join(s["text"] for s in got) == row["raw_text"]
+    assert [(s["id"], s["text"], s["nature"]) for s in got] == \
+        [(s["id"], s["text"], s["nature"]) for s in want]
+
+
+def test_bulk_endpoint_ingests_every_txt():
+    client = TestClient(app)
+    body = _zip({**CORPUS, "__MACOSX/._a.txt": b"\x00\x05", "notes.md": "skip me",
+                 "bad.txt": b"\xff\xfe\x00"})
+    r = client.post("/api/texts/bulk", files={"file": ("corpus.zip", body)},
+                    data={"text_group": " Corpus / One ", "batch_size": "2"})
+    assert r.status_code == 200, r.text
+    report = r.json()
+    assert len(report["text_ids"]) == 3
+    assert report["errors"] == [{"filename": "bad.txt", "error": "not UTF-8"}]
+    assert report["syllables"] > 0 and report["syllables_per_sec"] >= 0
+    conn = get_db()
+    try:
+        rows = conn.execute(
+            f"SELECT id, filename, title, text_group, instance_id FROM texts "
+            f"WHERE id IN ({','.join('?' * 3)}) ORDER BY id", report["text_ids"]).fetchall()
+        assert [r["filename"] for r in rows] == ["a.txt", "c.txt", "sub/b.txt"]
+        assert [r["title"] for r in rows] == ["a", "c", "b"]
+        assert {r["text_group"] for r in rows} == {"Corpus/One"}
+        assert rows[0]["instance_id"] == f"a_t{rows[0]['id']}"
+        assert report["syllables"] == conn.execute(
+            f"SELECT COUNT(*) FROM syllables WHERE text_id IN ({','.join('?' * 3)})",
+            report["text_ids"]).fetchone()[0]
+        for tid in report["text_ids"]:
+            _check_matches_single_upload(conn, tid)
+    finally:
+        conn.close()
+
+
+def test_bulk_endpoint_rejects_non_zip():
+    client = TestClient(app)
+    r = client.post("/api/texts/bulk", files={"file": ("a.txt", b"x")})
+    assert r.status_code == 400
+    r = client.post("/api/texts/bulk", files={"file": ("a.zip", b"not a zip")})
+    assert r.status_code == 400
+
+
+def test_process_pool_matches_inline():
+    files = sorted(CORPUS.items())
+    conn = get_db()
+    try:
+        inline = ingest_texts(conn, files, 1, workers=0)
+        pooled = ingest_texts(conn, files, 1, workers=2, batch_size=1)
+        assert inline["syllables"] == pooled["syllables"]
+        for a, b in zip(inline["text_ids"], pooled["text_ids"]):
+            ta = [(s["text"], s["nature"]) for s in load_syllables(conn, a)]
+            tb = [(s["text"], s["nature"]) for s in load_syllables(conn, b)]
+            assert ta == tb
+            _check_matches_single_upload(conn, b)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for fn in fns:
+        fn()
+        print("ok", fn.__name__)
+    print(f"\n{len(fns)} passed")
@@ -0,0 +1,135 @@
+"""GET /api/texts/{id}/bundle: every workspace layer in one response.
+
+Each layer must be exactly what its own endpoint returns — the bundle reuses the
+endpoint cores, and this pins that down for a primary and a derived secondary. The
+``text`` layer stays behind the "texts" section its own endpoint is guarded by.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+from app import db as _dbmod  # noqa: E402
+_dbmod.DB_PATH = _tmp.name
+
+from app.auth import SESSION_COOKIE, create_session  # noqa: E402
+from app.db import init_db, get_db  # noqa: E402
+from app.manifest import load_syllables, persist_syllables  # noqa: E402
+
+init_db()
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+
+RAW = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ།"
+
+ENDPOINTS = {
+    "text": "/api/texts/{}",
+    "spans": "/api/texts/{}/spans",
+    "markers": "/api/texts/{}/markers",
+    "notes": "/api/texts/{}/notes",
+    "passages": "/api/texts/{}/passages",
+    "tree_nodes": "/api/texts/{}/tree-nodes",
+    "display_breaks": "/api/texts/{}/display-breaks",
+    "suggestions": "/api/texts/{}/suggestions",
+}
+
+
+def _seed():
+    conn = get_db()
+    try:
+        tid = conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text, text_type) "
+            "VALUES ('t.txt', 'Bundle', '', ?, 'primary')", (RAW,)).lastrowid
+        persist_syllables(conn, tid, "bundle", RAW)
+        syls = load_syllables(conn, tid)
+        tag = conn.execute("INSERT INTO tags (text_id, name) VALUES (?, 'big')", (tid,)).lastrowid
+        conn.execute("INSERT INTO spans (text_id, tag_id, start_syl_id, end_syl_id) "
+                     "VALUES (?, ?, ?, ?)", (tid, tag, syls[1]["id"], syls[3]["id"]))
+        conn.execute("INSERT INTO markers (text_id, syl_id) VALUES (?, ?)", (tid, syls[4]["id"]))
+        conn.execute("INSERT INTO notes (text_id, body, start_syl_id, end_syl_id) "
+                     "VALUES (?, 'n', ?, ?)", (tid, syls[2]["id"], syls[2]["id"]))
+        conn.execute("INSERT INTO display_breaks (text_id, syl_id, count) VALUES (?, ?, 2)",
+                     (tid, syls[5]["id"]))
+        conn.commit()
+        return tid
+    finally:
+        conn.close()
+
+
+def test_bundle_layers_match_their_endpoints():
+    client = TestClient(app)
+    primary = _seed()
+    res = client.post(f"/api/texts/{primary}/derive", json={})
+    assert res.status_code == 200, res.text
+    for tid in (primary, res.json()["id"]):
+        bundle = client.get(f"/api/texts/{tid}/bundle")
+        assert bundle.status_code == 200, bundle.text
+        body = bundle.json()
+        for layer, url in ENDPOINTS.items():
+            alone = client.get(url.format(tid))
+            assert alone.status_code == 200, alone.text
+            assert body[layer] == alone.json(), layer
+        assert body["markers"] and body["notes"] and body["spans"]
+
+
+def test_bundle_subset_and_errors():
+    client = TestClient(app)
+    tid = _seed()
+    body = client.get(f"/api/texts/{tid}/bundle", params={"layers": "markers,notes"}).json()
+    assert body["markers"] and body["notes"] is not None and body["text"] is None
+    assert client.get(f"/api/texts/{tid}/bundle", params={"layers": "bogus"}).status_code == 400
+    assert client.get("/api/texts/999999/bundle").status_code == 404
+
+
+def _member_session(perms: str) -> str:
+    """A session for a fresh non-superuser member of org 1 holding one role of ``perms``."""
+    conn = get_db()
+    try:
+        conn.execute("INSERT OR IGNORE INTO organizations (id, name) VALUES (1, 'Default')")
+        user = conn.execute("INSERT INTO users (email) VALUES (?)",
+                            (f"bundle{os.urandom(4).hex()}@example.org",)).lastrowid
+        role = conn.execute("INSERT INTO roles (org_id, name, perms) VALUES (1, ?, ?)",
+                            (f"r{user}", perms)).lastrowid
+        member = conn.execute("INSERT INTO org_memberships (org_id, user_id) VALUES (1, ?)",
+                              (user,)).lastrowid
+        conn.execute("INSERT INTO membership_roles (membership_id, role_id) VALUES (?, ?)",
+                     (member, role))
+        raw = create_session(conn, user)
+        conn.commit()
+        return raw
+    finally:
+        conn.close()
+
+
+def test_text_layer_needs_texts_access():
+    tid = _seed()
+    workspace_only = _member_session('{"workspace": "read"}')
+    both = _member_session('{"workspace": "read", "texts": "read"}')
+    saved = os.environ.pop("SAPCHE_AUTH_DISABLED", None)
+    try:
+        client = TestClient(app)
+        headers = {"X-Org-Id": "1"}
+        client.cookies.set(SESSION_COOKIE, workspace_only)
+        assert client.get(f"/api/texts/{tid}", headers=headers).status_code == 403
+        assert client.get(f"/api/texts/{tid}/bundle", headers=headers,
+                          params={"layers": "text,markers"}).status_code == 403
+        body = client.get(f"/api/texts/{tid}/bundle", headers=headers).json()
+        assert body["text"] is None and body["markers"]
+        client.cookies.set(SESSION_COOKIE, both)
+        body = client.get(f"/api/texts/{tid}/bundle", headers=headers).json()
+        assert body["text"]["id"] == tid
+    finally:
+        if saved is not None:
+            os.environ["SAPCHE_AUTH_DISABLED"] = saved
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for fn in fns:
+        fn()
+        print("ok", fn.__name__)
+    print(f"\n{len(fns)} passed")
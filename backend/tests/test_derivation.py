@@ -1141,6 +1141,76 @@ def test_source_tags_display_on_every_occurrence():
     assert all(s["inherited"] for s in got)
 
 
+def test_edit_endpoints_return_a_delta_that_patches_the_old_stream():
+    from app.routers.derivation import post_edit_range, post_insert_break, delete_derivation_op
+    from app.schemas import EditRangeIn, InsertBreakIn
+    conn = get_db()
+    try:
+        parent = _mk_primary(conn, "PD", "pd", RAW)
+        sec = _mk_secondary(conn, parent)
+        psyls = load_syllables(conn, parent)
+        held = [dict(t) for t in derivation.compose_secondary(conn, sec)]
+    finally:
+        conn.close()
+
+    def apply(stream, d):
+        n = len(d["tokens"]) - d["delete_count"]
+        tail = [dict(t, idx=t["idx"] + n, start_offset=t["start_offset"] + d["offset_shift"],
+                     end_offset=t["end_offset"] + d["offset_shift"])
+                for t in stream[d["start"] + d["delete_count"]:]]
+        out = stream[:d["start"]] + [dict(t) for t in d["tokens"]] + tail
+        assert len(out) == d["length"]
+        return out
+
+    d = post_edit_range(sec, EditRangeIn(start_syl_id=psyls[2]["id"], end_syl_id=psyls[3]["id"],
+                                         new_text="ཡོན་ཏན་གསུམ་"), delta=True)["delta"]
+    assert 0 < d["start"] and d["tokens"]          # only the edited run travels
+    held = apply(held, d)
+    d = post_insert_break(sec, InsertBreakIn(before_syl_id=psyls[6]["id"]), delta=True)["delta"]
+    assert d["delete_count"] == 0 and [t["text"] for t in d["tokens"]] == ["\n"]
+    held = apply(held, d)
+
+    conn = get_db()
+    try:
+        assert held == derivation.compose_secondary(conn, sec)
+        op_id = next(t["op_id"] for t in held if t["text"] == "\n")
+    finally:
+        conn.close()
+    held = apply(held, delete_derivation_op(op_id, delta=True)["delta"])
+    conn = get_db()
+    try:
+        assert held == derivation.compose_secondary(conn, sec)
+    finally:
+        conn.close()
+
+
+def test_token_stream_views_keep_the_dict_shapes():
+    # The columnar stream is internal: what callers see is still load_syllables' rows
+    # for a primary and the per-source key sets for a composed stream.
+    conn = get_db()
+    try:
+        parent = _mk_primary(conn, "PTS", "pts", RAW)
+        other = _mk_primary(conn, "OTS", "ots", RAW2)
+        sec = _mk_secondary(conn, parent)
+        psyls, osyls = load_syllables(conn, parent), load_syllables(conn, other)
+        assert derivation.base_tokens(conn, parent) == psyls
+        derivation.edit_range(conn, sec, psyls[1]["id"], psyls[1]["id"], "ཡོན་")
+        derivation.transclude(conn, sec, psyls[3]["id"], other, osyls[0]["id"], osyls[1]["id"])
+        conn.commit()
+        keys = {t["source"]: list(t) for t in derivation.compose_secondary(conn, sec)}
+        tail = ["idx", "inserted", "start_offset", "end_offset"]
+        assert keys["parent-link"] == ["id", "text", "nature", "source"] + tail
+        assert keys["override"] == ["id", "text", "nature", "source",
+                                    "parent_syl_id", "original", "op_id"] + tail
+        assert keys["transclusion"] == ["id", "text", "nature", "source",
+                                        "src_text_id", "op_id"] + tail
+        toks = derivation.compose_secondary(conn, sec)
+        assert [t["idx"] for t in toks] == list(range(1, len(toks) + 1))
+        assert all(a["end_offset"] == b["start_offset"] for a, b in zip(toks, toks[1:]))
+    finally:
+        conn.close()
+
+
 if __name__ == "__main__":
     fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
     for fn in fns:
@@ -0,0 +1,105 @@
+"""`inherit.source_texts` (recursive CTE + per-process closure cache) and `text_closure`.
+
+The closure order is part of the contract — own-before-inherited dedup in every list
+endpoint walks it — so it is checked against the original per-node walk. The cache must
+drop a closure as soon as a parent link or a transclusion changes.
+Run: `venv/bin/python tests/test_inherit.py` (or pytest).
+"""
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+from app import db as _dbmod  # noqa: E402
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import init_db, get_db  # noqa: E402
+from app.inherit import source_texts, text_closure  # noqa: E402
+
+init_db()
+
+
+def _walk(cursor, text_id, _seen=None):
+    # The original one-query-per-node implementation: the reference order.
+    _seen = set() if _seen is None else _seen
+    if text_id in _seen:
+        return []
+    _seen.add(text_id)
+    out = []
+    row = cursor.execute("SELECT parent_text_id FROM texts WHERE id = ?", (text_id,)).fetchone()
+    if row and row["parent_text_id"] and row["parent_text_id"] not in _seen:
+        out.append(row["parent_text_id"])
+        out.extend(_walk(cursor, row["parent_text_id"], _seen))
+    for r in cursor.execute(
+            "SELECT DISTINCT src_text_id FROM derivation_ops WHERE text_id = ? AND "
+            "op_kind = 'transclude' AND src_text_id IS NOT NULL ORDER BY src_text_id",
+            (text_id,)).fetchall():
+        if r["src_text_id"] not in _seen:
+            out.append(r["src_text_id"])
+            out.extend(_walk(cursor, r["src_text_id"], _seen))
+    return out
+
+
+def _mk(conn, parent=None):
+    return conn.execute(
+        "INSERT INTO texts (filename, title, source_text, raw_text, text_type, parent_text_id) "
+        "VALUES ('t.txt', 'T', '', '', ?, ?)",
+        ("secondary" if parent else "primary", parent)).lastrowid
+
+
+def _transclude(conn, text_id, src):
+    return conn.execute("INSERT INTO derivation_ops (text_id, op_kind, src_text_id) "
+                        "VALUES (?, 'transclude', ?)", (text_id, src)).lastrowid
+
+
+def test_closure_order_matches_the_per_node_walk():
+    rng = random.Random(3)
+    conn = get_db()
+    try:
+        ids = [_mk(conn) for _ in range(4)]
+        for _ in range(40):
+            tid = _mk(conn, rng.choice(ids))
+            for src in rng.sample(ids, 2):
+                _transclude(conn, tid, src)
+            ids.append(tid)
+        conn.commit()
+        for tid in ids:
+            assert source_texts(conn.cursor(), tid) == _walk(conn.cursor(), tid)
+            assert source_texts(conn, tid) == _walk(conn.cursor(), tid)     # cached path
+        assert text_closure(conn, [ids[-1], None]) == sorted({ids[-1], *_walk(conn.cursor(), ids[-1])})
+    finally:
+        conn.close()
+
+
+def test_cache_follows_graph_writes():
+    conn = get_db()
+    try:
+        a, b = _mk(conn), _mk(conn)
+        child = _mk(conn, a)
+        conn.commit()
+        assert source_texts(conn, child) == [a]
+        op = _transclude(conn, child, b)
+        conn.commit()
+        assert source_texts(conn, child) == [a, b]
+        conn.execute("UPDATE texts SET parent_text_id = ? WHERE id = ?", (b, child))
+        conn.commit()
+        assert source_texts(conn, child) == [b]
+        conn.execute("DELETE FROM derivation_ops WHERE id = ?", (op,))
+        conn.execute("UPDATE texts SET parent_text_id = ? WHERE id = ?", (a, child))
+        assert source_texts(conn, child) == [a]       # seen inside the transaction…
+        conn.rollback()
+        assert source_texts(conn, child) == [b]       # …and not cached past its rollback
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for fn in fns:
+        fn()
+        print("ok", fn.__name__)
+    print(f"\n{len(fns)} passed")
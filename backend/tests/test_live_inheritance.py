@@ -144,6 +144,35 @@ def test_tree_inherits_live_and_own_nests_under_inherited():
     assert titles["Own Sub"]["parent_id"] == parent_node
 
 
+def test_passage_listing_matches_per_passage_resolution():
+    """The batched listing (one member query for every origin) resolves each passage
+    exactly as ``_resolve_members`` does on its own, own and inherited alike."""
+    from app.routers.texts import derive_secondary_text
+    from app.routers.passages import _resolve_members, list_passages
+
+    conn = get_db()
+    p = _mk_primary(conn, "InhB", "inh_b", RAW)
+    syls = load_syllables(conn, p)
+    conn.close()
+    child = derive_secondary_text(p, {})["id"]
+
+    conn = get_db()
+    for tid, anchor, runs in ((p, 8, [(0, 1), (3, 4)]), (p, 7, [(2, 2)]), (child, 6, [(5, 5)])):
+        pg = conn.execute("INSERT INTO passages (text_id, anchor_syl_id, position) "
+                          "VALUES (?, ?, 0)", (tid, syls[anchor]["id"])).lastrowid
+        conn.executemany(
+            "INSERT INTO passage_members (passage_id, position, src_start_syl_id, "
+            "src_end_syl_id) VALUES (?, ?, ?, ?)",
+            [(pg, i, syls[a]["id"], syls[b]["id"]) for i, (a, b) in enumerate(runs)])
+    conn.commit()
+    ps = list_passages(child)
+    assert [(x["inherited"], len(x["members"])) for x in ps] == [(False, 1), (True, 2), (True, 1)]
+    for x in ps:
+        assert x["members"] == _resolve_members(conn, child, x["id"])
+    conn.close()
+
+
 if __name__ == "__main__":
     test_markers_notes_passages_inherit_live()
+    test_passage_listing_matches_per_passage_resolution()
     print("ok")
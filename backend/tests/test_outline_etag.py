@@ -0,0 +1,145 @@
+"""Outline reads are cached per (text, generations) and revalidate by ETag (app/layer_cache.py).
+
+GET /api/texts/{id}/tree-nodes (and /tree) carries a strong ETag naming the generations the
+outline was computed from; a client sending it back gets a 304 until the tree, the passages
+or the stream of some text in the reading text's source closure is written — and only then.
+Run: `venv/bin/python tests/test_outline_etag.py` (or pytest).
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+from app import db as _dbmod  # noqa: E402
+_dbmod.DB_PATH = _tmp.name
+
+from app import layer_cache  # noqa: E402
+from app.db import init_db, get_db  # noqa: E402
+from app.manifest import load_syllables, persist_syllables  # noqa: E402
+
+init_db()
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+
+RAW = ("སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ། "
+       "བྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།")
+
+
+def _mk_primary(title):
+    conn = get_db()
+    try:
+        tid = conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text, text_type) "
+            "VALUES ('t.txt', ?, '', ?, 'primary')", (title, RAW)).lastrowid
+        persist_syllables(conn, tid, title, RAW)
+        conn.commit()
+        return tid, load_syllables(conn, tid)
+    finally:
+        conn.close()
+
+
+def _tags(client, *tids, shape=""):
+    out = []
+    for tid in tids:
+        r = client.get(f"/api/texts/{tid}/tree-nodes{shape}")
+        assert r.status_code == 200 and r.headers["etag"].startswith('"'), r.text
+        out.append(r.headers["etag"])
+    return out
+
+
+def _fresh(client, tid, tag, shape=""):
+    """Whether ``tag`` is still current for ``tid`` (a 304 with the same tag)."""
+    r = client.get(f"/api/texts/{tid}/tree-nodes{shape}", headers={"If-None-Match": tag})
+    if r.status_code == 304:
+        assert r.headers["etag"] == tag and not r.content
+        return True
+    assert r.status_code == 200 and r.headers["etag"] != tag
+    return False
+
+
+def test_edits_invalidate_only_the_texts_they_reach():
+    client = TestClient(app)
+    p, syls = _mk_primary("etag_p")
+    other, _ = _mk_primary("etag_other")
+    node = client.post(f"/api/texts/{p}/tree-nodes", json={
+        "parent_id": None, "title": "one", "segment_start_syl_id": syls[0]["id"]}).json()
+    sec = client.post(f"/api/texts/{p}/derive", json={}).json()["id"]
+
+    tp, ts, to = _tags(client, p, sec, other)
+    nested, = _tags(client, p, shape="/tree")
+    assert nested != tp
+    assert _fresh(client, p, tp) and _fresh(client, sec, ts) and _fresh(client, other, to)
+    assert _fresh(client, p, nested, shape="/tree")
+    listed = client.get(f"/api/texts/{p}/tree-nodes", headers={"If-None-Match": f'"x", {tp}'})
+    assert listed.status_code == 304 and listed.headers["etag"] == tp
+
+    # A node edit on the primary reaches the primary and the secondary inheriting it.
+    client.patch(f"/api/tree-nodes/{node['id']}", json={"title": "renamed"})
+    assert not _fresh(client, p, tp) and not _fresh(client, sec, ts)
+    assert not _fresh(client, p, nested, shape="/tree")
+    assert _fresh(client, other, to)
+    assert client.get(f"/api/texts/{sec}/tree-nodes").json()[0]["title"] == "renamed"
+
+    # So does a passage write, and a write to the primary's stream.
+    tp, ts = _tags(client, p, sec)
+    client.post(f"/api/texts/{p}/passages", json={"members": [
+        {"src_start_syl_id": syls[1]["id"], "src_end_syl_id": syls[2]["id"]}]})
+    assert not _fresh(client, p, tp) and not _fresh(client, sec, ts)
+    tp, ts = _tags(client, p, sec)
+    conn = get_db()
+    try:
+        persist_syllables(conn, p, "etag_p", "ཀ་" + RAW)
+        conn.commit()
+    finally:
+        conn.close()
+    assert not _fresh(client, p, tp) and not _fresh(client, sec, ts)
+    assert _fresh(client, other, to)
+
+    # An edit on the secondary leaves the primary's outline alone.
+    tp, ts = _tags(client, p, sec)
+    client.post(f"/api/texts/{sec}/tree-nodes", json={
+        "parent_id": None, "title": "own", "segment_start_syl_id": syls[5]["id"]})
+    assert _fresh(client, p, tp) and not _fresh(client, sec, ts)
+
+
+def test_cached_outline_matches_a_recomputation():
+    client = TestClient(app)
+    p, syls = _mk_primary("etag_cache")
+    for i, title in enumerate(("a", "b", "c")):
+        client.post(f"/api/texts/{p}/tree-nodes", json={
+            "parent_id": None, "title": title, "segment_start_syl_id": syls[i * 3]["id"]})
+    for shape in ("", "/tree"):
+        cached = client.get(f"/api/texts/{p}/tree-nodes{shape}")
+        assert client.get(f"/api/texts/{p}/tree-nodes{shape}").json() == cached.json()
+        layer_cache.clear()
+        again = client.get(f"/api/texts/{p}/tree-nodes{shape}")
+        assert again.json() == cached.json()
+        assert again.headers["etag"] == cached.headers["etag"]
+
+
+def test_reads_inside_a_transaction_are_not_cached():
+    p, _syls = _mk_primary("etag_txn")
+    from app.routers.tree_nodes import _OUTLINE_LAYERS, _cached_outline
+    layer_cache.clear()
+    conn = get_db()
+    try:
+        conn.execute("UPDATE texts SET title = 'x' WHERE id = ?", (p,))
+        assert conn.in_transaction
+        assert _cached_outline(conn, p, "flat", lambda c: [], None, None) == []
+        current = layer_cache.stamp(conn, p, _OUTLINE_LAYERS)
+        assert layer_cache.lookup("flat", p, current) is None
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for fn in fns:
+        fn()
+        print("ok", fn.__name__)
+    print(f"\n{len(fns)} passed")
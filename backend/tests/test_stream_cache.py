@@ -0,0 +1,321 @@
+"""The process-wide composed-stream cache (app/stream_cache.py).
+
+A repeated compose is served from the cache; any write to a syllable, op or op syllable
+of a text in the stream's source closure — the text itself, its parent, a transclusion
+source — bumps that text's generation and the next compose sees the change. A text's
+anchor index (its offset maps) lives on the cached stream and is replaced with it.
+Run: `venv/bin/python tests/test_stream_cache.py` (or pytest).
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+from app import db as _dbmod  # noqa: E402
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import init_db, get_db  # noqa: E402
+from app.manifest import load_syllables, persist_syllables  # noqa: E402
+from app import derivation  # noqa: E402
+
+init_db()
+
+RAW = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ།"
+RAW2 = "བྱང་ཆུབ་སེམས་དཔའ།"
+
+
+def _mk_primary(conn, title, instance, raw):
+    cur = conn.execute(
+        "INSERT INTO texts (filename, title, source_text, raw_text, text_type) "
+        "VALUES ('t.txt', ?, '', ?, 'primary')", (title, raw))
+    tid = cur.lastrowid
+    persist_syllables(conn, tid, instance, raw)
+    conn.commit()
+    return tid
+
+
+def _mk_secondary(conn, parent_id):
+    cur = conn.execute(
+        "INSERT INTO texts (filename, title, source_text, raw_text, text_type, parent_text_id) "
+        "VALUES ('t.txt', 'Secondary', '', '', 'secondary', ?)", (parent_id,))
+    conn.commit()
+    return cur.lastrowid
+
+
+def _generation(conn, text_id):
+    row = conn.execute("SELECT generation FROM stream_generations WHERE text_id = ?",
+                       (text_id,)).fetchone()
+    return row["generation"] if row else None
+
+
+def test_repeat_compose_is_served_from_cache():
+    conn = get_db()
+    try:
+        parent = _mk_primary(conn, "C1", "c1", RAW)
+        sec = _mk_secondary(conn, parent)
+        first = derivation.compose_secondary(conn, sec)
+        assert derivation.compose_secondary(conn, sec) is first
+    finally:
+        conn.close()
+
+
+def test_own_edit_invalidates():
+    conn = get_db()
+    try:
+        parent = _mk_primary(conn, "C2", "c2", RAW)
+        sec = _mk_secondary(conn, parent)
+        psyls = load_syllables(conn, parent)
+        before = derivation.compose_secondary(conn, sec)
+        derivation.edit_range(conn, sec, psyls[2]["id"], psyls[3]["id"], "ཡོན་ཏན་")
+        conn.commit()
+        after = derivation.compose_secondary(conn, sec)
+        assert after is not before
+        assert any(t["source"] == "override" for t in after)
+        # Deleting the ops (their hosted syllables go with them) invalidates again.
+        for op_id in {t["op_id"] for t in after if t.get("op_id")}:
+            derivation.delete_op(conn, op_id)
+        conn.commit()
+        assert [t["id"] for t in derivation.compose_secondary(conn, sec)] == \
+            [s["id"] for s in psyls]
+    finally:
+        conn.close()
+
+
+def test_parent_bake_ripples_to_child_and_grandchild():
+    conn = get_db()
+    try:
+        parent = _mk_primary(conn, "C3", "c3", RAW)
+        child = _mk_secondary(conn, parent)
+        grandchild = _mk_secondary(conn, child)
+        old = derivation.compose_secondary(conn, grandchild)
+        assert "".join(t["text"] for t in old) == RAW
+        persist_syllables(conn, parent, "c3", RAW + "ཀ་")
+        conn.commit()
+        new = derivation.compose_secondary(conn, grandchild)
+        assert "".join(t["text"] for t in new) == RAW + "ཀ་"
+        assert "".join(t["text"] for t in derivation.compose_secondary(conn, child)) == RAW + "ཀ་"
+    finally:
+        conn.close()
+
+
+def test_transclusion_source_edit_invalidates():
+    conn = get_db()
+    try:
+        parent = _mk_primary(conn, "C4", "c4", RAW)
+        other = _mk_primary(conn, "C4o", "c4o", RAW2)
+        sec = _mk_secondary(conn, parent)
+        psyls, osyls = load_syllables(conn, parent), load_syllables(conn, other)
+        derivation.transclude(conn, sec, psyls[5]["id"], other, osyls[0]["id"], osyls[1]["id"])
+        conn.commit()
+        before = derivation.compose_secondary(conn, sec)
+        conn.execute("UPDATE syllables SET text = 'ཁ་' WHERE id = ?", (osyls[0]["id"],))
+        conn.commit()
+        after = derivation.compose_secondary(conn, sec)
+        assert after is not before
+        assert next(t for t in after if t["id"] == osyls[0]["id"])["text"] == "ཁ་"
+    finally:
+        conn.close()
+
+
+def test_uncommitted_compose_is_not_cached():
+    conn = get_db()
+    try:
+        parent = _mk_primary(conn, "C5", "c5", RAW)
+        sec = _mk_secondary(conn, parent)
+        psyls = load_syllables(conn, parent)
+        gen = _generation(conn, parent)
+        conn.execute("DELETE FROM syllables WHERE id = ?", (psyls[0]["id"],))
+        assert _generation(conn, parent) == gen + 1
+        assert len(derivation.compose_secondary(conn, sec)) == len(psyls) - 1
+        conn.rollback()
+        # The rolled-back generation is the committed one again: the stream composed
+        # inside the transaction must not come back.
+        assert _generation(conn, parent) == gen
+        assert len(derivation.compose_secondary(conn, sec)) == len(psyls)
+    finally:
+        conn.close()
+
+
+def test_stream_members_follow_the_composed_stream():
+    from app import stream_members
+    from app.routers.markers import list_markers
+    conn = get_db()
+    try:
+        parent = _mk_primary(conn, "C6", "c6", RAW)
+        sec = _mk_secondary(conn, parent)           # inserted bare: nothing refreshed it
+        psyls = load_syllables(conn, parent)
+        assert not stream_members.current(conn, sec)
+        stream_members.refresh(conn, parent)         # a write to the parent refreshes its children
+        conn.commit()
+        assert not stream_members.current(conn, parent)    # primaries are never materialized
+        assert stream_members.current(conn, sec)
+
+        def members():
+            return sorted(r["syl_id"] for r in conn.execute(
+                "SELECT syl_id FROM stream_members WHERE text_id = ?", (sec,)))
+        assert members() == sorted(s["id"] for s in psyls)
+        # The edit refreshes the rows in its own transaction, rewriting the edited run
+        # only: its syllable out, the replacement in.
+        before = conn.total_changes
+        derivation.edit_range(conn, sec, psyls[2]["id"], psyls[2]["id"], "ཡོན་")
+        edited = conn.total_changes - before
+        conn.rollback()
+        assert stream_members.current(conn, sec)
+        derivation.edit_range(conn, sec, psyls[2]["id"], psyls[2]["id"], "ཡོན་")
+        before = conn.total_changes
+        stream_members.refresh(conn, sec)            # already current: writes nothing
+        assert conn.total_changes == before
+        composed = derivation.compose_secondary(conn, sec)
+        conn.rollback()
+        before = conn.total_changes
+        derivation.edit_range(conn, sec, psyls[2]["id"], psyls[2]["id"], "ཡོན་")
+        conn.commit()
+        assert conn.total_changes - before == edited
+        assert stream_members.current(conn, sec)
+        assert members() == sorted(t["id"] for t in composed)
+        assert psyls[2]["id"] not in members()
+        new = len(composed) - len(psyls) + 1
+        assert conn.execute("SELECT COUNT(*) FROM stream_members WHERE text_id = ? "
+                            "AND op_id IS NOT NULL", (sec,)).fetchone()[0] == new
+        # A parent marker on the overridden syllable is filtered out in SQL; one on a
+        # surviving syllable is inherited.
+        conn.execute("INSERT INTO markers (text_id, syl_id) VALUES (?, ?)", (parent, psyls[2]["id"]))
+        conn.execute("INSERT INTO markers (text_id, syl_id) VALUES (?, ?)", (parent, psyls[4]["id"]))
+        conn.commit()
+    finally:
+        conn.close()
+    assert [m["syl_id"] for m in list_markers(sec)] == [psyls[4]["id"]]
+
+
+def test_stream_members_reads_never_write():
+    import time
+    from app import stream_members
+    from app.routers.markers import list_markers
+    conn = get_db()
+    try:
+        parent = _mk_primary(conn, "C6b", "c6b", RAW)
+        sec = _mk_secondary(conn, parent)
+        psyls = load_syllables(conn, parent)
+        conn.execute("INSERT INTO markers (text_id, syl_id) VALUES (?, ?)", (parent, psyls[1]["id"]))
+        derivation.edit_range(conn, sec, psyls[2]["id"], psyls[2]["id"], "ཡོན་")
+        conn.commit()
+        assert stream_members.current(conn, sec)
+        # A write path that does not refresh leaves the rows behind; a read notices and
+        # falls back to its Python-side filter rather than catching the table up.
+        conn.execute("UPDATE syllables SET text = text WHERE id = ?", (psyls[0]["id"],))
+        conn.commit()
+    finally:
+        conn.close()
+    writer = get_db()
+    reader = get_db()
+    try:
+        writer.execute("BEGIN IMMEDIATE")          # a bake holding the write lock
+        t0 = time.perf_counter()
+        before = reader.total_changes
+        assert not stream_members.current(reader, sec)
+        assert [m["syl_id"] for m in list_markers(sec)] == [psyls[1]["id"]]
+        assert time.perf_counter() - t0 < 1.0       # busy_timeout is 5 s
+        assert reader.total_changes == before and not reader.in_transaction
+        writer.rollback()
+        assert not stream_members.current(reader, sec)
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_range_and_tree_reads_filter_in_sql_like_in_python():
+    from app import stream_members
+    from app.routers.phonetics import list_text_phonetics
+    from app.routers.translations import list_text_translations
+    from app.routers.tree_nodes import list_tree_nodes
+    conn = get_db()
+    try:
+        parent = _mk_primary(conn, "C6c", "c6c", RAW)
+        sec = _mk_secondary(conn, parent)
+        ids = [s["id"] for s in load_syllables(conn, parent)]
+        # Override syllables 2..3: a run of just those is gone, one reaching 4 survives.
+        derivation.edit_range(conn, sec, ids[2], ids[3], "ཡོན་")
+        runs = {"gone": (ids[2], ids[3]), "kept": (ids[3], ids[4]), "reversed": (ids[4], ids[1])}
+        for name, (a, b) in runs.items():
+            conn.execute("INSERT INTO translation_chunks (origin_text_id, start_syl_id, "
+                         "end_syl_id) VALUES (?, ?, ?)", (parent, a, b))
+            conn.execute("INSERT INTO phonetics (origin_text_id, start_syl_id, end_syl_id, "
+                         "kind, body) VALUES (?, ?, ?, 'bo', ?)", (parent, a, b, name))
+        # A dropped leaf, a kept anchor, and a dropped anchor kept by its (own) child.
+        conn.execute("INSERT INTO tree_nodes (text_id, position, segment_start_syl_id) "
+                     "VALUES (?, 0, ?)", (parent, ids[2]))
+        conn.execute("INSERT INTO tree_nodes (text_id, position, segment_start_syl_id) "
+                     "VALUES (?, 1, ?)", (parent, ids[5]))
+        holder = conn.execute("INSERT INTO tree_nodes (text_id, position, segment_start_syl_id) "
+                              "VALUES (?, 2, ?)", (parent, ids[3])).lastrowid
+        conn.execute("INSERT INTO tree_nodes (text_id, parent_id, position, title) "
+                     "VALUES (?, ?, 0, 'Own')", (sec, holder))
+        conn.commit()
+        assert stream_members.current(conn, sec)
+        sql = ("SELECT body FROM phonetics WHERE origin_text_id = ? AND "
+               + stream_members.range_member_clause(
+                   "phonetics.origin_text_id", "start_syl_id", "end_syl_id"))
+        assert [r["body"] for r in conn.execute(sql, (parent, sec))] == ["kept"]
+        plan = " ".join(r["detail"] for r in conn.execute("EXPLAIN QUERY PLAN " + sql,
+                                                          (parent, sec)))
+        assert "SCAN st" not in plan and "SCAN sm" not in plan, plan
+    finally:
+        conn.close()
+
+    def reads():
+        return ([(c.start_syl_id, c.end_syl_id) for c in list_text_translations(sec)],
+                [p.body for p in list_text_phonetics(sec)],
+                {(n["segment_start_syl_id"], n["title"]) for n in list_tree_nodes(sec)})
+    live = reads()
+    assert live[0] == [runs["kept"]] and live[1] == ["kept"]
+    assert live[2] == {(ids[5], None), (ids[3], None), (None, "Own")}
+    conn = get_db()
+    try:
+        conn.execute("DELETE FROM stream_members WHERE text_id = ?", (sec,))
+        conn.execute("DELETE FROM stream_members_state WHERE text_id = ?", (sec,))
+        conn.commit()
+    finally:
+        conn.close()
+    assert reads() == live                        # the Python filter alone agrees
+
+
+def test_anchor_index_is_reused_until_a_write():
+    from app.syllable_anchors import anchor_index, _occurrence_offsets, _root_maps, \
+        _syl_offset_maps
+    conn = get_db()
+    try:
+        parent = _mk_primary(conn, "C7", "c7", RAW)
+        sec = _mk_secondary(conn, parent)
+        for tid in (parent, sec):
+            index = anchor_index(conn, tid)
+            assert anchor_index(conn, tid) is index
+            id2start, id2end = _syl_offset_maps(conn, tid)
+            assert _syl_offset_maps(conn, tid)[0] is id2start
+            start2id, end2id = _root_maps(conn, tid)
+            toks = load_syllables(conn, parent)
+            assert id2start == {t["id"]: t["start_offset"] for t in toks}
+            assert id2end == {t["id"]: t["end_offset"] for t in toks}
+            assert start2id == {t["start_offset"]: t["id"] for t in toks}
+            assert end2id == {t["end_offset"]: t["id"] for t in toks}
+            assert _occurrence_offsets(conn, tid) == \
+                {(t["id"], 0): t["start_offset"] for t in toks}
+        before = anchor_index(conn, parent), anchor_index(conn, sec)
+        persist_syllables(conn, parent, "c7", "ཀ་" + RAW)
+        conn.commit()
+        assert anchor_index(conn, parent) is not before[0]
+        assert anchor_index(conn, sec) is not before[1]
+        first = load_syllables(conn, parent)[1]["id"]
+        assert _syl_offset_maps(conn, sec)[0][first] == len("ཀ་")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for fn in fns:
+        fn()
+        print("ok", fn.__name__)
+    print(f"\n{len(fns)} passed")
@@ -0,0 +1,91 @@
+"""Positional lookups on a TokenStream (app/token_stream.py) and manifest's range helper.
+
+``containing`` bisects the stream's prefix sums and ``ids_between`` slices
+by the shared id index; each must answer exactly what the linear scans they replace
+would — empty tokens, ranges off the grid and past either end included.
+Run: `venv/bin/python tests/test_stream_lookups.py` (or pytest).
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.manifest import syllable_ids_between  # noqa: E402
+from app.token_stream import TokenStream  # noqa: E402
+
+
+def _stream(texts):
+    s = TokenStream()
+    for i, t in enumerate(texts):
+        s.add_link(f"s{i}", t, "TEXT")
+    return s
+
+
+def _random_texts(rng):
+    return [rng.choice(("", "ཀ", "ཀ་", "སངས་", "རྒྱས་")) for _ in range(rng.randint(0, 40))]
+
+
+def test_containing_matches_a_linear_scan():
+    rng = random.Random(7)
+    for _ in range(300):
+        s = _stream(_random_texts(rng))
+        toks = s.dicts()
+        total = s.ends[-1] if len(s) else 0
+        for _ in range(20):
+            a = rng.randint(-2, total + 2)
+            cover = [i for i, t in enumerate(toks) if t["start_offset"] <= a < t["end_offset"]]
+            assert s.containing(a) == (cover[0] if cover else None)
+
+
+def test_extract_remap_clamps_like_the_start_offset_search():
+    # /extract and /clone re-anchor by char offset: the syllable starting at or last
+    # before it, clamped to the text — now one bisection of the stream's prefix sums.
+    from app.routers.texts import _syl_at
+    rng = random.Random(9)
+    assert _syl_at(_stream([]), 0) is None
+    for _ in range(200):
+        s = _stream([t for t in _random_texts(rng) if t] or ["ཀ་"])
+        starts = [t["start_offset"] for t in s.dicts()]
+        for a in range(-2, s.ends[-1] + 3):
+            want = max((i for i, st in enumerate(starts) if st <= a), default=0)
+            assert _syl_at(s, a) == s.ids[want], (a, starts)
+
+
+def test_ids_between_matches_the_list_helper():
+    rng = random.Random(11)
+    s = _stream(_random_texts(rng) + ["ཀ་"] * 5)
+    toks = s.dicts()
+    ids = s.ids + ["missing"]
+    for _ in range(200):
+        a, b = rng.choice(ids), rng.choice(ids)
+        assert s.ids_between(a, b) == syllable_ids_between(toks, a, b)
+        assert s.text_between(a, b) == "".join(
+            toks[s.index_of(i)]["text"] for i in syllable_ids_between(toks, a, b))
+    assert s.index_of("missing") is None
+
+
+def test_run_text_and_membership_match_the_per_id_checks():
+    rng = random.Random(13)
+    for _ in range(100):
+        s = _stream(_random_texts(rng))
+        other = {f"s{i}": 0 for i in range(len(s)) if rng.random() < 0.2}
+        hits = s.member_counts(other)
+        for _ in range(20):
+            a, b = rng.choice(s.ids + ["missing"]), rng.choice(s.ids + ["missing"])
+            span = s.span_between(a, b)
+            ids = s.ids_between(a, b)
+            assert (span is None) == (not ids)
+            if span is None:
+                continue
+            i, j = span
+            assert s.text_of(i, j) == "".join(s.texts[i:j + 1]) == s.text_between(a, b)
+            assert (hits[j + 1] > hits[i]) == any(x in other for x in ids)
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for fn in fns:
+        fn()
+        print("ok", fn.__name__)
+    print(f"\n{len(fns)} passed")
@@ -0,0 +1,64 @@
+"""Streamed JSON bodies (app/streaming.py) are exactly what the response models give.
+
+get_text, get_composed and get_editor_tokens stream their per-syllable arrays without
+validating each entry; the bytes a client parses must not change. The chunk size is
+shrunk so the fragment joins are exercised on a short text.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+from app import db as _dbmod  # noqa: E402
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import init_db, get_db  # noqa: E402
+from app.manifest import load_syllables, persist_syllables  # noqa: E402
+from app import streaming  # noqa: E402
+
+init_db()
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+from app.schemas import ComposedOut, TextDetailOut  # noqa: E402
+
+RAW = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ།\nབྱང་ཆུབ་སེམས་དཔའ།"
+
+
+def test_streamed_bodies_match_the_models(monkeypatch):
+    from app.derivation import compose_secondary, composed_raw_text, edit_range
+    from app.exporters.manifest_exporter import build_editor_tokens
+    from app.routers.texts import _text_detail
+    monkeypatch.setattr(streaming, "_CHUNK", 3)
+    client = TestClient(app)
+    conn = get_db()
+    try:
+        primary = conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text, text_type) "
+            "VALUES ('t.txt', 'Stream', '', ?, 'primary')", (RAW,)).lastrowid
+        persist_syllables(conn, primary, "stream", RAW)
+        conn.commit()
+    finally:
+        conn.close()
+    sec = client.post(f"/api/texts/{primary}/derive", json={}).json()["id"]
+    conn = get_db()
+    try:
+        syls = load_syllables(conn, primary)
+        edit_range(conn, sec, syls[1]["id"], syls[1]["id"], "ཡོན་")   # an override token
+        conn.commit()
+        for tid in (primary, sec):
+            want = TextDetailOut.model_validate(_text_detail(conn, tid)).model_dump(mode="json")
+            assert client.get(f"/api/texts/{tid}").json() == want
+        toks = compose_secondary(conn, sec)
+        want = ComposedOut.model_validate(
+            {"tokens": toks, "raw_text": composed_raw_text(toks)}).model_dump(mode="json")
+        assert client.get(f"/api/texts/{sec}/composed").json() == want
+        assert client.get(f"/api/texts/{sec}/editor-tokens").json() == {"tokens": toks}
+        assert client.get(f"/api/texts/{primary}/editor-tokens").json() == \
+            {"tokens": build_editor_tokens(conn, primary)}
+    finally:
+        conn.close()
+    assert client.get("/api/texts/999999").status_code == 404
@@ -0,0 +1,99 @@
+"""Binary syllable-id storage (app/db.py, SYL_ID_STORAGE = 'blob').
+
+Switching a database to 'blob' re-encodes every stored uuid — syllables.id and each anchor
+column that copies it — as 16 bytes, and switching back restores the strings. Either way
+every read answers exactly what it did before: the conversion lives in ``get_db``'s
+connection and row factory, not in the callers. Non-uuid values are stored as they are.
+Run: `venv/bin/python tests/test_syl_id_storage.py` (or pytest).
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import db as _dbmod  # noqa: E402
+from app import derivation  # noqa: E402
+from app.manifest import load_syllables, persist_syllables  # noqa: E402
+
+LINE = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ། བྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།"
+RAW = "\n".join(f"{LINE}ཀ{i}་" for i in range(100))
+
+
+def _snapshot(conn, parent, sec):
+    return (
+        [(s["id"], s["text"]) for s in load_syllables(conn, parent)],
+        [t["id"] for t in derivation.compose_secondary(conn, sec)],
+        [tuple(r) for r in conn.execute("SELECT syl_id FROM markers ORDER BY id")],
+        [tuple(r) for r in conn.execute(
+            "SELECT op_id, position, syl_id FROM derivation_op_syllables ORDER BY op_id, position")],
+    )
+
+
+def _storage(conn, sql):
+    return {r[0] for r in conn.execute(sql)}
+
+
+def test_blob_storage_round_trips_every_read():
+    saved = _dbmod.DB_PATH, _dbmod.SYL_ID_STORAGE
+    tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    tmp.close()
+    _dbmod.DB_PATH, _dbmod.SYL_ID_STORAGE = tmp.name, "text"
+    try:
+        _dbmod.init_db()
+        conn = _dbmod.get_db()
+        parent = conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text, text_type) "
+            "VALUES ('t.txt', 'P', '', ?, 'primary')", (RAW,)).lastrowid
+        persist_syllables(conn, parent, "syl_storage", RAW)
+        sec = conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text, text_type, "
+            "parent_text_id) VALUES ('t.txt', 'S', '', '', 'secondary', ?)",
+            (parent,)).lastrowid
+        ids = [s["id"] for s in load_syllables(conn, parent)]
+        derivation.edit_range(conn, sec, ids[3], ids[4], "ཡོན་ཏན་")
+        conn.executemany("INSERT INTO markers (text_id, syl_id) VALUES (?, ?)",
+                         [(parent, ids[7]), (parent, "s1")])
+        conn.commit()
+        before = _snapshot(conn, parent, sec)
+        conn.execute("VACUUM")
+        index_text = conn.execute("SELECT SUM(pgsize) FROM dbstat "
+                                  "WHERE name = 'idx_syllables_sylid'").fetchone()[0]
+        conn.close()
+
+        _dbmod.SYL_ID_STORAGE = "blob"
+        _dbmod.init_db()
+        conn = _dbmod.get_db()
+        assert _snapshot(conn, parent, sec) == before
+        assert _storage(conn, "SELECT typeof(id) FROM syllables") == {"blob"}
+        assert _storage(conn, "SELECT typeof(syl_id) FROM derivation_op_syllables") == {"blob"}
+        assert _storage(conn, "SELECT typeof(syl_id) || length(syl_id) FROM markers") == \
+            {"blob16", "text2"}                       # "s1" is not a uuid: kept as is
+        # Reads and writes still speak strings.
+        assert conn.execute("SELECT text FROM syllables WHERE id = ?",
+                            (ids[7],)).fetchone()["text"] == before[0][7][1]
+        derivation.edit_range(conn, sec, ids[9], ids[9], "ཁ་")
+        conn.rollback()
+        conn.execute("VACUUM")
+        index_blob = conn.execute("SELECT SUM(pgsize) FROM dbstat "
+                                  "WHERE name = 'idx_syllables_sylid'").fetchone()[0]
+        assert index_blob < index_text * 0.7
+        conn.close()
+
+        _dbmod.SYL_ID_STORAGE = "text"
+        _dbmod.init_db()
+        conn = _dbmod.get_db()
+        assert _snapshot(conn, parent, sec) == before
+        assert _storage(conn, "SELECT typeof(id) FROM syllables") == {"text"}
+        conn.close()
+    finally:
+        _dbmod.DB_PATH, _dbmod.SYL_ID_STORAGE = saved
+        os.unlink(tmp.name)
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for fn in fns:
+        fn()
+        print("ok", fn.__name__)
+    print(f"\n{len(fns)} passed")
@@ -90,6 +90,88 @@ def test_first_ingest_keeps_fresh_ids():
     assert fresh[0]["id"] == "f0"
 
 
+def _long_text(n, seed=0):
+    import random
+    rng = random.Random(seed)
+    vocab = ["པ་", "བ་", "ཀ་", "སངས་", "རྒྱས་", "ཆོས་", "།"] + [f"s{i}་" for i in range(2000)]
+    return [rng.choice(vocab) for _ in range(n)]
+
+
+def _replay(old, new, opcodes):
+    """Rebuild ``new`` from ``old`` + opcodes: they must be a complete, ordered alignment."""
+    out, a, b = [], 0, 0
+    for tag, a1, a2, b1, b2 in opcodes:
+        assert (a1, b1) == (a, b), (tag, a1, b1, a, b)
+        if tag == "equal":
+            assert old[a1:a2] == new[b1:b2]
+        out.extend(new[b1:b2])
+        a, b = a2, b2
+    assert (a, b) == (len(old), len(new)) and out == new
+
+
+def test_anchored_windows_align_far_apart_edits():
+    from app import token_align
+    old = _long_text(20000)
+    new = old[:]
+    new[50] = "X"
+    new.insert(10000, "Y")
+    del new[19000]
+    opcodes = token_align._opcodes(old, new)
+    _replay(old, new, opcodes)
+    # Only the three edits are non-equal, and the windows between them were cut.
+    assert sum(max(a2 - a1, b2 - b1) for t, a1, a2, b1, b2 in opcodes if t != "equal") == 3
+    assert token_align._anchors(old, new, 51, len(old) - 1000, 51, len(new) - 1000)
+    out = _carry(old, new)
+    assert out[:50] == [f"o{i}" for i in range(50)] and out[-900:] == \
+        [f"o{i}" for i in range(len(old) - 900, len(old))]
+    assert out.count("MINT") == 1       # only the inserted "Y"
+
+
+def test_anchored_move_pass_stays_global():
+    # A 600-token block moved across the text keeps every id: its tokens fall in
+    # different windows, and the move pass pairs them across all of them.
+    from app import token_align
+    old = _long_text(6000, seed=1)
+    new = old[:1000] + old[1600:5000] + old[1000:1600] + old[5000:]
+    _replay(old, new, token_align._opcodes(old, new))
+    out = _carry(old, new)
+    assert "MINT" not in out and sorted(out) == sorted(f"o{i}" for i in range(len(old)))
+    assert out[4400:5000] == [f"o{i}" for i in range(1000, 1600)]
+
+
+def test_block_move_keeps_its_own_ids_next_to_a_deleted_block():
+    # Block A is deleted and block B moved: both share common syllables. Paired run
+    # for run, every syllable of B keeps its own id and none of A's ids comes back.
+    old = _long_text(8000, seed=2)
+    new = old[:500] + old[1000:3000] + old[6000:] + old[3000:6000]
+    out = _carry(old, new)
+    moved = out[len(new) - 3000:] + out[2500:4500]
+    assert sorted(moved) == sorted([f"o{i}" for i in range(3000, 6000)] +
+                                   [f"o{i}" for i in range(6000, 8000)])
+    assert not any(o.startswith("o") and 500 <= int(o[1:]) < 1000 for o in out)
+
+
+def test_anchor_is_unique_among_all_old_offsets():
+    # A verse recited twice, the copies off each other's sampling grid; the first is
+    # deleted. Its sampled run occurs once among the samples but twice in the old text,
+    # so it must not anchor the survivor — which keeps the second copy's ids.
+    from app import token_align
+    base = _long_text(4000, seed=3)
+    verse = [f"v{i}་" for i in range(40)]
+    r1, r2, r3 = base[:2000], base[2000:2005], base[2005:]
+    old = r1 + verse + r2 + verse + r3
+    new = r1 + r2 + verse + r3
+    new[0], new[-1] = "X", "Y"          # no common affix: the whole text is one window
+    anchors = token_align._anchors(old, new, 1, len(old) - 1, 1, len(new) - 1)
+    assert anchors
+    k = token_align._ANCHOR_RUN
+    for i, _j in anchors:
+        run = old[i:i + k]
+        assert sum(old[x:x + k] == run for x in range(1, len(old) - k)) == 1, i
+    second = len(r1) + len(verse) + len(r2)
+    assert _carry(old, new)[len(r1) + len(r2):][:40] == [f"o{i}" for i in range(second, second + 40)]
+
+
 if __name__ == "__main__":
     fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
     for fn in fns:
@@ -0,0 +1,89 @@
+"""POST /api/texts tiles off the event loop (app/tokenize_pool.py).
+
+The upload's syllable layer must be exactly what ``persist_syllables`` builds inline,
+whether the tiling ran in the warm process pool or (``SAPCHE_TOKENIZE_WORKERS=0``) on a
+thread, and concurrent uploads through the bounded pool must all land.
+Run: `venv/bin/python tests/test_tokenize_pool.py` (or pytest).
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+_tmp.close()
+from app import db as _dbmod  # noqa: E402
+_dbmod.DB_PATH = _tmp.name
+
+from app.db import init_db, get_db  # noqa: E402
+from app.manifest import load_syllables, persist_syllables  # noqa: E402
+from app import tokenize_pool  # noqa: E402
+
+init_db()
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.main import app  # noqa: E402
+
+SOURCE = "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ།\r\nབྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི།  ༄༅། །"
+
+
+def _upload(client, name):
+    r = client.post("/api/texts", files={"file": (f"{name}.txt", SOURCE.encode("utf-8"))},
+                    data={"instance_id": name})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def _assert_inline_equivalent(text_id):
+    conn = get_db()
+    try:
+        row = conn.execute("SELECT raw_text, instance_id FROM texts WHERE id = ?",
+                           (text_id,)).fetchone()
+        got = load_syllables(conn, text_id)
+        scratch = conn.execute(
+            "INSERT INTO texts (filename, title, source_text, raw_text) VALUES ('s', 's', '', ?)",
+            (row["raw_text"],)).lastrowid
+        persist_syllables(conn, scratch, row["instance_id"], row["raw_text"])
+        want = load_syllables(conn, scratch)
+        conn.rollback()
+    finally:
+        conn.close()
+    assert [(s["id"], s["text"], s["nature"]) for s in got] == \
+        [(s["id"], s["text"], s["nature"]) for s in want]
+
+
+def test_upload_through_the_process_pool():
+    body = _upload(TestClient(app), "pooled")
+    pool = tokenize_pool.executor()
+    assert pool is not None
+    # Never forked from the (threaded) server process.
+    assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+    assert "".join(u[2] for u in body["units"]) == body["raw_text"]
+    _assert_inline_equivalent(body["id"])
+
+
+def test_upload_on_a_thread_when_the_pool_is_off():
+    os.environ["SAPCHE_TOKENIZE_WORKERS"] = "0"
+    try:
+        assert tokenize_pool.executor() is None
+        _assert_inline_equivalent(_upload(TestClient(app), "threaded")["id"])
+    finally:
+        del os.environ["SAPCHE_TOKENIZE_WORKERS"]
+
+
+def test_concurrent_tilings_share_the_bounded_pool():
+    async def many():
+        return await asyncio.gather(*(tokenize_pool.prepare_async(SOURCE) for _ in range(6)))
+    results = asyncio.run(many())
+    assert all(r == results[0] for r in results)
+    assert tokenize_pool.prepare_text(SOURCE) == results[0]
+
+
+if __name__ == "__main__":
+    fns = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for fn in fns:
+        fn()
+        print("ok", fn.__name__)
+    print(f"\n{len(fns)} passed")
@@ -15,8 +15,11 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
 
-from app.tokenizer import prepare_and_tokenize, simple_syllable_tokenize, normalize_spaces
-from app.manifest import generate_syllables, tile_line
+from app.tokenizer import (
+    prepare_and_tokenize, simple_syllable_tokenize, normalize_spaces, fold_punct_newlines,
+)
+from app import manifest
+from app.manifest import generate_syllables, tile_line, tile_cache_info, _tile_line
 # (The transcript-import tests that lived here exercised app/transcript_manifest.py,
 # a sapche_discovery module that was never ported — transcripts are not a pecha-form
 # feature. They were dropped with the module, not skipped.)
@@ -196,3 +199,82 @@ def test_tile_line_gathers_extra_tsek_runs():
         # Always tiles the line exactly.
         assert "".join(t for _, t in got) == line, f"{line!r} -> {got!r}"
         assert got == expected, f"{line!r} -> {got!r} (expected {expected!r})"
+
+
+def test_tile_line_cache_serves_repeated_lines():
+    line = "ཨོཾ་མ་ཎི་པདྨེ་ཧཱུྃ། ཨོཾ་མ་ཎི་པདྨེ་ཧཱུྃ། །"
+    first = tile_line(line)
+    before = tile_cache_info()
+    raw = "\n".join([line] * 5)
+    syls = generate_syllables(raw, "cache")
+    after = tile_cache_info()
+    assert after.hits - before.hits == 5 and after.misses == before.misses
+    assert "".join(s["text"] for s in syls) == raw
+    # Cached chunks are exactly the uncached ones, and callers get their own list.
+    assert first == _tile_line(line)
+    first.clear()
+    assert tile_line(line) == _tile_line(line)
+
+
+def test_fast_path_tiles_exactly_as_botok():
+    """The regex fast path (manifest._FAST_LINE) must agree with botok chunk for chunk on
+    every line it accepts, and must reject what only botok can decide.
+    benchmarks/bench_tile_line.py runs the same check over a whole corpus."""
+    import random
+    rng = random.Random(7)
+    cons, sub, vow = manifest._FAST_CONS, manifest._FAST_SUB, manifest._FAST_VOW
+    ends = ["་", "་", "་ ", "", "། ", "།", "།། །།", " །", " "]
+    lines = [
+        "སངས་རྒྱས་ཆོས་དང་ཚོགས་ཀྱི་མཆོག་རྣམས་ལ།",
+        "བྱང་ཆུབ་བར་དུ་བདག་ནི་སྐྱབས་སུ་མཆི། །བདག་གིས་སྦྱིན་སོགས་བགྱིས་པའི་བསོད་ནམས་ཀྱིས།།",
+        "། ཀ་ཁ", "ཀ།། །།ཁ", "",
+    ]
+    for _ in range(300):
+        lines.append("".join(
+            rng.choice(cons) + "".join(rng.choice(cons + sub + vow)
+                                       for _ in range(rng.randint(0, 3))) + rng.choice(ends)
+            for _ in range(rng.randint(1, 8))))
+    accepted = [line for line in lines if manifest._FAST_LINE.fullmatch(line)]
+    assert len(accepted) > 100
+    for line in accepted:
+        assert manifest._tile_line_fast(line) == _tile_line(line), line
+    for line in ["ཀ་ ། ཁ", "ཀ ཁ", " ཀ་", "ཀ་་ཁ", "༄༅། །ཀ", "ཨོཾ་", "༡༢ ཀ", "ཀ་abc"]:
+        assert not manifest._FAST_LINE.fullmatch(line), line
+
+
+def _reference_normalize_spaces(text):
+    # The per-character definition normalize_spaces' translate table implements.
+    import unicodedata
+    return "".join(" " if unicodedata.category(c) == "Zs" and c != " "
+                   else ("་" if c == "༌" else c) for c in text)
+
+
+def _reference_fold_punct_newlines(text):
+    # The neighbour-scan definition fold_punct_newlines' regex implements.
+    punct, space = set("།༎༏༐༑༔༴༄༅༆༇༈༉༊༼"), (" ", "\t", "\n")
+    chars = list(text)
+    for i, c in enumerate(chars):
+        if c != "\n":
+            continue
+        j = i - 1
+        while j >= 0 and chars[j] in space:
+            j -= 1
+        k = i + 1
+        while k < len(chars) and chars[k] in space:
+            k += 1
+        if j >= 0 and k < len(chars) and chars[j] in punct and chars[k] in punct:
+            chars[i] = " "
+    return "".join(chars)
+
+
+def test_space_and_newline_folds_match_their_definitions():
+    import random
+    rng = random.Random(11)
+    alphabet = "ཀཁ་༌།༎༔༄༅༼ \t\n\u00a0\u2003\u3000\u200bab"
+    for _ in range(3000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        spaced = normalize_spaces(text)
+        assert spaced == _reference_normalize_spaces(text), repr(text)
+        folded = fold_punct_newlines(text)
+        assert folded == _reference_fold_punct_newlines(text), repr(text)
+        assert len(spaced) == len(folded) == len(text)
@@ -187,10 +187,69 @@ def test_unanchored_own_section_lands_at_the_end():
     assert _roots(child)[-1]["id"] == free["id"]
 
 
+def _scan_order_level(nodes, own_text_id):
+    """``_order_level``'s mixed-level splice as a plain scan: each own node after the
+    last placed node anchored at or before it (display slot and unanchored rules as
+    documented there). The bisection must agree with it on every level."""
+    if len({n["owner_text_id"] for n in nodes}) <= 1:
+        return sorted(nodes, key=lambda n: n["position"])
+    base = sorted((n for n in nodes if n["owner_text_id"] != own_text_id),
+                  key=lambda n: n["position"])
+    own = sorted((n for n in nodes if n["owner_text_id"] == own_text_id),
+                 key=lambda n: n["position"])
+    out, offsets, last = list(base), [], None
+    for n in base:
+        last = n["segment_start"] if n["segment_start"] is not None else last
+        offsets.append(last)
+    after = len(out)
+    for n in own:
+        o, before_id = n["segment_start"], n["display_before_node_id"]
+        if before_id is not None and any(x["id"] == before_id for x in out):
+            idx = next(i for i, x in enumerate(out) if x["id"] == before_id)
+        elif o is None:
+            idx = after
+        else:
+            idx = max((i + 1 for i, bo in enumerate(offsets) if bo is not None and bo <= o),
+                      default=0)
+        out.insert(idx, n)
+        offsets.insert(idx, o if o is not None else (offsets[idx - 1] if idx else None))
+        after = idx + 1
+    return out
+
+
+def test_mixed_level_splice_matches_a_scan():
+    import random
+    from app.routers.tree_nodes import _order_level
+    rng = random.Random(5)
+    for _ in range(500):
+        nodes = []
+        for i in range(rng.randint(2, 30)):
+            own = rng.random() < 0.4
+            nodes.append({
+                "id": i, "owner_text_id": 2 if own else 1, "position": rng.randint(0, 40),
+                "segment_start": None if rng.random() < 0.25 else rng.randint(0, 60),
+                "display_before_node_id": None})
+        if rng.random() < 0.5:       # inherited anchors in reading order (the bisected case)
+            anchored = sorted(n["segment_start"] for n in nodes
+                              if n["owner_text_id"] == 1 and n["segment_start"] is not None)
+            for n, o in zip(sorted((n for n in nodes if n["owner_text_id"] == 1
+                                    and n["segment_start"] is not None),
+                                   key=lambda n: (n["position"], n["id"])), anchored):
+                n["segment_start"] = o
+        for n in nodes:
+            if n["owner_text_id"] == 2 and rng.random() < 0.15:
+                n["display_before_node_id"] = rng.randrange(len(nodes) + 2)
+        for n in nodes:               # distinct positions per owner: a total order
+            n["position"] = (n["position"], n["id"])
+        want = [n["id"] for n in _scan_order_level(nodes, 2)]
+        assert [n["id"] for n in _order_level(nodes, 2)] == want
+
+
 if __name__ == "__main__":
     test_own_section_splices_among_inherited_by_its_anchor()
     test_own_subsection_nests_under_an_inherited_parent()
     test_secondary_sections_are_numbered_independently_of_inherited_ones()
     test_single_owner_level_keeps_its_stored_order()
     test_unanchored_own_section_lands_at_the_end()
+    test_mixed_level_splice_matches_a_scan()
     print("ok")
@@ -1028,12 +1028,35 @@ export async function acceptSuggestion(id: number, mode: 'stage' | 'ripple') {
   return res.json();
 }
 
+export interface BakeJob {
+  id: number;
+  text_id: number;
+  status: 'queued' | 'running' | 'done' | 'failed';
+  baked: boolean;
+  error: string | null;
+  timings: Record<string, number>;   // per-phase ms: splice, tokenize, align, write, snap
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
+export const queueApplyCorrections = (id: number) =>
+  jfetch<BakeJob>(`${API_BASE}/texts/${id}/apply-corrections/jobs`, { method: 'POST' });
+export const getBakeJob = (id: number, jobId: number) =>
+  jfetch<BakeJob>(`${API_BASE}/texts/${id}/bake-jobs/${jobId}`);
+
 // Bake all staged suggestions into the primary's base layer (stable syllable uuids
-// survive), so the corrections ripple to every text derived from it, any depth.
-export async function applyCorrections(id: number) {
-  const res = await apiFetch(`${API_BASE}/texts/${id}/apply-corrections`, { method: 'POST' });
-  if (!res.ok) throw new Error(await res.text());
-  return res.json();
+// survive), so the corrections ripple to every text derived from it, any depth. Runs as
+// a queued job on the server (a long bake holds no request open); resolves once it is
+// done, rejects with the job's error if it failed.
+export async function applyCorrections(id: number, pollMs = 500): Promise<BakeJob> {
+  let job = await queueApplyCorrections(id);
+  while (job.status === 'queued' || job.status === 'running') {
+    await new Promise(r => setTimeout(r, pollMs));
+    job = await getBakeJob(id, job.id);
+  }
+  if (job.status === 'failed') throw new Error(job.error || 'Bake failed');
+  return job;
 }
 
 // Duplicate a primary text with its edits/deletions baked in (raw_text = corrected text).
@@ -1151,19 +1174,31 @@ export async function getComposed(textId: number): Promise<ComposedResult> {
   return res.json();
 }
 
+// What an edit did to the composed stream (`?delta=true` on the edit endpoints):
+// tokens[start, start + delete_count) became `tokens`, and every later token shifts by
+// the change in count (idx) and by `offset_shift` (offsets). `length` = the new count.
+// The edit endpoints answer with this instead of the whole recomposed stream.
+export interface ComposedDelta {
+  start: number;
+  delete_count: number;
+  tokens: EditorToken[];
+  offset_shift: number;
+  length: number;
+}
+
 // Edit a run of a secondary text as free text; the backend tokenizes + aligns the
 // new text against the parent run (by syllable uuid) and persists derivation ops.
 export async function editRange(
   textId: number,
   body: { start_syl_id: string; end_syl_id: string; new_text: string },
-): Promise<ComposedResult> {
-  const res = await apiFetch(`${API_BASE}/texts/${textId}/edit-range`, {
+): Promise<ComposedDelta> {
+  const res = await apiFetch(`${API_BASE}/texts/${textId}/edit-range?delta=true`, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(body),
   });
   if (!res.ok) throw new Error(await res.text());
-  return res.json();
+  return (await res.json()).delta;
 }
 
 // Splice a range from another text into a secondary text (links, not copies).
@@ -1177,20 +1212,21 @@ export async function transclude(
      *  stands as a segment of its own — what the separator's "+" asks for. */
     as_segment?: boolean;
   },
-): Promise<ComposedResult> {
-  const res = await apiFetch(`${API_BASE}/texts/${textId}/transclude`, {
+): Promise<ComposedDelta> {
+  const res = await apiFetch(`${API_BASE}/texts/${textId}/transclude?delta=true`, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(body),
   });
   if (!res.ok) throw new Error(await res.text());
-  return res.json();
+  return (await res.json()).delta;
 }
 
-export async function deleteDerivationOp(opId: number) {
-  const res = await apiFetch(`${API_BASE}/derivation-ops/${opId}`, { method: 'DELETE' });
+// Undo one derivation op; answers with the splice it made to the composed stream.
+export async function deleteDerivationOp(opId: number): Promise<ComposedDelta | undefined> {
+  const res = await apiFetch(`${API_BASE}/derivation-ops/${opId}?delta=true`, { method: 'DELETE' });
   if (!res.ok) throw new Error(await res.text());
-  return res.json();
+  return (await res.json()).delta ?? undefined;
 }
 
 // A secondary's edit ops (the sidebar's analogue of a primary's suggestions list —
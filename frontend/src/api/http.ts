@@ -76,7 +76,8 @@ export async function apiFetch(url: string, init?: RequestInit): Promise<Respons
     if (orgId != null && !headers.has('X-Org-Id')) headers.set('X-Org-Id', String(orgId));
   }
   const res = await fetch(url, { ...init, headers, credentials: 'include' });
-  if (res.ok) return res;
+  // A 304 answers a caller's own If-None-Match: it is theirs to handle, not an error.
+  if (res.ok || res.status === 304) return res;
   const detail = await res.text();
   // /auth endpoints speak 401 as part of their contract (bad password, no session
   // yet) — only a 401 on a DATA request means the session died under us.
@@ -680,7 +680,11 @@ export const SegmentCard = React.memo(function SegmentCard({ segment, nextSegmen
                 ? `Remove the transcluded “${srcTitle}” from this text?`
                 : 'Remove this transclusion?')) return;
               void deleteDerivationOp(opId)
-                .then(() => loadText(currentText.id))
+                .then(delta => {
+                  if (!useEditorTokenStore.getState().applyDelta(currentText.id, delta)) {
+                    return loadText(currentText.id);
+                  }
+                })
                 .catch((err: any) => alert('Could not remove it: ' + (err?.message || err)));
             }}
             className="align-super text-[9px] px-0.5 mx-0.5 rounded cursor-pointer select-none"
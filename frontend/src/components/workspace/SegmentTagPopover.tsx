@@ -176,10 +176,13 @@ export const SegmentTagPopover: React.FC<Props> = ({ segment, selection, trailin
       try {
         const selected = currentText.raw_text.substring(selection.start, selection.end);
         const newText = suggestMode === 'insert-after' ? selected + suggestText : suggestText;
-        await editRange(currentText.id, {
+        const delta = await editRange(currentText.id, {
           start_syl_id: selection.startSylId, end_syl_id: selection.endSylId, new_text: newText,
         });
-        await loadText(currentText.id);  // full refresh — the composed text changed
+        // The splice patches the text in place; a full reload only when it can't.
+        if (!useEditorTokenStore.getState().applyDelta(currentText.id, delta)) {
+          await loadText(currentText.id);
+        }
         onClose();
       } catch (err: any) {
         setError(err.message);
@@ -338,10 +341,12 @@ export const SegmentTagPopover: React.FC<Props> = ({ segment, selection, trailin
     try {
       if (currentText.text_type === 'secondary') {
         // A secondary's deletion is a derivation op (edit the run to nothing).
-        await editRange(currentText.id, {
+        const delta = await editRange(currentText.id, {
           start_syl_id: selection.startSylId, end_syl_id: selection.endSylId, new_text: '',
         });
-        await loadText(currentText.id);
+        if (!useEditorTokenStore.getState().applyDelta(currentText.id, delta)) {
+          await loadText(currentText.id);
+        }
       } else {
         // Anchor the delete-suggestion by syllable ids (Part 6): deleting the full last
         // segment must not be rejected by the units_json boundary check.
@@ -1,6 +1,7 @@
 import React, { useEffect, useMemo, useState } from 'react';
 import { createPortal } from 'react-dom';
 import { listDerivationOps, deleteDerivationOp, applyCorrections, acceptSuggestion, type DerivationOp } from '../../api/client';
+import { useEditorTokenStore } from '../../store/useEditorTokenStore';
 import { useTreeNodeStore } from '../../store/useTreeNodeStore';
 import { useTagStore, type Tag, selectRegularTags, selectSessionTags } from '../../store/useTagStore';
 import { useNoteStore, type Note } from '../../store/useNoteStore';
@@ -586,7 +587,7 @@ export const Sidebar: React.FC = () => {
 
   // A secondary's edits are derivation ops (not suggestions): the same panel lists
   // them, delete-to-undo. Refetched whenever the open text changes identity (which a
-  // post-edit loadText refresh triggers).
+  // post-edit loadText refresh, or an edit's delta patching the text, triggers).
   const isSecondary = currentText?.text_type === 'secondary';
   const [ops, setOps] = useState<DerivationOp[]>([]);
   useEffect(() => {
@@ -602,8 +603,10 @@ export const Sidebar: React.FC = () => {
   }, [currentText]);
   const handleDeleteOp = async (opId: number) => {
     try {
-      await deleteDerivationOp(opId);
-      if (currentText) await loadText(currentText.id);  // recompose + refresh panels
+      const delta = await deleteDerivationOp(opId);
+      if (currentText && !useEditorTokenStore.getState().applyDelta(currentText.id, delta)) {
+        await loadText(currentText.id);  // recompose + refresh panels
+      }
     } catch (e: any) {
       alert('Failed to undo edit: ' + (e?.message || e));
     }
@@ -102,12 +102,13 @@ export const TaggerPane: React.FC = () => {
   const fullscreen = useUIStore(s => s.workspaceFullscreen);
 
   const editorTokens = useEditorTokenStore(s => s.tokens);
-  const fetchEditorTokens = useEditorTokenStore(s => s.fetchTokens);
+  const syncEditorTokens = useEditorTokenStore(s => s.syncTo);
   // (Re)fetch the corrected syllable layer for the body whenever the document or
-  // its suggestions change (a correction edits the corrected text).
+  // its suggestions change (a correction edits the corrected text) — except when an
+  // edit's delta has just patched the tokens along with the text.
   useEffect(() => {
-    if (currentText) fetchEditorTokens(currentText.id);
-  }, [currentText, suggestions, fetchEditorTokens]);
+    if (currentText) syncEditorTokens(currentText);
+  }, [currentText, suggestions, syncEditorTokens]);
 
   const segments = useMemo(() => {
     if (!currentText) return [];
@@ -207,7 +208,7 @@ export const TaggerPane: React.FC = () => {
       })
       .catch(() => { if (!cancelled) savingEnabledRef.current = true; });
     return () => { cancelled = true; };
-  }, [currentText]);
+  }, [currentText?.id]);
 
   // Re-pin the saved segment to the top after every render, before paint, while restore is
   // armed. Because async body re-renders (token/marker/note loads) each trigger this, any
@@ -247,7 +248,7 @@ export const TaggerPane: React.FC = () => {
       window.removeEventListener('keydown', takeOverKey);
       flushSave(id);
     };
-  }, [currentText]);
+  }, [currentText?.id]);
 
   if (!currentText) return null;
 
@@ -1,13 +1,10 @@
 import React, { useEffect, useMemo, useState } from 'react';
 import { useTextStore } from '../../store/useTextStore';
 import { useTagStore } from '../../store/useTagStore';
-import { useMarkerStore } from '../../store/useMarkerStore';
-import { useSuggestionStore } from '../../store/useSuggestionStore';
 import { useNoteStore } from '../../store/useNoteStore';
 import { useTreeNodeStore } from '../../store/useTreeNodeStore';
-import { usePassageStore } from '../../store/usePassageStore';
 import { useUIStore, type LineBreakGroup } from '../../store/useUIStore';
-import { useDisplayBreakStore } from '../../store/useDisplayBreakStore';
+import { loadWorkspaceLayers } from '../../store/loadWorkspaceLayers';
 import { useCan } from '../../store/usePermissions';
 import { SplitPane } from './SplitPane';
 import { TreePane } from './TreePane';
@@ -29,16 +26,10 @@ const LINE_BREAK_GROUP_OPTIONS: { key: LineBreakGroup; label: string; hint: stri
 export const WorkspaceView: React.FC = () => {
   const currentText = useTextStore(s => s.currentText);
   const fetchTags = useTagStore(s => s.fetchTags);
-  const fetchSpans = useTagStore(s => s.fetchSpans);
-  const fetchMarkers = useMarkerStore(s => s.fetchMarkers);
-  const fetchSuggestions = useSuggestionStore(s => s.fetchSuggestions);
-  const fetchNotes = useNoteStore(s => s.fetchNotes);
   const fetchCategories = useNoteStore(s => s.fetchCategories);
   const fetchNodes = useTreeNodeStore(s => s.fetchNodes);
   const saveStatus = useTreeNodeStore(s => s.saveStatus);
   const treeError = useTreeNodeStore(s => s.error);
-  const fetchPassages = usePassageStore(s => s.fetchPassages);
-  const fetchBreaks = useDisplayBreakStore(s => s.fetchBreaks);
   const editMode = useUIStore(s => s.editMode);
   const setEditMode = useUIStore(s => s.setEditMode);
   const searchQuery = useUIStore(s => s.searchQuery);
@@ -109,20 +100,16 @@ export const WorkspaceView: React.FC = () => {
     setSearchMatchIndex(next);
   };
 
-  // Load all per-document data when the active document changes.
+  // Load all per-document data when the active document changes. The annotation
+  // layers arrive together in one bundle request (loadWorkspaceLayers).
   useEffect(() => {
     if (!currentText) return;
     const id = currentText.id;
     fetchTags(id);
-    fetchSpans(id);
-    fetchMarkers(id);
-    fetchSuggestions(id);
-    fetchNotes(id);
+    loadWorkspaceLayers(id);
     fetchCategories(id);
     fetchNodes(id);
-    fetchPassages(id);
-    fetchBreaks(id);
-  }, [currentText, refreshNonce, fetchTags, fetchSpans, fetchMarkers, fetchSuggestions, fetchNotes, fetchCategories, fetchNodes, fetchPassages, fetchBreaks]);
+  }, [currentText, refreshNonce, fetchTags, fetchCategories, fetchNodes]);
 
   if (!currentText) {
     return (
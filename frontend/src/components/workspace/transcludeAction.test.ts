@@ -0,0 +1,100 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+import type { ComposedDelta, EditorToken } from '../../api/client';
+
+vi.mock('../../api/client', async (importOriginal) => ({
+  ...(await importOriginal<typeof import('../../api/client')>()),
+  getText: vi.fn(),
+  getEditorTokens: vi.fn(),
+  transclude: vi.fn(),
+  listDerivationOps: vi.fn(),
+  deleteDerivationOp: vi.fn(),
+}));
+
+import * as api from '../../api/client';
+import { transcludeInto } from './transcludeAction';
+import { useEditorTokenStore } from '../../store/useEditorTokenStore';
+import { useTextStore, type TextDetail } from '../../store/useTextStore';
+import { useUndoStore } from '../../store/useUndoStore';
+
+/**
+ * A secondary's edit answers with its splice, and that splice IS the refresh: the open
+ * text and the tagger's tokens are patched in place, so neither getText nor a token
+ * refetch follows — not from the edit, nor from the tagger's effect on the new text.
+ */
+
+const tok = (idx: number, text: string, start: number): EditorToken => ({
+  idx,
+  id: `s${idx}`,
+  text,
+  nature: 'TEXT',
+  inserted: false,
+  start_offset: start,
+  end_offset: start + text.length,
+});
+
+const HELD: EditorToken[] = [tok(0, 'ka ', 0), tok(1, 'kha ', 3), tok(2, 'ga ', 7)];
+
+const TEXT = {
+  id: 7, filename: 't.txt', title: 'T', text_group: null, text_type: 'secondary',
+  parent_text_id: 1, cloned_from_text_id: null, has_clone: false, created_at: '',
+  updated_at: '', span_count: 0, tag_count: 0,
+  raw_text: 'ka kha ga ',
+  units: HELD.map(t => [t.start_offset, t.end_offset, t.text] as [number, number, string]),
+} satisfies TextDetail;
+
+// Transclude "ca " after "kha ", and the inverse splice Undo gets back.
+const IN: ComposedDelta = {
+  start: 2, delete_count: 0, offset_shift: 3, length: 4,
+  tokens: [{ ...tok(2, 'ca ', 7), id: 'x0', source: 'transclusion', src_text_id: 3 }],
+};
+const OUT: ComposedDelta = { start: 2, delete_count: 1, tokens: [], offset_shift: -3, length: 3 };
+
+beforeEach(() => {
+  vi.clearAllMocks();
+  useTextStore.setState({ currentText: TEXT });
+  useEditorTokenStore.setState({ tokens: HELD, textId: 7, patchedFor: null });
+  useUndoStore.getState().clear();
+  vi.mocked(api.transclude).mockResolvedValue(IN);
+  vi.mocked(api.deleteDerivationOp).mockResolvedValue(OUT);
+  vi.mocked(api.listDerivationOps).mockResolvedValue(
+    [{ id: 5, text_id: 7, op_kind: 'transclude', anchor_syl_id: 's1', summary: 'T' }]);
+});
+
+describe('a delta edit', () => {
+  it('patches the text and tokens without fetching either', async () => {
+    const reload = vi.fn();
+    await transcludeInto({ textId: 7, srcTextId: 3, anchorSylId: 's1', reload });
+    const text = useTextStore.getState().currentText!;
+    expect(text.raw_text).toBe('ka kha ca ga ');
+    expect(text.units).toEqual([[0, 3, 'ka '], [3, 7, 'kha '], [7, 10, 'ca '], [10, 13, 'ga ']]);
+    // What the tagger's effect does on the new text: already in step, no fetch.
+    await useEditorTokenStore.getState().syncTo(text);
+    expect(useEditorTokenStore.getState().tokens.map(t => t.id)).toEqual(['s0', 's1', 'x0', 's2']);
+
+    await useUndoStore.getState().history[0].undo();
+    await useEditorTokenStore.getState().syncTo(useTextStore.getState().currentText!);
+    expect(useTextStore.getState().currentText!.raw_text).toBe(TEXT.raw_text);
+    expect(useTextStore.getState().currentText!.units).toEqual(TEXT.units);
+
+    expect(reload).not.toHaveBeenCalled();
+    expect(api.getText).not.toHaveBeenCalled();
+    expect(api.getEditorTokens).not.toHaveBeenCalled();
+  });
+
+  it('falls back to the full reload when the splice does not line up', async () => {
+    vi.mocked(api.transclude).mockResolvedValue({ ...IN, length: 9 });
+    const reload = vi.fn();
+    await transcludeInto({ textId: 7, srcTextId: 3, anchorSylId: 's1', reload });
+    expect(reload).toHaveBeenCalledWith(7);
+    expect(useTextStore.getState().currentText).toBe(TEXT);
+  });
+
+  it('still refetches when the suggestions change after a patch', async () => {
+    vi.mocked(api.getEditorTokens).mockResolvedValue(HELD);
+    expect(useEditorTokenStore.getState().applyDelta(7, IN)).toBe(true);
+    const text = useTextStore.getState().currentText!;
+    await useEditorTokenStore.getState().syncTo(text);
+    await useEditorTokenStore.getState().syncTo(text);
+    expect(api.getEditorTokens).toHaveBeenCalledTimes(1);
+  });
+});
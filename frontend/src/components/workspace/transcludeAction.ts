@@ -2,6 +2,7 @@ import {
   transclude, listDerivationOps, deleteDerivationOp,
 } from '../../api/client';
 import { useUndoStore } from '../../store/useUndoStore';
+import { useEditorTokenStore } from '../../store/useEditorTokenStore';
 
 /**
  * Bring another text in, from either entry point: the selection popover ("after this
@@ -9,8 +10,9 @@ import { useUndoStore } from '../../store/useUndoStore';
  *
  * One helper because the two must behave the same afterwards — a transclusion splices a whole
  * text in at once, and the first thing anyone reaches for after a mistaken one is Undo. The
- * endpoint answers with the recomposed text rather than the op it created, so the row is read
- * back: the newest transclude op of this text is the one just made.
+ * endpoint answers with the splice it made to the composed text rather than the op it created,
+ * so the row is read back: the newest transclude op of this text is the one just made. The
+ * splice (and Undo's) patches the open text in place; `reload` runs only when it can't.
  */
 export async function transcludeInto(args: {
   textId: number;
@@ -22,20 +24,24 @@ export async function transcludeInto(args: {
   reload: (textId: number) => Promise<unknown> | unknown;
 }): Promise<void> {
   const { textId, srcTextId, anchorSylId, anchorOpId, asSegment, reload } = args;
-  await transclude(textId, {
+  const delta = await transclude(textId, {
     anchor_syl_id: anchorSylId,
     src_text_id: srcTextId,
     ...(anchorOpId != null ? { anchor_op_id: anchorOpId } : {}),
     ...(asSegment ? { as_segment: true } : {}),
   });
+  const applied = useEditorTokenStore.getState().applyDelta(textId, delta);
   const ops = await listDerivationOps(textId).catch(() => []);
   const mine = ops.filter(o => o.op_kind === 'transclude');
   const op = mine.length ? mine[mine.length - 1] : null;
   if (op) {
     useUndoStore.getState().push({
       description: op.summary || 'Transclusion',
-      undo: async () => { await deleteDerivationOp(op.id); await reload(textId); },
+      undo: async () => {
+        const undone = await deleteDerivationOp(op.id);
+        if (!useEditorTokenStore.getState().applyDelta(textId, undone)) await reload(textId);
+      },
     });
   }
-  await reload(textId);
+  if (!applied) await reload(textId);
 }
@@ -0,0 +1,48 @@
+import { API_BASE, type Passage } from '../api/client';
+import { apiFetch } from '../api/http';
+import { useTagStore, type Span } from './useTagStore';
+import { useMarkerStore, type Marker } from './useMarkerStore';
+import { useNoteStore, type Note } from './useNoteStore';
+import { usePassageStore } from './usePassageStore';
+import { useDisplayBreakStore } from './useDisplayBreakStore';
+import { useSuggestionStore, type Suggestion } from './useSuggestionStore';
+
+/**
+ * Opening a text in the workspace: its annotation layers come from ONE
+ * `GET /texts/{id}/bundle` — one connection and one stream composition server-side —
+ * instead of a request per layer, and land in their stores exactly as the per-layer
+ * fetches would set them (the bundle serves the same payloads). The outline keeps its
+ * own ETag-revalidated `fetchNodes`; tags and note categories aren't bundle layers.
+ */
+const LAYERS = 'spans,markers,notes,passages,display_breaks,suggestions';
+
+interface WorkspaceBundle {
+  spans: Span[];
+  markers: Marker[];
+  notes: Note[];
+  passages: Passage[];
+  display_breaks: { syl_id: string; count: number }[];
+  suggestions: Suggestion[];
+}
+
+export async function loadWorkspaceLayers(textId: number): Promise<void> {
+  useTagStore.setState({ loading: true, error: null });
+  useNoteStore.setState({ loading: true, error: null });
+  useSuggestionStore.setState({ loading: true, error: null });
+  try {
+    const res = await apiFetch(`${API_BASE}/texts/${textId}/bundle?layers=${LAYERS}`);
+    if (!res.ok) throw new Error(await res.text());
+    const b: WorkspaceBundle = await res.json();
+    useTagStore.setState({ spans: b.spans, loading: false });
+    useMarkerStore.setState({ markers: b.markers });
+    useNoteStore.setState({ notes: b.notes, loading: false });
+    usePassageStore.setState({ passages: b.passages });
+    useDisplayBreakStore.setState({ breaks: new Map(b.display_breaks.map(x => [x.syl_id, x.count])) });
+    useSuggestionStore.setState({ suggestions: b.suggestions, loading: false });
+  } catch (e: any) {
+    console.error('loadWorkspaceLayers failed:', e.message);
+    useTagStore.setState({ error: e.message, loading: false });
+    useNoteStore.setState({ error: e.message, loading: false });
+    useSuggestionStore.setState({ error: e.message, loading: false });
+  }
+}
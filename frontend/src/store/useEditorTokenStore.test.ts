@@ -0,0 +1,51 @@
+import { describe, it, expect } from 'vitest';
+import { applyComposedDelta } from './useEditorTokenStore';
+import type { EditorToken } from '../api/client';
+
+/**
+ * A secondary's edit answers with the splice it made to the composed stream, and the
+ * tagger applies it to the tokens it holds. The splice must land exactly where the
+ * server's did — or not at all, when the held tokens are not the ones it was cut from.
+ */
+
+const tok = (idx: number, text: string, start: number): EditorToken => ({
+  idx,
+  id: `s${idx}`,
+  text,
+  nature: 'TEXT',
+  inserted: false,
+  start_offset: start,
+  end_offset: start + text.length,
+});
+
+// "ka kha ga nga " as four tokens, offsets tiling the text.
+const HELD: EditorToken[] = [tok(0, 'ka ', 0), tok(1, 'kha ', 3), tok(2, 'ga ', 7), tok(3, 'nga ', 10)];
+
+describe('applyComposedDelta', () => {
+  it('replaces the run and shifts the tail', () => {
+    const added = { ...tok(1, 'ca ', 3), id: 'new', source: 'override' as const };
+    const out = applyComposedDelta(HELD, {
+      start: 1, delete_count: 2, tokens: [added], offset_shift: -4, length: 3,
+    });
+    expect(out?.map(t => t.id)).toEqual(['s0', 'new', 's3']);
+    expect(out?.[2]).toMatchObject({ idx: 2, start_offset: 6, end_offset: 10 });
+    expect(out?.[0]).toBe(HELD[0]);
+  });
+
+  it('inserts without deleting', () => {
+    const out = applyComposedDelta(HELD, {
+      start: 4, delete_count: 0, tokens: [{ ...tok(4, 'ca ', 14), id: 'new' }],
+      offset_shift: 3, length: 5,
+    });
+    expect(out?.map(t => t.idx)).toEqual([0, 1, 2, 3, 4]);
+  });
+
+  it('refuses a splice cut from other tokens', () => {
+    expect(applyComposedDelta(HELD, {
+      start: 1, delete_count: 1, tokens: [], offset_shift: -4, length: 2,
+    })).toBeNull();
+    expect(applyComposedDelta(HELD, {
+      start: 3, delete_count: 2, tokens: [], offset_shift: -4, length: 2,
+    })).toBeNull();
+  });
+});
@@ -1,5 +1,6 @@
 import { create } from 'zustand';
-import { getEditorTokens, type EditorToken } from '../api/client';
+import { getEditorTokens, type ComposedDelta, type EditorToken } from '../api/client';
+import { useTextStore, type TextDetail } from './useTextStore';
 
 /**
  * The corrected root syllable layer for the workspace tagger (Phase 3 E1/E2).
@@ -7,22 +8,73 @@ import { getEditorTokens, type EditorToken } from '../api/client';
  * One fetch per document; the tagger renders the segment body from these tokens
  * (corrected text = the live selectable text) and derives both syllable-UUID
  * anchors and raw offsets from each token's `data-` attributes. Re-fetched
- * whenever the suggestions change (a correction edits the corrected text).
+ * whenever the suggestions change (a correction edits the corrected text). A
+ * secondary's edit answers with the splice it made (`ComposedDelta`): it is applied here
+ * to the tokens AND to the open text's composed `raw_text`/`units`, which is the whole
+ * refresh — no getText, no token refetch. Only a splice that does not line up falls back
+ * to the full reload.
  */
 interface EditorTokenState {
   tokens: EditorToken[];
   textId: number | null;
   loading: boolean;
   error: string | null;
+  /** The open text a delta last patched these tokens in step with (see `syncTo`). */
+  patchedFor: TextDetail | null;
   fetchTokens: (textId: number) => Promise<void>;
+  /** Fetch the tokens of `text` — unless a delta just patched them along with it. */
+  syncTo: (text: TextDetail) => Promise<void>;
+  /** Patch the held tokens and the open text of `textId` with an edit's splice. False
+   *  (nothing changed) when either is not held or does not line up with it: the caller
+   *  then reloads the text in full. */
+  applyDelta: (textId: number, delta: ComposedDelta | undefined) => boolean;
   clear: () => void;
 }
 
-export const useEditorTokenStore = create<EditorTokenState>((set) => ({
+/** `tokens` with `delta` spliced in, or null when `delta` was not computed against them. */
+export function applyComposedDelta(tokens: EditorToken[], delta: ComposedDelta): EditorToken[] | null {
+  const { start, delete_count, offset_shift } = delta;
+  if (start + delete_count > tokens.length
+      || tokens.length - delete_count + delta.tokens.length !== delta.length) return null;
+  const shift = delta.tokens.length - delete_count;
+  const tail = tokens.slice(start + delete_count).map(t => ({
+    ...t,
+    idx: t.idx + shift,
+    start_offset: t.start_offset + offset_shift,
+    end_offset: t.end_offset + offset_shift,
+  }));
+  return [...tokens.slice(0, start), ...delta.tokens, ...tail];
+}
+
+/** `text` (a secondary: `raw_text` is its tokens' texts joined, `units` one per token)
+ *  with the splice `delta` made to `tokens` applied, or null when they don't match. */
+export function patchComposedText(
+  text: TextDetail, tokens: EditorToken[], delta: ComposedDelta,
+): TextDetail | null {
+  const total = tokens.length ? tokens[tokens.length - 1].end_offset : 0;
+  if (text.units.length !== tokens.length || text.raw_text.length !== total) return null;
+  const units = applyComposedDelta(
+    text.units.map(([s, e, t], i) => ({ ...tokens[i], start_offset: s, end_offset: e, text: t })),
+    delta,
+  );
+  if (!units) return null;
+  const { start, delete_count } = delta;
+  const from = start < tokens.length ? tokens[start].start_offset : total;
+  const to = delete_count ? tokens[start + delete_count - 1].end_offset : from;
+  return {
+    ...text,
+    raw_text: text.raw_text.slice(0, from) + delta.tokens.map(t => t.text).join('')
+      + text.raw_text.slice(to),
+    units: units.map(u => [u.start_offset, u.end_offset, u.text] as [number, number, string]),
+  };
+}
+
+export const useEditorTokenStore = create<EditorTokenState>((set, get) => ({
   tokens: [],
   textId: null,
   loading: false,
   error: null,
+  patchedFor: null,
 
   fetchTokens: async (textId) => {
     set({ loading: true, error: null });
@@ -34,5 +86,25 @@ export const useEditorTokenStore = create<EditorTokenState>((set) => ({
     }
   },
 
-  clear: () => set({ tokens: [], textId: null }),
+  syncTo: async (text) => {
+    if (get().patchedFor === text) {
+      set({ patchedFor: null });  // in step already; the next change (suggestions) refetches
+      return;
+    }
+    await get().fetchTokens(text.id);
+  },
+
+  applyDelta: (textId, delta) => {
+    const { tokens, textId: held } = get();
+    const text = useTextStore.getState().currentText;
+    if (!delta || held !== textId || text?.id !== textId) return false;
+    const next = applyComposedDelta(tokens, delta);
+    const patched = next && patchComposedText(text, tokens, delta);
+    if (!next || !patched) return false;
+    set({ tokens: next, patchedFor: patched });
+    useTextStore.setState({ currentText: patched });  // panels keyed on the text refresh
+    return true;
+  },
+
+  clear: () => set({ tokens: [], textId: null, patchedFor: null }),
 }));
@@ -47,6 +47,11 @@ interface TreeNodeState {
    *  this store (the booklet preview and its navigation outline, which compile their own
    *  copy of the tree) watch it to re-derive as the tree is curated. */
   version: number;
+  /** ETag of the outline last fetched for `etagTextId`, sent back as If-None-Match so an
+   *  unchanged outline comes back as a bodiless 304. Cleared by every local change to
+   *  `nodes`, which no longer match what the server tagged. */
+  etag: string | null;
+  etagTextId: number | null;
   /**
    * The tree node currently "expecting input" from the tagger. When the user
    * selects text in the tagger AND this node has a placeholder title, the
@@ -103,18 +108,34 @@ export const useTreeNodeStore = create<TreeNodeState>((set, get) => ({
   error: null,
   saveStatus: 'idle',
   version: 0,
+  etag: null,
+  etagTextId: null,
   activeNodeId: null,
   editingAppend: null,
 
   fetchNodes: async (textId) => {
     set({ loading: true, error: null });
     try {
-      const res = await apiFetch(`${API_BASE}/texts/${textId}/tree-nodes`);
+      const { etag, etagTextId } = get();
+      const res = await apiFetch(`${API_BASE}/texts/${textId}/tree-nodes`, {
+        // Revalidate ourselves: the browser cache must not answer the 304 for us.
+        cache: 'no-store',
+        headers: etag && etagTextId === textId ? { 'If-None-Match': etag } : undefined,
+      });
+      if (res.status === 304) {
+        // Unchanged on the server (e.g. a write that only touched another text): keep
+        // the nodes and the version, so the watchers have nothing to re-derive.
+        set({ loading: false });
+        return;
+      }
       if (!res.ok) throw new Error(await res.text());
       const data: TreeNode[] = await res.json();
       // Every write path (create/move/reorder/delete) refetches, so bumping here covers
       // them all; a plain open bumps once, which costs the watchers one re-derive.
-      set(state => ({ nodes: data, loading: false, version: state.version + 1 }));
+      set(state => ({
+        nodes: data, loading: false, version: state.version + 1,
+        etag: res.headers.get('ETag'), etagTextId: textId,
+      }));
     } catch (e: any) {
       set({ error: e.message, loading: false });
     }
@@ -173,6 +194,7 @@ export const useTreeNodeStore = create<TreeNodeState>((set, get) => ({
           : n),
         saveStatus: 'saved',
         version: state.version + 1,
+        etag: null,
       }));
       // …then take the authoritative order from the server, as every other write does.
       if (before) await get().fetchNodes(before.text_id);
@@ -287,12 +309,14 @@ export const useTreeNodeStore = create<TreeNodeState>((set, get) => ({
       ? state.nodes.map(n => n.id === node.id ? node : n)
       : [...state.nodes, node],
     version: state.version + 1,
+    etag: null,
   })),
   removeNodeLocally: (nodeId) => set(state => ({
     nodes: state.nodes.filter(n => n.id !== nodeId),
     version: state.version + 1,
+    etag: null,
   })),
-  setNodesLocally: (nodes) => set(state => ({ nodes, version: state.version + 1 })),
+  setNodesLocally: (nodes) => set(state => ({ nodes, version: state.version + 1, etag: null })),
 
   setActiveNode: (id) => set({ activeNodeId: id }),
   setEditingAppend: (fn) => set({ editingAppend: fn }),